@@ -40,6 +40,7 @@ class AppConfig(BaseSettings):
 
     JWT_ALGORITHM: str = "HS256"
     DATA_DIR: Path = Path(__file__).parent.parent / "data"
+    MODEL_ARTIFACT_DIR: Path = Path(__file__).parent.parent / "data" / "models"
 
 
 class SupabaseConfig(BaseSettings):
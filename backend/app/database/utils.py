@@ -1,13 +1,126 @@
+import base64
+import datetime as dt
+import json
 import math
+import threading
+import time
+from collections import OrderedDict
 from typing import Any, TypeVar
 
-from sqlalchemy.orm import Query
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import (
+    Connection,
+    Select,
+    Table,
+    event,
+    func,
+    inspect,
+    or_,
+    select,
+)
+from sqlalchemy.orm import InstrumentedAttribute, Query, Session
+from sqlalchemy.sql.util import find_tables
 
-from app.database.core import Base
+from app.database.core import Base, engine
 from app.models import BaseQuery
 
 T = TypeVar("T")
 
+# Rows per fetch when streaming a query into arrays
+FETCH_CHUNK_SIZE = 1_000
+
+MAX_CACHED_TOTALS = 1_024
+# Seconds a cached total is reused, which bounds how stale it can be when rows are
+# written by another process
+TOTALS_CACHE_TTL = 60.0
+
+# Connection info key of the tables written in its transaction
+WRITTEN_TABLES = "written_tables"
+
+
+class TotalsCache:
+    """Row counts of filtered queries, keyed by their SQL and bound parameters.
+
+    Entries are dropped when a table they read from is written.
+    """
+
+    def __init__(
+        self, max_cached: int = MAX_CACHED_TOTALS, ttl: float = TOTALS_CACHE_TTL
+    ) -> None:
+        self.max_cached = max_cached
+        self.ttl = ttl
+        self._cache: OrderedDict[tuple[str, str], tuple[int, float, frozenset[str]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        # Bumped on invalidation, so counts that raced a write are not cached
+        self._generation = 0
+
+    def count(self, query: Query[Any]) -> int:
+        """Number of rows of a query, counted once per filter signature.
+
+        The signature is the compiled statement that is counted, with its joins and
+        criteria, and its bound parameters. Eager loads do not change the count, so
+        they are left out, which keeps compiling it cheap.
+        """
+        statement = query.enable_eagerloads(False).statement
+        compiled = statement.compile()
+        key = (
+            str(compiled),
+            json.dumps(compiled.params, sort_keys=True, default=str),
+        )
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and time.monotonic() - cached[1] < self.ttl:
+                self._cache.move_to_end(key)
+                return cached[0]
+            generation = self._generation
+
+        total = query.count()
+        tables = frozenset(
+            table.name for table in find_tables(statement) if isinstance(table, Table)
+        )
+        with self._lock:
+            if generation == self._generation:
+                self._cache[key] = (total, time.monotonic(), tables)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_cached:
+                    self._cache.popitem(last=False)
+        return total
+
+    def invalidate(self, tables: set[str] | None = None) -> None:
+        """Drop the totals read from any of `tables`, or all of them."""
+        with self._lock:
+            self._generation += 1
+            for key, (_, _, read) in list(self._cache.items()):
+                if tables is None or read & tables:
+                    del self._cache[key]
+
+
+totals_cache = TotalsCache()
+
+
+@event.listens_for(engine, "after_execute")
+def invalidate_written_totals(conn: Connection, clauseelement: Any, *_: Any) -> None:
+    """Drop totals read from a table an insert, update or delete statement wrote.
+
+    They are dropped again when the transaction ends, in case a count ran before the
+    write was committed or rolled back.
+    """
+    if getattr(clauseelement, "is_dml", False):
+        table = clauseelement.table.name
+        conn.info.setdefault(WRITTEN_TABLES, set()).add(table)
+        totals_cache.invalidate({table})
+
+
+@event.listens_for(engine, "commit")
+@event.listens_for(engine, "rollback")
+def invalidate_transaction_totals(conn: Connection) -> None:
+    """Drop totals read from the tables a transaction wrote, as it ends."""
+    if tables := conn.info.pop(WRITTEN_TABLES, None):
+        totals_cache.invalidate(tables)
+
 
 def apply_sort(
     query: Query[T], table: type[Base], sort_by: str, sort_desc: bool
@@ -23,15 +136,155 @@ def apply_pagination(query: Query[T], page: int, page_size: int) -> Query[T]:
     return query.offset(page * page_size).limit(page_size)
 
 
+def keyset_columns(
+    table: type[Base], sort_by: str | None
+) -> list[InstrumentedAttribute[Any]]:
+    """Columns a keyset is ordered on: an indexed sort column then the primary key."""
+    mapper = inspect(table)
+    primary_key = getattr(
+        table, mapper.get_property_by_column(mapper.primary_key[0]).key
+    )
+    if sort_by is None:
+        return [primary_key]
+
+    sort_column = table.get_column(sort_by)
+    if sort_column is primary_key:
+        return [primary_key]
+    column = sort_column.property.columns[0]
+    indexed = column.index or any(
+        index.columns[0] is column
+        for index in table.__table__.indexes  # type: ignore[attr-defined]
+    )
+    if not indexed:
+        raise ValueError(f"Cannot paginate by keyset on unindexed column: {sort_by}")
+    return [sort_column, primary_key]
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Opaque cursor of the keyset values of the last row of a page."""
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def parse_value(column: InstrumentedAttribute[Any], value: Any) -> Any:
+    """Parse a JSON value to the python type of a column."""
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type in (dt.datetime, dt.date):
+        # Python 3.10 does not parse the `Z` suffix for UTC
+        if isinstance(value, str) and value.endswith("Z"):
+            value = f"{value[:-1]}+00:00"
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def decode_cursor(cursor: str, columns: list[InstrumentedAttribute[Any]]) -> list[Any]:
+    """Keyset values of a cursor, parsed to the types of their columns."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [
+            parse_value(column, value)
+            for column, value in zip(columns, values, strict=True)
+        ]
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor}") from None
+
+
+def keyset_stages(
+    query: Query[T],
+    columns: list[InstrumentedAttribute[Any]],
+    sort_desc: bool,
+    cursor: str | None,
+) -> list[Query[T]]:
+    """Queries of the rows after a cursor, in keyset order, to be read in turn.
+
+    Rows with a sort value are read first as a range seek on the sort index, then
+    those without one, such as unscheduled fixtures, by primary key. Keeping the two
+    apart avoids an OR filter and a NULLS LAST sort, which stop the index being used.
+    """
+    *sort_columns, primary_key = columns
+    values = decode_cursor(cursor, columns) if cursor is not None else None
+    key = values[-1] if values is not None else None
+
+    def order(column: InstrumentedAttribute[Any]) -> Any:
+        return column.desc() if sort_desc else column.asc()
+
+    def after(column: InstrumentedAttribute[Any], value: Any) -> Any:
+        return column < value if sort_desc else column > value
+
+    if not sort_columns:
+        if values is not None:
+            query = query.filter(after(primary_key, key))
+        return [query.order_by(order(primary_key))]
+
+    column = sort_columns[0]
+    unsorted = query.filter(column.is_(None))
+    if values is not None and values[0] is None:
+        return [unsorted.filter(after(primary_key, key)).order_by(order(primary_key))]
+
+    sorted_ = query.filter(column.is_not(None))
+    if values is not None:
+        value = values[0]
+        sorted_ = sorted_.filter(
+            column <= value if sort_desc else column >= value,
+            or_(after(column, value), after(primary_key, key)),
+        )
+    return [
+        sorted_.order_by(order(column), order(primary_key)),
+        unsorted.order_by(order(primary_key)),
+    ]
+
+
+def keyset_paginate(
+    query: Query[T], table: type[Base], query_in: BaseQuery
+) -> tuple[list[T], str | None]:
+    """A page of a query after the cursor, and the cursor of the next page."""
+    columns = keyset_columns(table, query_in.sort_by)
+    stages = keyset_stages(
+        query=query,
+        columns=columns,
+        sort_desc=query_in.sort_desc,
+        cursor=query_in.cursor,
+    )
+    # One row past the page tells whether there is a next page
+    items: list[T] = []
+    for stage in stages:
+        items += stage.limit(query_in.page_size + 1 - len(items)).all()
+        if len(items) > query_in.page_size:
+            items = items[: query_in.page_size]
+            return items, encode_cursor([getattr(items[-1], c.key) for c in columns])
+    return items, None
+
+
 def sort_and_paginate(
     query: Query[T],
     table: type[Base],
     query_in: BaseQuery,
 ) -> dict[str, Any]:
-    """Sort and paginate a query."""
-    total = query.count()
+    """Sort and paginate a query, by page number or by keyset.
+
+    Totals are counted once per filter signature and cached until the tables they
+    read from are written. Keyset pages seek past the cursor on the sort index, so
+    deep pages cost about the same as the first.
+    """
+    total = totals_cache.count(query)
     total_pages = math.ceil(total / query_in.page_size)
 
+    if query_in.pagination == "keyset":
+        items, next_cursor = keyset_paginate(
+            query=query, table=table, query_in=query_in
+        )
+        return {
+            "items": items,
+            "page_size": query_in.page_size,
+            "page": query_in.page,
+            "total": total,
+            "total_pages": total_pages,
+            "next_cursor": next_cursor,
+        }
+
     if query_in.sort_by:
         query = apply_sort(
             query=query,
@@ -50,3 +303,39 @@ def sort_and_paginate(
         "total": total,
         "total_pages": total_pages,
     }
+
+
+def fetch_columns(
+    session: Session,
+    statement: Select[Any],
+    dtypes: dict[str, npt.DTypeLike],
+    chunk_size: int = FETCH_CHUNK_SIZE,
+) -> dict[str, npt.NDArray[Any]]:
+    """Stream the rows of a select into a preallocated typed array per column.
+
+    `dtypes` maps each selected column label to its array dtype. Rows are fetched in
+    chunks with `yield_per`, which uses a server-side cursor where the driver supports
+    one, so only a chunk of row tuples is held in memory at a time. The arrays are
+    sized by a count of the same select, and grown if more rows arrive.
+    """
+    n_rows = session.scalar(select(func.count()).select_from(statement.subquery()))
+    arrays = {name: np.empty(n_rows or 0, dtype) for name, dtype in dtypes.items()}
+    # Executed on the Core connection, skipping the ORM's per-row processing
+    result = session.connection().execute(
+        statement.execution_options(yield_per=chunk_size)
+    )
+    if set(result.keys()) != set(arrays):
+        raise ValueError(f"Expected columns {list(arrays)}, got {list(result.keys())}")
+
+    columns = [arrays[key] for key in result.keys()]
+    start = 0
+    for chunk in result.partitions():
+        end = start + len(chunk)
+        if end > len(columns[0]):
+            columns = [np.resize(column, 2 * end) for column in columns]
+        for column, values in zip(columns, zip(*chunk, strict=True), strict=True):
+            column[start:end] = values
+        start = end
+    return {
+        key: column[:start] for key, column in zip(result.keys(), columns, strict=True)
+    }
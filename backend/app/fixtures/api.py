@@ -1,6 +1,6 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 
 from app.database.core import SessionDep
 from app.fixtures import service
@@ -16,7 +16,11 @@ router = APIRouter(prefix="/fixtures", tags=["fixtures"])
 def get_fixtures_query(
     *, session: SessionDep, query_in: FixtureQuery = Depends()
 ) -> Any:
-    return service.get_fixtures_query(session=session, query_in=query_in)
+    try:
+        return service.get_fixtures_query(session=session, query_in=query_in)
+    except ValueError as e:
+        # An unknown or unindexed sort column, or a malformed cursor
+        raise HTTPException(status_code=400, detail=str(e)) from None
 
 
 # @router.get("/{fixture_id}", response_model=FixtureRead)
@@ -1,3 +1,4 @@
+import datetime as dt
 from collections.abc import Generator
 
 from sqlalchemy.orm import Session
@@ -9,16 +10,29 @@ from app.logger import logger
 from app.teams.service import get_seasons_teams
 
 
+def parse_kickoff(value: str) -> dt.datetime | None:
+    """Parse an ISO 8601 kick-off time as UTC, assuming UTC when it has no offset."""
+    if not value:
+        return None
+    # Python 3.10 does not parse the `Z` suffix for UTC
+    if value.endswith("Z"):
+        value = f"{value[:-1]}+00:00"
+    kickoff = dt.datetime.fromisoformat(value)
+    if kickoff.tzinfo is None:
+        return kickoff.replace(tzinfo=dt.timezone.utc)
+    return kickoff.astimezone(dt.timezone.utc)
+
+
 def read_fixture_data(
     filepath: str, season: str, season_teams: dict[str, int]
-) -> Generator[dict[str, str | int], None, None]:
+) -> Generator[dict[str, str | int | dt.datetime | None], None, None]:
     """Read raw fixture data from csv file."""
     with open(filepath) as f:
         next(f)
         for row in f:
             fields = row.strip().split(",")
             yield {
-                "date": fields[0],
+                "date": parse_kickoff(fields[0]),
                 "home_team_id": season_teams[fields[1]],
                 "away_team_id": season_teams[fields[2]],
                 "gameweek": fields[5],
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends, Response
+
+from app.database.core import SessionDep
+from app.fixtures.forecasts import service
+from app.fixtures.forecasts.models import ForecastQuery, GameweekForecastsRead
+
+router = APIRouter(prefix="/fixtures/forecasts", tags=["forecasts"])
+
+
+@router.get("", response_model=GameweekForecastsRead)
+def get_forecasts(
+    *, session: SessionDep, query_in: ForecastQuery = Depends()
+) -> Response:
+    return Response(
+        content=service.get_cached_forecasts(session=session, query_in=query_in),
+        media_type="application/json",
+    )
@@ -0,0 +1,234 @@
+"""Versioned on-disk store of fitted forecasting model parameters."""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import astuple, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from app.config import config
+from app.fixtures.forecasts.base import ForecastModel
+from app.fixtures.forecasts.encoding import EncodedFixtures, FloatArray, StrArray
+from app.fixtures.forecasts.families import DEFAULT_FAMILY, get_model_family
+from app.fixtures.forecasts.priors import TeamPrior
+from app.logger import logger
+
+ARTIFACT_VERSION = 2
+MAX_CACHED_ARTIFACTS = 32
+
+
+def data_hash(data: EncodedFixtures, priors: FloatArray | None = None) -> str:
+    """Short content hash of the training data, and any priors, a model was fitted on."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update("\n".join(data.teams).encode())
+    for array in (data.home_idx, data.away_idx, data.home_goals, data.away_goals):
+        digest.update(np.ascontiguousarray(array, dtype=np.int64).tobytes())
+    digest.update(data.date.astype("datetime64[D]").astype(np.int64).tobytes())
+    if data.n_covariates:
+        for array in (data.home_x, data.away_x):
+            digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+    if priors is not None and priors.any():
+        digest.update(np.ascontiguousarray(priors, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class ArtifactKey:
+    """Identifies a fit by its model family, training split, time decay and data."""
+
+    season: str
+    gameweek: int
+    xi: float
+    data_hash: str
+    family: str = DEFAULT_FAMILY
+
+    @classmethod
+    def for_model(
+        cls, season: str, gameweek: int, model: ForecastModel
+    ) -> "ArtifactKey":
+        """Key for a model built from training data."""
+        return cls(
+            family=model.family,
+            season=season,
+            gameweek=gameweek,
+            xi=model.xi,
+            data_hash=data_hash(
+                model.data,
+                priors=np.concatenate((model.prior_mean, model.prior_precision)),
+            ),
+        )
+
+    @property
+    def filename(self) -> str:
+        """Artifact file name."""
+        return (
+            f"{self.family}_{self.season}_gw{self.gameweek:02d}_xi{self.xi:g}_"
+            f"{self.data_hash}.npz"
+        )
+
+
+@dataclass
+class ModelArtifact:
+    """Fitted parameters and fit statistics of a model."""
+
+    teams: StrArray
+    params: FloatArray
+    xi: float
+    loglikelihood: float
+    aic: float
+    covariance: FloatArray | None = None
+    promoted_prior: TeamPrior | None = None
+    family: str = DEFAULT_FAMILY
+    covariate_names: tuple[str, ...] = ()
+
+    @classmethod
+    def from_model(cls, model: ForecastModel) -> "ModelArtifact":
+        """Snapshot a fitted model."""
+        if not model.fitted:
+            raise ValueError("Only fitted models can be stored")
+        return cls(
+            teams=model.teams,
+            params=model._params,
+            xi=model.xi,
+            loglikelihood=float(model.loglikelihood),  # type: ignore[arg-type]
+            aic=float(model.aic),  # type: ignore[arg-type]
+            covariance=model.parameter_covariance(),
+            promoted_prior=model.promoted_prior,
+            family=model.family,
+            covariate_names=model.covariate_names,
+        )
+
+    def to_model(self) -> ForecastModel:
+        """Restore a model of the artifact's family that can predict without refitting."""
+        return get_model_family(self.family).from_params(
+            teams=self.teams,
+            params=self.params,
+            xi=self.xi,
+            loglikelihood=self.loglikelihood,
+            aic=self.aic,
+            covariance=self.covariance,
+            promoted_prior=self.promoted_prior,
+            covariate_names=self.covariate_names,
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the artifact as an uncompressed npz file.
+
+        It is written to a temporary file in the same directory and moved into
+        place, so readers never see a partly written artifact.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        optional: dict[str, FloatArray] = {}
+        if self.covariance is not None:
+            optional["covariance"] = self.covariance
+        if self.promoted_prior is not None:
+            optional["promoted_prior"] = np.array(astuple(self.promoted_prior))
+        if self.covariate_names:
+            optional["covariate_names"] = np.array(self.covariate_names)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    version=ARTIFACT_VERSION,
+                    family=self.family,
+                    teams=self.teams.astype(str),
+                    params=self.params,
+                    xi=self.xi,
+                    loglikelihood=self.loglikelihood,
+                    aic=self.aic,
+                    **optional,
+                )
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> "ModelArtifact":
+        """Read an artifact written by `save`."""
+        with np.load(path, allow_pickle=False) as f:
+            if int(f["version"]) != ARTIFACT_VERSION:
+                raise ValueError(f"Unsupported artifact version in {path}")
+            return cls(
+                teams=f["teams"],
+                params=f["params"],
+                xi=float(f["xi"]),
+                loglikelihood=float(f["loglikelihood"]),
+                aic=float(f["aic"]),
+                covariance=f["covariance"] if "covariance" in f.files else None,
+                promoted_prior=(
+                    TeamPrior(*f["promoted_prior"][:4], int(f["promoted_prior"][4]))
+                    if "promoted_prior" in f.files
+                    else None
+                ),
+                family=str(f["family"]),
+                covariate_names=(
+                    tuple(str(name) for name in f["covariate_names"])
+                    if "covariate_names" in f.files
+                    else ()
+                ),
+            )
+
+
+class ModelArtifactStore:
+    """Model artifacts on disk, loaded on demand into an in-process LRU cache."""
+
+    def __init__(self, root: Path, max_cached: int = MAX_CACHED_ARTIFACTS) -> None:
+        """Initialise store under `root`, namespaced by the artifact format version."""
+        self.root = root / f"v{ARTIFACT_VERSION}"
+        self.max_cached = max_cached
+        self._cache: OrderedDict[ArtifactKey, ModelArtifact] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path(self, key: ArtifactKey) -> Path:
+        """Location of an artifact on disk."""
+        return self.root / key.filename
+
+    def save(self, key: ArtifactKey, artifact: ModelArtifact) -> None:
+        """Persist an artifact and cache it."""
+        artifact.save(self.path(key))
+        logger.info(f"Saved model artifact {key.filename}")
+        self._cache_put(key, artifact)
+
+    def load(self, key: ArtifactKey) -> ModelArtifact | None:
+        """Get an artifact from the cache or disk, or None if it has not been stored."""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        path = self.path(key)
+        if not path.exists():
+            return None
+
+        artifact = ModelArtifact.load(path)
+        self._cache_put(key, artifact)
+        return artifact
+
+    def latest(
+        self, season: str, gameweek: int, xi: float, family: str = DEFAULT_FAMILY
+    ) -> ModelArtifact | None:
+        """Most recently written artifact for a split, whatever data it was fitted on."""
+        pattern = ArtifactKey(season, gameweek, xi, "*", family=family).filename
+        paths = sorted(self.root.glob(pattern), key=lambda p: p.stat().st_mtime)
+        return ModelArtifact.load(paths[-1]) if paths else None
+
+    def __contains__(self, key: ArtifactKey) -> bool:
+        """Whether the artifact is cached or stored on disk."""
+        return key in self._cache or self.path(key).exists()
+
+    def _cache_put(self, key: ArtifactKey, artifact: ModelArtifact) -> None:
+        """Insert into the cache, evicting the least recently used artifact."""
+        with self._lock:
+            self._cache[key] = artifact
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+
+artifact_store = ModelArtifactStore(root=config.MODEL_ARTIFACT_DIR)
@@ -0,0 +1,276 @@
+"""Walk-forward backtest of fixture forecasts over historical seasons."""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, TypeAlias
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.database.core import get_session
+from app.fixtures.forecasts.base import ForecastModel, model_version
+from app.fixtures.forecasts.families import (
+    DEFAULT_FAMILY,
+    MODEL_FAMILIES,
+    get_model_family,
+)
+from app.fixtures.forecasts.loader import TRAIN_COLUMNS, load_results
+from app.fixtures.forecasts.metrics import ForecastScores
+from app.fixtures.forecasts.service import upsert_forecasts
+from app.fixtures.models import Fixture
+from app.logger import logger
+from app.seasons.service import sort_seasons
+
+MIN_TRAIN_ROUNDS = 38
+TRAIN_KEYS = ("home_team", "away_team", "home_goals", "away_goals", "date")
+
+BacktestResults: TypeAlias = dict[str, npt.NDArray[np.generic]]
+BacktestForecasts: TypeAlias = dict[str, npt.NDArray[np.generic]]
+
+
+def get_backtest_results(session: Session, seasons: list[str]) -> BacktestResults:
+    """Get every result in the given seasons, in chronological order."""
+    logger.info("Loading backtest results...")
+    results = load_results(
+        session,
+        Fixture.season.in_(seasons),
+        Fixture.gameweek.isnot(None),
+        columns=("fixture_id", "season", "gameweek", *TRAIN_COLUMNS),
+    )
+    logger.info(f"Backtest results: {len(results['fixture_id'])}")
+
+    season_order = {s: i for i, s in enumerate(sort_seasons(seasons, desc=False))}
+    unique_seasons, season_idx = np.unique(results["season"], return_inverse=True)
+    season_rank = np.array([season_order[s] for s in unique_seasons], dtype=int)
+    results["round"] = season_rank[season_idx] * 100 + results["gameweek"]
+    return sort_results(results)
+
+
+def sort_results(results: BacktestResults) -> BacktestResults:
+    """Sort results chronologically and number the (season, gameweek) rounds from 0."""
+    order = np.lexsort((results["date"], results["round"]))
+    results = {k: v[order] for k, v in results.items()}
+    results["round"] = np.unique(results["round"], return_inverse=True)[1]
+    return results
+
+
+def walk_forward(
+    results: BacktestResults,
+    horizon: int = 1,
+    min_train_rounds: int = MIN_TRAIN_ROUNDS,
+    max_workers: int | None = None,
+    family: str = DEFAULT_FAMILY,
+) -> BacktestForecasts:
+    """Refit a model `family` after every round and forecast the next `horizon` rounds.
+
+    Split points are divided into contiguous chunks, one per worker process. Each chunk
+    fits once and is then advanced a round at a time, warm-starting every refit.
+    """
+    return walk_forward_families(
+        results,
+        families=(family,),
+        horizon=horizon,
+        min_train_rounds=min_train_rounds,
+        max_workers=max_workers,
+    )[family]
+
+
+def walk_forward_families(
+    results: BacktestResults,
+    families: tuple[str, ...] = tuple(MODEL_FAMILIES),
+    horizon: int = 1,
+    min_train_rounds: int = MIN_TRAIN_ROUNDS,
+    max_workers: int | None = None,
+) -> dict[str, BacktestForecasts]:
+    """Walk-forward backtest of several model families over the same results.
+
+    Every family is fitted over the same chunks of split points, and all the
+    (family, chunk) pairs share a single pool of worker processes.
+    """
+    # Fail on unknown families before starting any workers
+    for family in families:
+        get_model_family(family)
+
+    split_points = np.arange(min_train_rounds - 1, results["round"].max())
+    if not len(split_points):
+        raise ValueError(
+            f"Cannot backtest {', '.join(families)}: the results span "
+            f"{results['round'].max() + 1} rounds, but {min_train_rounds} are needed "
+            "to train and one more to forecast"
+        )
+    n_chunks = min(max_workers or os.cpu_count() or 1, len(split_points))
+    chunks = [c for c in np.array_split(split_points, n_chunks) if len(c)]
+    tasks = [(family, chunk) for family in families for chunk in chunks]
+    logger.info(
+        f"Walk-forward of {len(families)} model families over {len(split_points)} "
+        f"splits in {len(chunks)} chunks"
+    )
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        parts = list(
+            pool.map(
+                forecast_chunk,
+                repeat(results),
+                [chunk for _, chunk in tasks],
+                repeat(horizon),
+                [family for family, _ in tasks],
+            )
+        )
+
+    forecasts = {}
+    for family in families:
+        done = [p for (f, _), p in zip(tasks, parts, strict=True) if f == family and p]
+        if not done:
+            raise ValueError(f"Every split of the {family} backtest failed to fit")
+        forecasts[family] = {k: np.concatenate([p[k] for p in done]) for k in done[0]}
+    return forecasts
+
+
+def fit_to_split(
+    model_class: type[ForecastModel],
+    results: BacktestResults,
+    split: np.int_,
+    **model_kwargs: Any,
+) -> ForecastModel:
+    """Fit a model to every round up to and including `split`.
+
+    The starting parameters are seeded by the split, so a backtest is reproducible
+    however its splits are chunked, and a fit retried at a later split starts afresh.
+    """
+    train = results["round"] <= split
+    np.random.seed(int(split))
+    train_kwargs: dict[str, Any] = {k: results[k][train] for k in TRAIN_KEYS}
+    model = model_class(**train_kwargs, **model_kwargs)
+    model.fit()
+    return model
+
+
+def forecast_chunk(
+    results: BacktestResults,
+    split_points: npt.NDArray[np.int_],
+    horizon: int,
+    family: str = DEFAULT_FAMILY,
+) -> BacktestForecasts:
+    """Forecast each split point in turn, advancing a single model between them."""
+    rounds = results["round"]
+    model_class = get_model_family(family)
+    model: ForecastModel | None = None
+    forecasts: list[BacktestForecasts] = []
+
+    for split in split_points:
+        try:
+            if model is None:
+                model = fit_to_split(model_class, results, split)
+            else:
+                gameweek = rounds == split
+                model.advance(**{k: results[k][gameweek] for k in TRAIN_KEYS})
+        except ValueError as e:
+            # Refit from scratch at the next split, as a failed fit leaves the model
+            # unfitted or missing the rounds it failed on
+            logger.warning(f"Skipping split {split}: {e}")
+            model = None
+            continue
+
+        test = (rounds > split) & (rounds <= split + horizon)
+        preds = model.predict_many(
+            home_teams=results["home_team"][test],
+            away_teams=results["away_team"][test],
+        )
+        forecasts.append(
+            {
+                "fixture_id": results["fixture_id"][test],
+                "split": np.full(test.sum(), split),
+                "home_goals": results["home_goals"][test],
+                "away_goals": results["away_goals"][test],
+                **preds,
+            }
+        )
+
+    if not forecasts:
+        return {}
+    return {k: np.concatenate([f[k] for f in forecasts]) for k in forecasts[0]}
+
+
+def score_forecasts(forecasts: BacktestForecasts) -> ForecastScores:
+    """Score all backtest forecasts against the results."""
+    return ForecastScores.from_predictions(
+        home_win=forecasts["home_win"],  # type: ignore[arg-type]
+        draw=forecasts["draw"],  # type: ignore[arg-type]
+        away_win=forecasts["away_win"],  # type: ignore[arg-type]
+        home_goals_for=forecasts["home_goals_for"],  # type: ignore[arg-type]
+        away_goals_for=forecasts["away_goals_for"],  # type: ignore[arg-type]
+        home_goals=forecasts["home_goals"],  # type: ignore[arg-type]
+        away_goals=forecasts["away_goals"],  # type: ignore[arg-type]
+    )
+
+
+def write_forecasts(
+    session: Session,
+    forecasts: BacktestForecasts,
+    model_version: str = DEFAULT_FAMILY,
+) -> None:
+    """Bulk upsert the forecast made closest to kick-off for each fixture."""
+    order = np.argsort(forecasts["split"], kind="stable")[::-1]
+    _, latest = np.unique(forecasts["fixture_id"][order], return_index=True)
+    rows = order[latest]
+
+    upsert_forecasts(
+        session=session,
+        fixture_ids=forecasts["fixture_id"][rows],
+        forecasts={k: v[rows] for k, v in forecasts.items()},
+        model_version=model_version,
+    )
+    session.commit()
+
+
+def fill_backtest_forecasts(
+    session: Session,
+    seasons: list[str] | None = None,
+    horizon: int = 1,
+    max_workers: int | None = None,
+    family: str = DEFAULT_FAMILY,
+) -> ForecastScores:
+    """Walk-forward backtest over all seasons, writing the forecasts to the database."""
+    logger.info(f"Running walk-forward backtest of {family}...")
+    start = time.perf_counter()
+    results = get_backtest_results(session=session, seasons=seasons or config.SEASONS)
+    forecasts = walk_forward(
+        results, horizon=horizon, max_workers=max_workers, family=family
+    )
+    scores = score_forecasts(forecasts)
+    logger.info(f"Backtest finished in {time.perf_counter() - start:.1f}s ({scores})")
+
+    write_forecasts(
+        session=session, forecasts=forecasts, model_version=model_version(family)
+    )
+    return scores
+
+
+def compare_families(
+    session: Session,
+    seasons: list[str] | None = None,
+    families: tuple[str, ...] = tuple(MODEL_FAMILIES),
+    horizon: int = 1,
+    max_workers: int | None = None,
+) -> dict[str, ForecastScores]:
+    """Walk-forward backtest of every model family, scoring each over the same splits."""
+    logger.info(f"Comparing model families: {', '.join(families)}")
+    start = time.perf_counter()
+    results = get_backtest_results(session=session, seasons=seasons or config.SEASONS)
+    forecasts = walk_forward_families(
+        results, families=families, horizon=horizon, max_workers=max_workers
+    )
+    scores = {family: score_forecasts(f) for family, f in forecasts.items()}
+    logger.info(f"Comparison finished in {time.perf_counter() - start:.1f}s")
+    for family, family_scores in scores.items():
+        logger.info(f"{family}: {family_scores}")
+    return scores
+
+
+if __name__ == "__main__":
+    with get_session() as session:
+        fill_backtest_forecasts(session=session)
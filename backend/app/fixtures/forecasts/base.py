@@ -0,0 +1,941 @@
+"""Shared fitting and prediction engine of the team strength model families."""
+
+import math
+import time
+import warnings
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, TypeAlias
+
+import numpy as np
+from numba import njit, vectorize
+from scipy.linalg import null_space
+from scipy.optimize import LinearConstraint, OptimizeResult, minimize
+
+from app.fixtures.forecasts.encoding import (
+    DateArray,
+    EncodedFixtures,
+    FloatArray,
+    IntArray,
+    StrArray,
+    SufficientStats,
+    design_matrix,
+)
+from app.fixtures.forecasts.markets import TAIL_TOLERANCE, ScoreDistribution
+from app.fixtures.forecasts.metrics import ForecastScores
+from app.logger import logger
+
+if TYPE_CHECKING:
+    from app.fixtures.forecasts.priors import TeamPrior
+
+Kernel: TypeAlias = Literal["numpy", "numba"]
+
+# fastmath without the no-nans/no-infs flags, as the likelihoods can leave their domain
+FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+# Exact log(k!) for the scorelines seen in practice, replacing per-element lgamma calls
+MAX_TABLE_GOALS = 20
+LOG_FACTORIAL: FloatArray = np.array(
+    [math.lgamma(k + 1) for k in range(MAX_TABLE_GOALS + 1)]
+)
+
+# Relative step of the finite-difference Hessian
+HESSIAN_STEP = 1e-5
+
+
+@dataclass
+class FitDiagnostics:
+    """Convergence diagnostics of a single optimisation run."""
+
+    converged: bool
+    loglikelihood: float
+    n_iter: int
+    n_fev: int
+    wall_time: float
+    message: str
+    seed: int | None = None
+
+    @classmethod
+    def from_result(
+        cls, res: OptimizeResult, wall_time: float, seed: int | None = None
+    ) -> "FitDiagnostics":
+        """Summarise an optimisation result."""
+        return cls(
+            converged=bool(res.success),
+            loglikelihood=float(-res.fun),
+            n_iter=int(res.nit),
+            n_fev=int(res.nfev),
+            wall_time=wall_time,
+            message=str(res.message),
+            seed=seed,
+        )
+
+    def __str__(self) -> str:
+        """Diagnostics formatted on a single line."""
+        return (
+            f"seed={self.seed} converged={self.converged} "
+            f"loglikelihood={self.loglikelihood:.3f} iterations={self.n_iter} "
+            f"evaluations={self.n_fev} time={self.wall_time * 1000:.0f}ms"
+        )
+
+
+class ForecastModel(ABC):
+    """Team strength model with log-linear home and away goal rates.
+
+    Parameters are laid out as [attack, defence, beta, home_adv, *extra], where the
+    extra parameters belong to the model family (e.g. the Dixon-Coles rho). The home
+    rate is exp(attack_home + defence_away + beta . x_home + home_adv) and the away rate
+    exp(attack_away + defence_home + beta . x_away), where x are optional rows of the
+    covariate design matrices (e.g. rolling xG) with coefficients beta. Families define
+    how the rates and extra parameters give a scoreline distribution, through a fused
+    numba kernel of the weighted negative log-likelihood and a batched score
+    distribution builder; data encoding, time decay, priors, fitting and prediction
+    are shared.
+    """
+
+    family: ClassVar[str]
+    extra_params: ClassVar[tuple[str, ...]]
+    extra_init: ClassVar[tuple[float, ...]]
+    extra_bounds: ClassVar[tuple[tuple[float, float], ...]]
+
+    max_iter: int = 100
+    xi: float = 0.001
+
+    def __init__(
+        self,
+        home_team: StrArray,
+        away_team: StrArray,
+        home_goals: IntArray,
+        away_goals: IntArray,
+        date: DateArray,
+        xi: float | None = None,
+        home_covariates: FloatArray | None = None,
+        away_covariates: FloatArray | None = None,
+        covariate_names: tuple[str, ...] = (),
+    ):
+        """Initialise model with fixtures and team-level covariates.
+
+        The covariates are (n_fixtures, n_covariates) design matrices of the home and
+        away predictors, with a coefficient per name in `covariate_names`.
+        """
+        if xi is not None:
+            self.xi = xi
+
+        self.covariate_names = tuple(covariate_names)
+        self.data = EncodedFixtures.from_results(
+            home_team=home_team,
+            away_team=away_team,
+            home_goals=home_goals,
+            away_goals=away_goals,
+            date=date,
+            home_covariates=home_covariates,
+            away_covariates=away_covariates,
+        )
+        if self.data.n_covariates != self.n_covariates:
+            raise ValueError(
+                f"Expected {self.n_covariates} covariates {self.covariate_names}, "
+                f"got {self.data.n_covariates}"
+            )
+        self.teams = self.data.teams
+        self.n_teams = self.data.n_teams
+        self._team_index = {team: i for i, team in enumerate(self.teams)}
+
+        self.weights = time_decay(self.data.date, xi=self.xi)
+        self.stats = SufficientStats.from_fixtures(self.data, self.weights)
+
+        self._params: FloatArray = self._init_params()
+        self.prior_mean: FloatArray = np.zeros(2 * self.n_teams)
+        self.prior_precision: FloatArray = np.zeros(2 * self.n_teams)
+        self.promoted_prior: TeamPrior | None = None
+        self._unseen_strength: tuple[float, float] | None = None
+        self._res: OptimizeResult | None = None
+        self.loglikelihood: float | None = None
+        self.aic: float | None = None
+        self.n_params: int | None = None
+        self.diagnostics: FitDiagnostics | None = None
+        self.covariance: FloatArray | None = None
+        self.fitted: bool = False
+
+    @staticmethod
+    @abstractmethod
+    def kernel(
+        params: FloatArray,
+        home_idx: IntArray,
+        away_idx: IntArray,
+        home_goals: IntArray,
+        away_goals: IntArray,
+        home_x: FloatArray,
+        away_x: FloatArray,
+        weights: FloatArray,
+        n_teams: int,
+        grad: FloatArray,
+    ) -> float:
+        """Fused weighted negative log-likelihood over the sufficient statistics.
+
+        If `grad` is non-empty, the gradient is written into it.
+        """
+
+    @classmethod
+    def from_params(
+        cls,
+        teams: StrArray,
+        params: FloatArray,
+        xi: float,
+        loglikelihood: float | None = None,
+        aic: float | None = None,
+        covariance: FloatArray | None = None,
+        promoted_prior: "TeamPrior | None" = None,
+        covariate_names: tuple[str, ...] = (),
+    ) -> "ForecastModel":
+        """Restore a fitted model from its parameters, without any training data.
+
+        The restored model can predict, but must be rebuilt from data (and warm-started
+        from these parameters) before it can be refit or advanced.
+        """
+        model = cls.__new__(cls)
+        model.xi = xi
+        model.covariate_names = tuple(covariate_names)
+        model.teams = teams
+        model.n_teams = len(teams)
+        model._team_index = {team: i for i, team in enumerate(teams)}
+        model._params = params
+        model.prior_mean = np.zeros(2 * model.n_teams)
+        model.prior_precision = np.zeros(2 * model.n_teams)
+        model.promoted_prior = promoted_prior
+        model._unseen_strength = None
+        model._res = None
+        model.loglikelihood = loglikelihood
+        model.aic = aic
+        model.n_params = len(params)
+        model.diagnostics = None
+        model.covariance = covariance
+        model.fitted = True
+        return model
+
+    def _init_params(self, rng: np.random.Generator | None = None) -> FloatArray:
+        """Initialise random parameters, from the global random state by default."""
+        uniform = np.random.uniform if rng is None else rng.uniform
+        team_atk = uniform(0.5, 1.5, (self.n_teams))
+        team_def = uniform(-1.5, -0.5, (self.n_teams))
+        beta = np.zeros(self.n_covariates)
+        home_adv = [0.25]
+        return np.concatenate((team_atk, team_def, beta, home_adv, self.extra_init))
+
+    @property
+    def n_covariates(self) -> int:
+        """Number of covariates in the log-linear predictors."""
+        return len(self.covariate_names)
+
+    @property
+    def version(self) -> str:
+        """Model version its forecasts are stored under, see `model_version`."""
+        return model_version(self.family, self.covariate_names)
+
+    @property
+    def home_adv(self) -> float:
+        """Fitted home advantage."""
+        return float(self._params[2 * self.n_teams + self.n_covariates])
+
+    @property
+    def coefficients(self) -> FloatArray:
+        """Fitted covariate coefficients, in the order of `covariate_names`."""
+        start = 2 * self.n_teams
+        return self._params[start : start + self.n_covariates]
+
+    @property
+    def extra(self) -> dict[str, float]:
+        """Fitted family-specific parameters, by name."""
+        values = self._params[2 * self.n_teams + self.n_covariates + 1 :]
+        return {
+            name: float(v) for name, v in zip(self.extra_params, values, strict=True)
+        }
+
+    @property
+    def constraints(self) -> LinearConstraint:
+        """Constrain the mean attack strength to one (sum of attack equals n_teams)."""
+        a = np.zeros(2 * self.n_teams + self.n_covariates + 1 + len(self.extra_params))
+        a[: self.n_teams] = 1
+        return LinearConstraint(a[np.newaxis, :], self.n_teams, self.n_teams)
+
+    @property
+    def bounds(self) -> list[tuple[float, float]]:
+        """Define parameter bounds."""
+        team_atk = [(0.0, 3.0)] * self.n_teams
+        team_def = [(-3.0, 0.0)] * self.n_teams
+        beta = [(-3.0, 3.0)] * self.n_covariates
+        home_adv = [(0.0, 2.0)]
+        return team_atk + team_def + beta + home_adv + list(self.extra_bounds)
+
+    def fit(
+        self, jac: bool = True, hess: bool = False, kernel: Kernel = "numba"
+    ) -> None:
+        """Fits the model to the data, calculating the team strengths, home advantage and intercept.
+
+        By default SLSQP is given the analytic gradient of the objective. Set `jac=False`
+        to fall back to finite differences, or `hess=True` to use the trust-region
+        method with the Hessian. The objective and gradient are evaluated by the
+        family's fused numba kernel.
+        """
+        logger.info(f"Fitting {self.family} model")
+        start = time.perf_counter()
+        res = self._minimize(self._params, jac=jac, hess=hess, kernel=kernel)
+        self.diagnostics = FitDiagnostics.from_result(
+            res, wall_time=time.perf_counter() - start
+        )
+        self._set_result(res)
+
+    def fit_multistart(
+        self,
+        n_starts: int = 8,
+        seed: int | None = None,
+        max_workers: int | None = None,
+        **fit_kwargs: Any,
+    ) -> list[FitDiagnostics]:
+        """Fit from `n_starts` random starting points concurrently, keeping the best.
+
+        Each restart is seeded from `seed`, so the result is deterministic for a given
+        seed. Returns the diagnostics of every restart; raises if none converged.
+        """
+        logger.info(f"Fitting model with {n_starts} restarts")
+        seeds = np.random.SeedSequence(seed).generate_state(n_starts).tolist()
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            runs = list(pool.map(_fit_restart, repeat(self), seeds, repeat(fit_kwargs)))
+
+        for diagnostics, _ in runs:
+            logger.info(f"Restart {diagnostics}")
+
+        converged = [run for run in runs if run[0].converged]
+        if not converged:
+            raise ValueError(f"Optimization did not converge in {n_starts} restarts")
+
+        self.diagnostics, res = max(converged, key=lambda run: run[0].loglikelihood)
+        self._set_result(res)
+        return [diagnostics for diagnostics, _ in runs]
+
+    def _objective(
+        self, jac: bool, hess: bool, kernel: Kernel
+    ) -> tuple[
+        Callable[[FloatArray], float | tuple[float, FloatArray]],
+        Callable[[FloatArray], FloatArray] | bool | None,
+    ]:
+        """Objective function and gradient option passed to the optimiser."""
+        if kernel != "numba":
+            raise ValueError(f"The {kernel} kernel is not available for {self.family}")
+        if jac or hess:
+            return self._fused_step, True
+        return self._fused_nll, None
+
+    def _minimize(
+        self,
+        x0: FloatArray,
+        jac: bool = True,
+        hess: bool = False,
+        kernel: Kernel = "numba",
+    ) -> OptimizeResult:
+        """Run the optimiser from `x0`."""
+        fun, fit_jac = self._objective(jac=jac, hess=hess, kernel=kernel)
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=RuntimeWarning)
+            return minimize(
+                fun=fun,
+                x0=x0,
+                method="trust-constr" if hess else "SLSQP",
+                jac=fit_jac,
+                hess=self._fit_hess if hess else None,
+                constraints=self.constraints,
+                bounds=self.bounds,
+                options={"maxiter": self.max_iter, "disp": False},
+            )
+
+    def _set_result(self, res: OptimizeResult) -> None:
+        """Set the fitted parameters from a converged optimisation result."""
+        self._res = res
+        if not self._res.success:
+            raise ValueError("Optimization did not converge")
+
+        self._params = self._res["x"]
+        self.n_params = len(self._params)
+        self.loglikelihood = -float(
+            self._res["fun"] - self._prior_penalty(self._params)
+        )
+        self.aic = -2 * self.loglikelihood + 2 * self.n_params
+        self.covariance = None
+        self._unseen_strength = None
+        self.fitted = True
+
+        logger.info(f"Model successfully fitted (AIC: {self.aic:.2f})")
+
+    def parameter_covariance(self) -> FloatArray:
+        """Asymptotic covariance of the fitted parameters from the observed information.
+
+        The information is the Hessian of the objective at the optimum, inverted on the
+        null space of the sum-to-n attack constraint, so the covariance respects the
+        constraint. With time decay this is the information of the weighted
+        likelihood, treating the weights as fixed.
+        """
+        if self.covariance is None:
+            if not self.fitted:
+                raise ValueError(
+                    "Model params not fitted, please call `fit()` before estimating "
+                    "their uncertainty"
+                )
+            self.covariance = constrained_covariance(
+                information=self._fit_hess(self._params), constraint=self.constraints.A
+            )
+        return self.covariance
+
+    def standard_errors(self) -> FloatArray:
+        """Standard errors of the fitted parameters, in the parameter layout."""
+        return np.sqrt(np.diag(self.parameter_covariance()))  # type: ignore[no-any-return]
+
+    def set_xi(self, xi: float) -> None:
+        """Change the time decay, reweighting the existing sufficient statistics."""
+        self.xi = xi
+        self.weights = time_decay(self.data.date, xi=xi)
+        self.stats = self.stats.reweight(self.weights)
+
+    def set_priors(self, prior: "TeamPrior", teams: StrArray) -> None:
+        """Shrink the strengths of `teams` (e.g. newly promoted teams) towards `prior`.
+
+        The priors are a Gaussian penalty on the objective, so fits are MAP estimates.
+        The prior mean also becomes the strength of unseen teams, and the prior is
+        applied to any team added by `advance`.
+        """
+        self.promoted_prior = prior
+        self._unseen_strength = None
+        idx = np.array([self._team_index[t] for t in teams if t in self._team_index])
+        idx = idx.astype(int)
+        self.prior_mean[idx] = prior.attack_mean
+        self.prior_mean[idx + self.n_teams] = prior.defence_mean
+        self.prior_precision[idx] = prior.attack_sd**-2
+        self.prior_precision[idx + self.n_teams] = prior.defence_sd**-2
+
+    def _prior_penalty(self, params: FloatArray) -> float:
+        """Negative log density of the team strength priors, up to a constant."""
+        diff = params[: 2 * self.n_teams] - self.prior_mean
+        return 0.5 * float(np.dot(self.prior_precision * diff, diff))
+
+    def _prior_gradient(self, params: FloatArray) -> FloatArray:
+        """Gradient of the prior penalty."""
+        grad = np.zeros_like(params)
+        grad[: 2 * self.n_teams] = self.prior_precision * (
+            params[: 2 * self.n_teams] - self.prior_mean
+        )
+        return grad
+
+    def warm_start(self, teams: StrArray, params: FloatArray) -> None:
+        """Start the next fit from previously fitted parameters.
+
+        Teams without a previous strength start from the promoted team prior, or the
+        unseen team approximation if there is none.
+        """
+        n_previous = len(teams)
+        previous = {team: i for i, team in enumerate(teams)}
+        idx = np.array([previous.get(team, -1) for team in self.teams], dtype=int)
+        attack = params[idx]
+        defence = params[idx + n_previous]
+
+        unseen = idx < 0
+        if unseen.any():
+            if self.promoted_prior is not None:
+                attack[unseen] = self.promoted_prior.attack_mean
+                defence[unseen] = self.promoted_prior.defence_mean
+            else:
+                attack[unseen], defence[unseen] = unseen_team_strength(
+                    attack=params[:n_previous],
+                    defence=params[n_previous : 2 * n_previous],
+                )
+        self._params = np.concatenate((attack, defence, params[2 * n_previous :]))
+
+    def advance(
+        self,
+        home_team: StrArray,
+        away_team: StrArray,
+        home_goals: IntArray,
+        away_goals: IntArray,
+        date: DateArray,
+        home_covariates: FloatArray | None = None,
+        away_covariates: FloatArray | None = None,
+        **fit_kwargs: Any,
+    ) -> None:
+        """Add new results (e.g. a gameweek) and refit, warm-started from the current fit.
+
+        The existing sufficient statistics are decayed to the new latest date and only
+        the new results are grouped into them, so no work is repeated for the history.
+        """
+        if not self.fitted:
+            raise ValueError("Model must be fitted before it can be advanced")
+
+        data = self.data.extend(
+            home_team=home_team,
+            away_team=away_team,
+            home_goals=home_goals,
+            away_goals=away_goals,
+            date=date,
+            home_covariates=home_covariates,
+            away_covariates=away_covariates,
+        )
+        latest = data.date.max()
+        decay = float(time_decay(self.data.date.max(), xi=self.xi, reference=latest))
+        weights = time_decay(data.date[len(self.data) :], xi=self.xi, reference=latest)
+
+        self.stats = self.stats.extend(data, weights=weights, decay=decay)
+        self.weights = np.concatenate((self.weights * decay, weights))
+
+        teams, params = self.teams, self._params
+        prior_mean, prior_precision = self.prior_mean, self.prior_precision
+        self.data = data
+        self.teams = data.teams
+        self.n_teams = data.n_teams
+        self._team_index = {team: i for i, team in enumerate(self.teams)}
+
+        # Existing teams keep their index, so the priors only grow for new teams
+        n_new = self.n_teams - len(teams)
+        self.prior_mean = _pad_teams(prior_mean, len(teams), n_new)
+        self.prior_precision = _pad_teams(prior_precision, len(teams), n_new)
+        if self.promoted_prior is not None and n_new:
+            self.set_priors(self.promoted_prior, teams=self.teams[len(teams) :])
+        self.warm_start(teams=teams, params=params)
+        self.fit(**fit_kwargs)
+
+    def _fused_step(self, params: FloatArray) -> tuple[float, FloatArray]:
+        """Model fit iteration returning the objective and its gradient in one pass."""
+        grad = np.empty_like(params)
+        nll = self.kernel(
+            params,
+            self.stats.home_idx,
+            self.stats.away_idx,
+            self.stats.home_goals,
+            self.stats.away_goals,
+            self.stats.home_x,
+            self.stats.away_x,
+            self.stats.weights,
+            self.n_teams,
+            grad,
+        )
+        grad += self._prior_gradient(params)
+        return nll + self._prior_penalty(params), grad
+
+    def _fused_nll(self, params: FloatArray) -> float:
+        """Model fit iteration using the fused kernel, without the gradient."""
+        nll = self.kernel(
+            params,
+            self.stats.home_idx,
+            self.stats.away_idx,
+            self.stats.home_goals,
+            self.stats.away_goals,
+            self.stats.home_x,
+            self.stats.away_x,
+            self.stats.weights,
+            self.n_teams,
+            np.empty(0),
+        )
+        return nll + self._prior_penalty(params)
+
+    def _fit_hess(self, params: FloatArray) -> FloatArray:
+        """Hessian of the model fit objective, by central differences of its gradient."""
+        steps = HESSIAN_STEP * np.maximum(np.abs(params), 1.0)
+        hess = np.empty((len(params), len(params)))
+        for i, step in enumerate(steps):
+            shift = np.zeros_like(params)
+            shift[i] = step
+            upper = self._fused_step(params + shift)[1]
+            lower = self._fused_step(params - shift)[1]
+            hess[i] = (upper - lower) / (2 * step)
+        return (hess + hess.T) / 2  # type: ignore[no-any-return]
+
+    def predict(
+        self,
+        home_team: str,
+        away_team: str,
+        level: float | None = None,
+        home_covariates: FloatArray | None = None,
+        away_covariates: FloatArray | None = None,
+    ) -> dict[str, float]:
+        """Predicts the probabilities of the different possible match outcomes.
+
+        Pass a confidence `level` to include intervals on the predictions, where the
+        model family supports them. Covariate models also need the fixture's
+        covariate vectors.
+        """
+        logger.info(f"Predicting fixture: {home_team} vs {away_team}")
+        home_teams, away_teams = np.array([home_team]), np.array([away_team])
+        if home_covariates is not None:
+            home_covariates = np.atleast_2d(home_covariates)
+        if away_covariates is not None:
+            away_covariates = np.atleast_2d(away_covariates)
+        results = self.predict_many(
+            home_teams=home_teams,
+            away_teams=away_teams,
+            home_covariates=home_covariates,
+            away_covariates=away_covariates,
+        )
+        if level is not None:
+            # Only the families with a delta-method covariance provide intervals
+            predict_intervals = getattr(self, "predict_intervals", None)
+            if predict_intervals is None:
+                raise ValueError(
+                    f"Prediction intervals are not available for {self.family}"
+                )
+            results |= predict_intervals(
+                home_teams,
+                away_teams,
+                level=level,
+                home_covariates=home_covariates,
+                away_covariates=away_covariates,
+            )
+        return {k: float(round(v[0], 4)) for k, v in results.items()}
+
+    def predict_many(
+        self,
+        home_teams: StrArray,
+        away_teams: StrArray,
+        max_goals: int | None = None,
+        home_covariates: FloatArray | None = None,
+        away_covariates: FloatArray | None = None,
+    ) -> dict[str, FloatArray]:
+        """Predicts the outcome probabilities of many fixtures at once.
+
+        Returns a column per outcome, with one row per fixture.
+        """
+        if not self.fitted:
+            raise ValueError(
+                "Model params not fitted, please call `fit()` before predicting values"
+            )
+
+        home_atk, home_def = self.get_team_strengths(home_teams)
+        away_atk, away_def = self.get_team_strengths(away_teams)
+        home_effect, away_effect = self._covariate_effects(
+            len(home_atk), home_covariates, away_covariates
+        )
+        home_rate = np.exp(home_atk + away_def + home_effect + self.home_adv)
+        away_rate = np.exp(away_atk + home_def + away_effect)
+        dist = self._score_distribution(home_rate, away_rate, max_goals=max_goals)
+        home_goal_exp, away_goal_exp = self._goal_means(home_rate, away_rate)
+
+        return score_outputs(dist) | {
+            "home_goals_for": home_goal_exp,
+            "away_goals_for": away_goal_exp,
+            "home_attack": home_atk,
+            "away_attack": away_atk,
+            "home_defence": home_def,
+            "away_defence": away_def,
+        }
+
+    def _covariate_effects(
+        self,
+        n_fixtures: int,
+        home_covariates: FloatArray | None,
+        away_covariates: FloatArray | None,
+    ) -> tuple[FloatArray, FloatArray]:
+        """Covariate terms of the home and away log-linear predictors of many fixtures."""
+        if not self.n_covariates:
+            return np.zeros(n_fixtures), np.zeros(n_fixtures)
+        if home_covariates is None or away_covariates is None:
+            raise ValueError(
+                f"Model has covariates {self.covariate_names}, "
+                "pass home_covariates and away_covariates to predict"
+            )
+        home_x = design_matrix(home_covariates, n_fixtures)
+        away_x = design_matrix(away_covariates, n_fixtures)
+        if home_x.shape[1] != self.n_covariates or away_x.shape[1] != self.n_covariates:
+            raise ValueError(
+                f"Expected {self.n_covariates} covariates {self.covariate_names}, "
+                f"got {home_x.shape[1]} and {away_x.shape[1]}"
+            )
+        return home_x @ self.coefficients, away_x @ self.coefficients
+
+    def team_rates(
+        self,
+        home_teams: StrArray,
+        away_teams: StrArray,
+        home_covariates: FloatArray | None = None,
+        away_covariates: FloatArray | None = None,
+    ) -> tuple[FloatArray, FloatArray]:
+        """Home and away goal rates of many fixtures, from the log-linear predictors."""
+        home_atk, home_def = self.get_team_strengths(home_teams)
+        away_atk, away_def = self.get_team_strengths(away_teams)
+        home_effect, away_effect = self._covariate_effects(
+            len(home_atk), home_covariates, away_covariates
+        )
+        return (
+            np.exp(home_atk + away_def + home_effect + self.home_adv),
+            np.exp(away_atk + home_def + away_effect),
+        )
+
+    def expected_goals_many(
+        self,
+        home_teams: StrArray,
+        away_teams: StrArray,
+        home_covariates: FloatArray | None = None,
+        away_covariates: FloatArray | None = None,
+    ) -> tuple[FloatArray, FloatArray]:
+        """Home and away goal expectations of many fixtures."""
+        return self._goal_means(
+            *self.team_rates(home_teams, away_teams, home_covariates, away_covariates)
+        )
+
+    def score_distribution(
+        self,
+        home_teams: StrArray,
+        away_teams: StrArray,
+        max_goals: int | None = None,
+        tol: float = TAIL_TOLERANCE,
+        home_covariates: FloatArray | None = None,
+        away_covariates: FloatArray | None = None,
+    ) -> ScoreDistribution:
+        """Joint scoreline distribution of many fixtures.
+
+        Unless `max_goals` is given, the matrices are truncated at the fewest goals that
+        keep every fixture's dropped probability mass below `tol`.
+        """
+        home_rate, away_rate = self.team_rates(
+            home_teams, away_teams, home_covariates, away_covariates
+        )
+        return self._score_distribution(
+            home_rate, away_rate, max_goals=max_goals, tol=tol
+        )
+
+    def loglikelihood_many(
+        self,
+        home_teams: StrArray,
+        away_teams: StrArray,
+        home_goals: IntArray,
+        away_goals: IntArray,
+        home_covariates: FloatArray | None = None,
+        away_covariates: FloatArray | None = None,
+    ) -> FloatArray:
+        """Predictive log-likelihood of each observed scoreline."""
+        home_rate, away_rate = self.team_rates(
+            home_teams, away_teams, home_covariates, away_covariates
+        )
+        return self._loglikelihood(
+            home_rate,
+            away_rate,
+            np.asarray(home_goals, dtype=np.int64),
+            np.asarray(away_goals, dtype=np.int64),
+        )
+
+    def _goal_means(
+        self, home_rate: FloatArray, away_rate: FloatArray
+    ) -> tuple[FloatArray, FloatArray]:
+        """Expected home and away goals given the goal rates."""
+        return home_rate, away_rate
+
+    @abstractmethod
+    def _score_distribution(
+        self,
+        home_rate: FloatArray,
+        away_rate: FloatArray,
+        max_goals: int | None = None,
+        tol: float = TAIL_TOLERANCE,
+    ) -> ScoreDistribution:
+        """Batched joint scoreline distribution given the goal rates."""
+
+    @abstractmethod
+    def _loglikelihood(
+        self,
+        home_rate: FloatArray,
+        away_rate: FloatArray,
+        home_goals: IntArray,
+        away_goals: IntArray,
+    ) -> FloatArray:
+        """Log-likelihood of each scoreline given the goal rates."""
+
+    def evaluate(
+        self,
+        home_team: StrArray,
+        away_team: StrArray,
+        home_goals: IntArray,
+        away_goals: IntArray,
+        home_covariates: FloatArray | None = None,
+        away_covariates: FloatArray | None = None,
+    ) -> ForecastScores:
+        """Evaluate the performance of the fitted model against a test set."""
+        preds = self.predict_many(
+            home_teams=home_team,
+            away_teams=away_team,
+            home_covariates=home_covariates,
+            away_covariates=away_covariates,
+        )
+        scores = ForecastScores.from_predictions(
+            home_win=preds["home_win"],
+            draw=preds["draw"],
+            away_win=preds["away_win"],
+            home_goals_for=preds["home_goals_for"],
+            away_goals_for=preds["away_goals_for"],
+            home_goals=home_goals,
+            away_goals=away_goals,
+        )
+        logger.info(f"Scores: {scores}")
+        return scores
+
+    def get_all_team_strengths(self) -> dict[str, dict[str, float]]:
+        """Get a dictionary of team to attack and defence strengths as fitted by the model.
+
+        Strengths include their standard errors when the covariance is available.
+        """
+        strengths = {
+            team: {"attack": self._params[i], "defence": self._params[i + self.n_teams]}
+            for i, team in enumerate(self.teams)
+        }
+        if self.covariance is not None:
+            se = self.standard_errors()
+            for i, team in enumerate(self.teams):
+                strengths[team]["attack_se"] = se[i]
+                strengths[team]["defence_se"] = se[i + self.n_teams]
+        return strengths
+
+    def get_team_strength(self, team: str) -> tuple[float, float]:
+        """Get the attack and defence strength for a single team."""
+        if team not in self._team_index:
+            return self._new_team_strength()
+
+        i = self._team_index[team]
+        return self._params[i], self._params[i + self.n_teams]
+
+    def get_team_strengths(self, teams: StrArray) -> tuple[FloatArray, FloatArray]:
+        """Get the attack and defence strengths for an array of teams."""
+        idx = np.array([self._team_index.get(team, -1) for team in teams], dtype=int)
+        attack = self._params[idx]
+        defence = self._params[idx + self.n_teams]
+
+        unseen = idx < 0
+        if unseen.any():
+            attack[unseen], defence[unseen] = self._new_team_strength()
+        return attack, defence
+
+    def _new_team_strength(self) -> tuple[float, float]:
+        """Strength of unseen teams, cached until the next fit.
+
+        This is the promoted team prior mean, or an approximation from the fitted
+        strengths when there is no prior.
+        """
+        if self._unseen_strength is None:
+            if self.promoted_prior is not None:
+                self._unseen_strength = (
+                    self.promoted_prior.attack_mean,
+                    self.promoted_prior.defence_mean,
+                )
+            else:
+                self._unseen_strength = unseen_team_strength(
+                    attack=self._params[: self.n_teams],
+                    defence=self._params[self.n_teams : 2 * self.n_teams],
+                )
+        return self._unseen_strength
+
+
+def model_version(family: str, covariate_names: tuple[str, ...] = ()) -> str:
+    """Version of a model's forecasts: its family and any covariates."""
+    return "+".join((family, *covariate_names))
+
+
+def unseen_team_strength(
+    attack: FloatArray, defence: FloatArray
+) -> tuple[float, float]:
+    """Approximate the strength of an unseen team from the fitted team strengths.
+
+    This is the fallback for when there is no promoted team prior.
+    """
+    mean_atk = np.percentile(sorted(attack), 0.4)
+    mean_def = np.percentile(sorted(defence), 0.4)
+    return mean_atk, mean_def
+
+
+def _pad_teams(values: FloatArray, n_teams: int, n_new: int) -> FloatArray:
+    """Append zeros for new teams to per-team values laid out as [attack, defence]."""
+    zeros = np.zeros(n_new)
+    return np.concatenate((values[:n_teams], zeros, values[n_teams:], zeros))
+
+
+def _fit_restart(
+    model: ForecastModel, seed: int, fit_kwargs: dict[str, Any]
+) -> tuple[FitDiagnostics, OptimizeResult]:
+    """Optimise a copy of the model from a seeded random starting point."""
+    start = time.perf_counter()
+    x0 = model._init_params(np.random.default_rng(seed))
+    res = model._minimize(x0, **fit_kwargs)
+    wall_time = time.perf_counter() - start
+    return FitDiagnostics.from_result(res, wall_time=wall_time, seed=seed), res
+
+
+def constrained_covariance(
+    information: FloatArray, constraint: FloatArray
+) -> FloatArray:
+    """Invert the information matrix on the null space of linear equality constraints.
+
+    Parameters are re-expressed in a basis Z of directions that keep the constraints
+    satisfied, so the covariance is Z (Z^T I Z)^-1 Z^T and is singular along the
+    constrained directions.
+    """
+    basis = null_space(constraint)
+    reduced = basis.T @ information @ basis
+    return basis @ np.linalg.solve(reduced, basis.T)  # type: ignore[no-any-return]
+
+
+def score_outputs(dist: ScoreDistribution) -> dict[str, FloatArray]:
+    """The predicted outputs that are sums over the score matrix."""
+    home_win, draw, away_win = dist.outcomes()
+    return {
+        "home_win": home_win,
+        "draw": draw,
+        "away_win": away_win,
+        "home_clean_sheet": dist.away_goals[:, 0],
+        "away_clean_sheet": dist.home_goals[:, 0],
+    }
+
+
+def time_decay(
+    dates: DateArray, xi: float, reference: np.datetime64 | None = None
+) -> FloatArray:
+    """Exponentially decay fixtures so that old ones influence the current strength less.
+
+    Fixtures are decayed relative to the `reference` date, by default the latest date.
+    """
+    reference = dates.max() if reference is None else reference
+    return np.exp(-xi * (reference - dates).astype(int))  # type: ignore[no-any-return]
+
+
+@njit  # type: ignore[misc]
+def covariate_effect(params: FloatArray, start: int, x: FloatArray, i: int) -> float:
+    """Covariate term of row `i` of a log-linear predictor, coefficients from `start`."""
+    effect = 0.0
+    for j in range(x.shape[1]):
+        effect += params[start + j] * x[i, j]
+    return effect
+
+
+@njit  # type: ignore[misc]
+def log_factorial(k: int) -> float:
+    """Exact log(k!), read from the lookup table where possible."""
+    if k <= MAX_TABLE_GOALS:
+        return LOG_FACTORIAL[k]  # type: ignore[no-any-return]
+    return math.lgamma(k + 1)
+
+
+@vectorize(["float64(int64, float64)"])  # type: ignore[misc]
+def poisson_logpmf(k: int, mu: float) -> float:
+    """Fast Poisson log-PMF using the log-factorial lookup table."""
+    return k * np.log(mu) - log_factorial(k) - mu  # type: ignore[no-any-return]
+
+
+def joint_probability_matrix(
+    home_goal_exp: FloatArray, away_goal_exp: FloatArray, max_goals: int = 7
+) -> FloatArray:
+    """Build the (n_fixtures, max_goals, max_goals) joint score probability matrices."""
+    goals = np.arange(max_goals)
+    gammaln = np.array([log_factorial(k) for k in goals])
+    home_probs = np.exp(
+        -home_goal_exp[:, np.newaxis]
+        + goals * np.log(home_goal_exp[:, np.newaxis])
+        - gammaln
+    )
+    away_probs = np.exp(
+        -away_goal_exp[:, np.newaxis]
+        + goals * np.log(away_goal_exp[:, np.newaxis])
+        - gammaln
+    )
+    return home_probs[:, :, np.newaxis] * away_probs[:, np.newaxis, :]  # type: ignore[no-any-return]
@@ -0,0 +1,214 @@
+"""Bivariate Poisson team strength model."""
+
+import math
+from typing import Any
+
+import numpy as np
+from numba import njit
+
+from app.fixtures.forecasts.base import (
+    FASTMATH,
+    ForecastModel,
+    covariate_effect,
+    joint_probability_matrix,
+    log_factorial,
+)
+from app.fixtures.forecasts.encoding import FloatArray, IntArray
+from app.fixtures.forecasts.markets import (
+    TAIL_TOLERANCE,
+    ScoreDistribution,
+    truncation_goals,
+)
+
+
+class BivariatePoissonModel(ForecastModel):
+    """Bivariate Poisson team strength model.
+
+    Home and away goals are X = Y1 + Y3 and Y = Y2 + Y3, with independent Poisson
+    Y1 and Y2 at the team goal rates and a shared Poisson Y3 at rate `covariance`,
+    which is also the covariance of the two scores.
+    """
+
+    family = "bivariate_poisson"
+    extra_params = ("covariance",)
+    extra_init = (0.1,)
+    extra_bounds = ((1e-6, 1.0),)
+
+    @staticmethod
+    def kernel(*args: Any) -> float:
+        """Fused bivariate Poisson negative log-likelihood, see `bivariate_poisson_nll`."""
+        return bivariate_poisson_nll(*args)  # type: ignore[no-any-return]
+
+    def _goal_means(
+        self, home_rate: FloatArray, away_rate: FloatArray
+    ) -> tuple[FloatArray, FloatArray]:
+        """Both goal expectations include the shared component."""
+        lambda3 = self._params[-1]
+        return home_rate + lambda3, away_rate + lambda3
+
+    def _score_distribution(
+        self,
+        home_rate: FloatArray,
+        away_rate: FloatArray,
+        max_goals: int | None = None,
+        tol: float = TAIL_TOLERANCE,
+    ) -> ScoreDistribution:
+        """Bivariate Poisson joint scoreline distribution given the goal rates."""
+        return score_distribution(
+            home_rate=home_rate,
+            away_rate=away_rate,
+            lambda3=self._params[-1],
+            max_goals=max_goals,
+            tol=tol,
+        )
+
+    def _loglikelihood(
+        self,
+        home_rate: FloatArray,
+        away_rate: FloatArray,
+        home_goals: IntArray,
+        away_goals: IntArray,
+    ) -> FloatArray:
+        """Bivariate Poisson log-likelihood of each scoreline."""
+        return bivariate_poisson_loglikelihood(  # type: ignore[no-any-return]
+            home_goals, away_goals, home_rate, away_rate, self._params[-1]
+        )
+
+
+@njit(fastmath=FASTMATH, cache=True)  # type: ignore[misc]
+def shared_goals(
+    home_goals: int, away_goals: int, home_rate: float, away_rate: float, lambda3: float
+) -> tuple[float, float]:
+    """Log of the bivariate Poisson sum relative to its first term, and E[Y3 | x, y].
+
+    The probability of x-y is exp(-(l1 + l2 + l3)) * sum_k t_k, where
+    t_k = l1^(x-k) / (x-k)! * l2^(y-k) / (y-k)! * l3^k / k! over the possible numbers
+    of shared goals k. The terms are accumulated as ratios t_k / t_0, which keeps the
+    sum in range, and their k-weighted mean is the expected number of shared goals.
+    """
+    ratio = 1.0
+    total = 1.0
+    k_total = 0.0
+    ratio_step = lambda3 / (home_rate * away_rate)
+    for k in range(1, min(home_goals, away_goals) + 1):
+        ratio *= (home_goals - k + 1) * (away_goals - k + 1) * ratio_step / k
+        total += ratio
+        k_total += k * ratio
+    return math.log(total), k_total / total
+
+
+@njit(fastmath=FASTMATH, cache=True)  # type: ignore[misc]
+def bivariate_poisson_nll(
+    params: FloatArray,
+    home_idx: IntArray,
+    away_idx: IntArray,
+    home_goals: IntArray,
+    away_goals: IntArray,
+    home_x: FloatArray,
+    away_x: FloatArray,
+    weights: FloatArray,
+    n_teams: int,
+    grad: FloatArray,
+) -> float:
+    """Fused weighted bivariate Poisson negative log-likelihood (and gradient).
+
+    If `grad` is non-empty, the gradient is written into it.
+    """
+    with_grad = grad.size > 0
+    if with_grad:
+        grad[:] = 0.0
+
+    beta = 2 * n_teams
+    n_covariates = home_x.shape[1]
+    home_adv = params[beta + n_covariates]
+    lambda3 = params[beta + n_covariates + 1]
+    nll = 0.0
+    for i in range(home_idx.size):
+        h, a = home_idx[i], away_idx[i]
+        hg, ag = home_goals[i], away_goals[i]
+        w = weights[i]
+
+        eta_h = params[h] + params[n_teams + a] + home_adv
+        eta_a = params[a] + params[n_teams + h]
+        if n_covariates:
+            eta_h += covariate_effect(params, beta, home_x, i)
+            eta_a += covariate_effect(params, beta, away_x, i)
+        home_rate = math.exp(eta_h)
+        away_rate = math.exp(eta_a)
+        log_total, shared = shared_goals(hg, ag, home_rate, away_rate, lambda3)
+
+        llk = hg * eta_h - log_factorial(hg) + ag * eta_a - log_factorial(ag)
+        llk += log_total - home_rate - away_rate - lambda3
+        nll -= w * llk
+
+        if with_grad:
+            g_h = w * (hg - shared - home_rate)
+            g_a = w * (ag - shared - away_rate)
+            grad[h] -= g_h
+            grad[n_teams + a] -= g_h
+            grad[beta + n_covariates] -= g_h
+            grad[a] -= g_a
+            grad[n_teams + h] -= g_a
+            grad[beta + n_covariates + 1] -= w * (shared / lambda3 - 1.0)
+            for j in range(n_covariates):
+                grad[beta + j] -= g_h * home_x[i, j] + g_a * away_x[i, j]
+
+    return nll
+
+
+@njit(cache=True)  # type: ignore[misc]
+def bivariate_poisson_loglikelihood(
+    home_goals: IntArray,
+    away_goals: IntArray,
+    home_rate: FloatArray,
+    away_rate: FloatArray,
+    lambda3: float,
+) -> FloatArray:
+    """Bivariate Poisson log-likelihood of each scoreline."""
+    llk = np.empty(home_goals.size)
+    for i in range(home_goals.size):
+        hg, ag = home_goals[i], away_goals[i]
+        log_total, _ = shared_goals(hg, ag, home_rate[i], away_rate[i], lambda3)
+        llk[i] = (
+            hg * math.log(home_rate[i])
+            - log_factorial(hg)
+            + ag * math.log(away_rate[i])
+            - log_factorial(ag)
+            + log_total
+            - home_rate[i]
+            - away_rate[i]
+            - lambda3
+        )
+    return llk
+
+
+def score_distribution(
+    home_rate: FloatArray,
+    away_rate: FloatArray,
+    lambda3: float,
+    max_goals: int | None = None,
+    tol: float = TAIL_TOLERANCE,
+) -> ScoreDistribution:
+    """Build the bivariate Poisson joint scoreline distribution of a batch of fixtures.
+
+    The matrix is the independent Poisson matrix of the team rates, shifted along the
+    diagonal by each number of shared goals and weighted by its Poisson probability.
+    """
+    if max_goals is None:
+        # Each marginal is Poisson with the shared rate added
+        max_goals = truncation_goals(home_rate + lambda3, away_rate + lambda3, tol=tol)
+    independent = joint_probability_matrix(
+        home_goal_exp=home_rate, away_goal_exp=away_rate, max_goals=max_goals
+    )
+    shared = np.exp(
+        -lambda3
+        + np.arange(max_goals) * math.log(lambda3)
+        - np.array([log_factorial(k) for k in range(max_goals)])
+    )
+    m = np.zeros_like(independent)
+    for k in range(max_goals):
+        m[:, k:, k:] += shared[k] * independent[:, : max_goals - k, : max_goals - k]
+
+    tail_mass = 1 - m.sum(axis=(1, 2))
+    m /= m.sum(axis=(1, 2), keepdims=True)
+    return ScoreDistribution(matrix=m, tail_mass=tail_mass)
@@ -0,0 +1,183 @@
+"""Block bootstrap of the Dixon-Coles parameter distribution."""
+
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+
+import numpy as np
+import numpy.typing as npt
+
+from app.fixtures.forecasts.base import score_outputs, unseen_team_strength
+from app.fixtures.forecasts.dixon_coles import DixonColesModel, score_distribution
+from app.fixtures.forecasts.encoding import FloatArray, IntArray, StrArray
+from app.fixtures.forecasts.priors import TeamPrior
+from app.logger import logger
+
+N_REPLICATES = 200
+
+ReplicateParams = npt.NDArray[np.float32]
+
+
+@dataclass
+class BootstrapReplicates:
+    """Parameters refitted on resampled data, one row per converged replicate.
+
+    Replicates are stored as float32, which is ample for the parameters' sampling
+    spread and halves the footprint of large replicate sets.
+    """
+
+    teams: StrArray
+    params: ReplicateParams  # (n_replicates, n_params)
+    n_failed: int
+    promoted_prior: TeamPrior | None = None
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    @property
+    def n_teams(self) -> int:
+        """Number of teams."""
+        return len(self.teams)
+
+    def standard_errors(self) -> FloatArray:
+        """Bootstrap standard errors of the parameters, in the parameter layout."""
+        return self.params.std(axis=0, ddof=1, dtype=np.float64)  # type: ignore[no-any-return]
+
+    def team_strengths(self, teams: StrArray) -> tuple[FloatArray, FloatArray]:
+        """Attack and defence of each team in every replicate, (n_replicates, n_teams).
+
+        Unseen teams get the promoted team prior mean, or otherwise each replicate's
+        unseen team approximation, so their spread reflects the uncertainty of the
+        fitted strengths it is derived from.
+        """
+        team_index = {team: i for i, team in enumerate(self.teams)}
+        idx = np.array([team_index.get(team, -1) for team in teams], dtype=int)
+        params = self.params.astype(np.float64)
+        attack = params[:, idx]
+        defence = params[:, idx + self.n_teams]
+
+        unseen = idx < 0
+        if unseen.any() and self.promoted_prior is not None:
+            attack[:, unseen] = self.promoted_prior.attack_mean
+            defence[:, unseen] = self.promoted_prior.defence_mean
+        elif unseen.any():
+            strengths = np.array(
+                [
+                    unseen_team_strength(
+                        attack=p[: self.n_teams],
+                        defence=p[self.n_teams : 2 * self.n_teams],
+                    )
+                    for p in params
+                ]
+            )
+            attack[:, unseen] = strengths[:, [0]]
+            defence[:, unseen] = strengths[:, [1]]
+        return attack, defence
+
+    def predict_intervals(
+        self,
+        home_teams: StrArray,
+        away_teams: StrArray,
+        level: float = 0.95,
+        max_goals: int | None = None,
+    ) -> dict[str, FloatArray]:
+        """Percentile intervals of the predicted outcomes of a batch of fixtures.
+
+        Every replicate and fixture is predicted in one batched score distribution.
+        Returns `{output}_se`, `{output}_lower` and `{output}_upper` columns.
+        """
+        home_atk, home_def = self.team_strengths(home_teams)
+        away_atk, away_def = self.team_strengths(away_teams)
+        home_adv = self.params[:, -2, np.newaxis].astype(np.float64)
+        rho = np.repeat(self.params[:, -1].astype(np.float64), len(home_teams))
+        home_goal_exp = np.exp(home_atk + away_def + home_adv)
+        away_goal_exp = np.exp(away_atk + home_def)
+
+        dist = score_distribution(
+            home_goal_exp=home_goal_exp.ravel(),
+            away_goal_exp=away_goal_exp.ravel(),
+            rho=rho,
+            max_goals=max_goals,
+        )
+        outputs = score_outputs(dist)
+        outputs |= {"home_goals_for": home_goal_exp, "away_goals_for": away_goal_exp}
+
+        tail = (1 - level) / 2
+        intervals = {}
+        for name, values in outputs.items():
+            values = values.reshape(len(self), len(home_teams))
+            lower, upper = np.quantile(values, [tail, 1 - tail], axis=0)
+            intervals[f"{name}_se"] = values.std(axis=0, ddof=1)
+            intervals[f"{name}_lower"] = lower
+            intervals[f"{name}_upper"] = upper
+        return intervals
+
+
+def gameweek_blocks(model: DixonColesModel) -> IntArray:
+    """Block of each fixture, taking calendar weeks as a proxy for gameweeks."""
+    weeks = model.data.date.astype("datetime64[W]").astype(np.int64)
+    _, blocks = np.unique(weeks, return_inverse=True)
+    return blocks  # type: ignore[no-any-return]
+
+
+def block_bootstrap(
+    model: DixonColesModel,
+    n_replicates: int = N_REPLICATES,
+    blocks: IntArray | None = None,
+    seed: int | None = None,
+    max_workers: int | None = None,
+) -> BootstrapReplicates:
+    """Refit a fitted model on block-resampled data across worker processes.
+
+    Blocks of fixtures (by default the gameweek of each fixture) are drawn with
+    replacement, so the dependence between results in the same round is kept. A
+    resample only changes how often each block is counted, so it is applied by
+    reweighting the existing sufficient statistics, and each replicate is warm-started
+    from the point estimate. Replicates that fail to converge are dropped.
+    """
+    if not model.fitted:
+        raise ValueError(
+            "Model params not fitted, please call `fit()` before bootstrapping"
+        )
+    if model.n_covariates:
+        raise ValueError("Bootstrapping covariate models is not supported")
+
+    blocks = gameweek_blocks(model) if blocks is None else blocks
+    n_chunks = min(max_workers or os.cpu_count() or 1, n_replicates)
+    seeds = np.random.SeedSequence(seed).generate_state(n_replicates).tolist()
+    chunks = [chunk.tolist() for chunk in np.array_split(seeds, n_chunks)]
+    logger.info(
+        f"Bootstrapping {n_replicates} replicates over {blocks.max() + 1} blocks"
+    )
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        parts = list(pool.map(_bootstrap_chunk, repeat(model), repeat(blocks), chunks))
+
+    params = np.concatenate(parts)
+    n_failed = n_replicates - len(params)
+    if n_failed:
+        logger.warning(f"{n_failed} bootstrap replicates did not converge")
+    return BootstrapReplicates(
+        teams=model.teams,
+        params=params,
+        n_failed=n_failed,
+        promoted_prior=model.promoted_prior,
+    )
+
+
+def _bootstrap_chunk(
+    model: DixonColesModel, blocks: IntArray, seeds: list[int]
+) -> ReplicateParams:
+    """Fit the replicates of a chunk of seeds in a worker process."""
+    replicate = copy.copy(model)
+    n_blocks = blocks.max() + 1
+    params = []
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        counts = rng.multinomial(n_blocks, np.full(n_blocks, 1 / n_blocks))
+        replicate.stats = model.stats.reweight(model.weights * counts[blocks])
+        res = replicate._minimize(model._params)
+        if res.success:
+            params.append(res.x)
+    return np.array(params, dtype=np.float32).reshape(-1, len(model._params))
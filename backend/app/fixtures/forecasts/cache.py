@@ -0,0 +1,120 @@
+"""In-process cache of serialized gameweek forecasts for the API."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from app.fixtures.forecasts.models import GameweekForecastsRead
+
+MAX_CACHED_GAMEWEEKS = 256
+# Seconds before a cached gameweek is reloaded, which bounds how stale it can be when
+# forecasts are written by another process, such as the fill scripts
+FORECAST_CACHE_TTL = 300.0
+
+
+@dataclass(frozen=True)
+class ForecastKey:
+    """Identifies a gameweek's forecasts by one model version."""
+
+    season: str
+    gameweek: int
+    model_version: str
+
+
+@dataclass(frozen=True)
+class CachedGameweek:
+    """A gameweek's forecasts, serialized once as a whole and per team."""
+
+    body: bytes
+    team_bodies: dict[int, bytes]
+    empty_body: bytes
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def serialize(cls, forecasts: GameweekForecastsRead) -> "CachedGameweek":
+        """Render the JSON responses for the gameweek and for each team playing in it."""
+        team_ids = {
+            team.id
+            for item in forecasts.items
+            for team in (item.home_team, item.away_team)
+        }
+        team_bodies = {
+            team_id: forecasts.model_copy(
+                update={
+                    "items": [
+                        item
+                        for item in forecasts.items
+                        if team_id in (item.home_team.id, item.away_team.id)
+                    ]
+                }
+            )
+            .model_dump_json()
+            .encode()
+            for team_id in team_ids
+        }
+        return cls(
+            body=forecasts.model_dump_json().encode(),
+            team_bodies=team_bodies,
+            empty_body=forecasts.model_copy(update={"items": []})
+            .model_dump_json()
+            .encode(),
+        )
+
+    def for_team(self, team_id: int | None) -> bytes:
+        """Response body for one team's fixtures, or the whole gameweek."""
+        if team_id is None:
+            return self.body
+        return self.team_bodies.get(team_id, self.empty_body)
+
+
+class ForecastCache:
+    """Serialized gameweek forecasts, held in an LRU cache with a time to live."""
+
+    def __init__(
+        self, max_cached: int = MAX_CACHED_GAMEWEEKS, ttl: float = FORECAST_CACHE_TTL
+    ) -> None:
+        self.max_cached = max_cached
+        self.ttl = ttl
+        self._cache: OrderedDict[ForecastKey, CachedGameweek] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on invalidation, so loads that raced a write are not cached
+        self._generation = 0
+
+    def get(
+        self, key: ForecastKey, load: Callable[[], CachedGameweek]
+    ) -> CachedGameweek:
+        """Get a gameweek from the cache, calling `load` on a miss or expiry."""
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and time.monotonic() - cached.loaded_at < self.ttl:
+                self._cache.move_to_end(key)
+                return cached
+            generation = self._generation
+
+        cached = load()
+        with self._lock:
+            if generation == self._generation:
+                self._cache[key] = cached
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_cached:
+                    self._cache.popitem(last=False)
+        return cached
+
+    def invalidate(self, model_version: str | None = None) -> None:
+        """Drop the cached gameweeks of a model version, or all of them."""
+        with self._lock:
+            self._generation += 1
+            for key in list(self._cache):
+                if model_version is None or key.model_version == model_version:
+                    del self._cache[key]
+
+    def __contains__(self, key: ForecastKey) -> bool:
+        return key in self._cache
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+forecast_cache = ForecastCache()
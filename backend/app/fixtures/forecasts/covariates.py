@@ -0,0 +1,130 @@
+"""Rolling expected goals covariates of the team strength models."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.fixtures.forecasts.encoding import DateArray, FloatArray, IntArray, StrArray
+
+# Number of previous matches in each team's rolling expected goals
+XG_WINDOW = 6
+
+# Floor on rolling expected goals before taking logs, well below any team's average
+MIN_XG = 0.05
+
+XG_COVARIATES = ("xg_for", "xg_against")
+
+
+@dataclass
+class RollingXG:
+    """Pre-match rolling expected goals for and against of each fixture's teams.
+
+    `home` and `away` are (n_fixtures, 2) arrays of each team's mean [xG for,
+    xG against] over its previous `window` matches, skipping any without expected
+    goals, and NaN when there are none. `latest` holds the same after every fixture, one row per team in `teams`.
+    """
+
+    home: FloatArray
+    away: FloatArray
+    teams: StrArray
+    latest: FloatArray
+    league_mean: float
+    window: int = XG_WINDOW
+
+    def design(self) -> tuple[FloatArray, FloatArray]:
+        """Home and away predictor design matrices of the fixtures, see `xg_design`."""
+        return xg_design(self.home, self.away, self.league_mean)
+
+    def fixture_design(
+        self, home_teams: StrArray, away_teams: StrArray
+    ) -> tuple[FloatArray, FloatArray]:
+        """Design matrices of upcoming fixtures, from each team's latest rolling xG.
+
+        Teams without expected goals get the league average.
+        """
+        team_index = {team: i for i, team in enumerate(self.teams)}
+        latest = np.vstack((self.latest, np.full((1, 2), np.nan)))
+        home_idx = np.array([team_index.get(t, -1) for t in home_teams], dtype=int)
+        away_idx = np.array([team_index.get(t, -1) for t in away_teams], dtype=int)
+        return xg_design(latest[home_idx], latest[away_idx], self.league_mean)
+
+
+def xg_design(
+    home: FloatArray, away: FloatArray, league_mean: float
+) -> tuple[FloatArray, FloatArray]:
+    """Covariate design matrices from the teams' rolling [xG for, xG against].
+
+    The home predictor takes the home team's xG for and the away team's xG against,
+    and the away predictor the reverse, both as log ratios to the league mean so a
+    team without expected goals contributes zero. Columns follow `XG_COVARIATES`.
+    """
+    ratio = np.log(np.maximum(np.column_stack((home, away)), MIN_XG) / league_mean)
+    ratio = np.nan_to_num(ratio, nan=0.0)
+    home_x = np.ascontiguousarray(ratio[:, [0, 3]])
+    away_x = np.ascontiguousarray(ratio[:, [2, 1]])
+    return home_x, away_x
+
+
+def rolling_xg(
+    home_team: StrArray,
+    away_team: StrArray,
+    home_xg: FloatArray,
+    away_xg: FloatArray,
+    date: DateArray,
+    window: int = XG_WINDOW,
+) -> RollingXG:
+    """Rolling expected goals for and against of each team before every fixture.
+
+    Each fixture is split into a row per team, the rows are ordered by team and date,
+    and the window sums are differences of cumulative sums within each team's block.
+    Missing expected goals (NaN) are skipped, so a window averages the matches that
+    have them.
+    """
+    home_xg = np.asarray(home_xg, dtype=np.float64)
+    away_xg = np.asarray(away_xg, dtype=np.float64)
+    if not np.isfinite(np.concatenate((home_xg, away_xg))).any():
+        raise ValueError("No expected goals found in the results")
+
+    n_fixtures = len(home_xg)
+    teams, team_idx = np.unique(
+        np.concatenate((home_team, away_team)), return_inverse=True
+    )
+    rank = np.empty(n_fixtures, dtype=np.int64)
+    rank[np.argsort(np.asarray(date, dtype="datetime64[D]"), kind="stable")] = (
+        np.arange(n_fixtures)
+    )
+    order = np.lexsort((np.concatenate((rank, rank)), team_idx))
+    team_sorted = team_idx[order]
+
+    # [xG for, xG against] of each team row, in team then date order
+    values = np.column_stack(
+        (np.concatenate((home_xg, away_xg)), np.concatenate((away_xg, home_xg)))
+    )[order]
+    valid = np.isfinite(values)
+    sums = np.vstack((np.zeros((1, 2)), np.cumsum(np.where(valid, values, 0), axis=0)))
+    counts = np.vstack((np.zeros((1, 2)), np.cumsum(valid, axis=0)))
+
+    def window_mean(start: IntArray, end: IntArray) -> FloatArray:
+        """Mean of the valid rows in [max(start, end - window), end)."""
+        lower = np.maximum(start, end - window)
+        count = counts[end] - counts[lower]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(count > 0, (sums[end] - sums[lower]) / count, np.nan)
+
+    rows = np.arange(2 * n_fixtures)
+    previous = np.empty((2 * n_fixtures, 2))
+    previous[order] = window_mean(np.searchsorted(team_sorted, team_sorted), rows)
+
+    team_range = np.arange(len(teams))
+    latest = window_mean(
+        np.searchsorted(team_sorted, team_range),
+        np.searchsorted(team_sorted, team_range, side="right"),
+    )
+    return RollingXG(
+        home=previous[:n_fixtures],
+        away=previous[n_fixtures:],
+        teams=teams,
+        latest=latest,
+        league_mean=float(np.nanmean(np.concatenate((home_xg, away_xg)))),
+        window=window,
+    )
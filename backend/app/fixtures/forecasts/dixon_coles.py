@@ -1,227 +1,235 @@
 """Dixon-Coles team strength model."""
 
-import warnings
+import math
 from collections.abc import Callable
-from typing import TypeAlias
+from typing import Any
 
 import numpy as np
-import numpy.typing as npt
-from numba import njit, vectorize
-from scipy.optimize import OptimizeResult, minimize
-
-from app.logger import logger
-
-StrArray: TypeAlias = npt.NDArray[np.str_]
-IntArray: TypeAlias = npt.NDArray[np.int_]
-DateArray: TypeAlias = npt.NDArray[np.datetime64]
-FloatArray: TypeAlias = npt.NDArray[np.float64]
-
-
-class DixonColesModel:
-    """Dixon Coles team strength model."""
-
-    max_iter: int = 100
-    xi: float = 0.001
-
-    def __init__(
-        self,
-        home_team: StrArray,
-        away_team: StrArray,
-        home_goals: IntArray,
-        away_goals: IntArray,
-        date: DateArray,
-    ):
-        """Initialise model with fixtures and team-level covariates."""
-        self.home_teams = home_team
-        self.away_teams = away_team
-        self.home_goals = home_goals
-        self.away_goals = away_goals
-
-        self.weights = time_decay(date, xi=self.xi)
-        self.teams = np.unique(np.concatenate((self.home_teams, self.away_teams)))
-        self.n_teams = len(self.teams)
-
-        self._params: FloatArray = self._init_params()
-        self._res: OptimizeResult | None = None
-        self.loglikelihood: float | None = None
-        self.aic: float | None = None
-        self.n_params: int | None = None
-        self.fitted: bool = False
-
-    def _init_params(self) -> FloatArray:
-        """Initialise empty parameters."""
-        team_atk = np.random.uniform(0.5, 1.5, (self.n_teams))
-        team_def = np.random.uniform(-1.5, -0.5, (self.n_teams))
-        home_adv = [0.25]
-        rho = [-0.1]
-        return np.concatenate((team_atk, team_def, home_adv, rho))
-
-    @property
-    def constraints(self) -> dict[str, str | Callable[[FloatArray], float]]:
-        """Define objective function."""
-        return {"type": "eq", "fun": lambda x: sum(x[: self.n_teams]) - self.n_teams}
-
-    @property
-    def bounds(self) -> list[tuple[int, int]]:
-        """Define parameter bounds."""
-        team_atk = [(0, 3)] * self.n_teams
-        team_def = [(-3, 0)] * self.n_teams
-        home_adv = [(0, 2)]
-        rho = [(-2, 2)]
-        return team_atk + team_def + home_adv + rho
-
-    def fit(self) -> None:
-        """Fits the model to the data, calculating the team strengths, home advantage and intercept."""
-        logger.info("Fitting model")
-
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=RuntimeWarning)
-            self._res = minimize(
-                fun=self._fit_step,
-                x0=self._params,
-                constraints=self.constraints,
-                bounds=self.bounds,
-                options={"maxiter": self.max_iter, "disp": False},
-            )
-
-        if not self._res.success:
-            raise ValueError("Optimization did not converge")
-
-        self._params = self._res["x"]
-        self.n_params = len(self._params)
-        self.loglikelihood = float(self._res["fun"] * -1)
-        self.aic = -2 * self.loglikelihood + 2 * self.n_params
-        self.fitted = True
-
-        logger.info(f"Model successfully fitted (AIC: {self.aic:.2f})")
+from numba import njit
+from scipy.stats import norm
+
+from app.fixtures.forecasts.base import (
+    FASTMATH,
+    ForecastModel,
+    Kernel,
+    covariate_effect,
+    joint_probability_matrix,
+    log_factorial,
+    poisson_logpmf,
+    score_outputs,
+)
+from app.fixtures.forecasts.encoding import (
+    FloatArray,
+    IntArray,
+    StrArray,
+    design_matrix,
+)
+from app.fixtures.forecasts.markets import (
+    TAIL_TOLERANCE,
+    ScoreDistribution,
+    truncation_goals,
+)
+
+
+class DixonColesModel(ForecastModel):
+    """Dixon Coles team strength model.
+
+    Independent Poisson goals with the rho correction to the four lowest scorelines.
+    """
+
+    family = "dixon_coles"
+    extra_params = ("rho",)
+    extra_init = (-0.1,)
+    extra_bounds = ((-2.0, 2.0),)
+
+    @staticmethod
+    def kernel(*args: Any) -> float:
+        """Fused Dixon-Coles negative log-likelihood, see `dixon_coles_nll`."""
+        return dixon_coles_nll(*args)  # type: ignore[no-any-return]
+
+    def _objective(
+        self, jac: bool, hess: bool, kernel: Kernel
+    ) -> tuple[
+        Callable[[FloatArray], float | tuple[float, FloatArray]],
+        Callable[[FloatArray], FloatArray] | bool | None,
+    ]:
+        """Objective function and gradient option, adding the vectorised NumPy path."""
+        if kernel == "numpy":
+            if self.n_covariates:
+                raise ValueError("The numpy kernel does not support covariates")
+            return self._fit_step, self._fit_jac if jac or hess else None
+        return super()._objective(jac=jac, hess=hess, kernel=kernel)
 
     def _fit_step(self, params: FloatArray) -> float:
         """Model fit iteration."""
-        home_team_indices = np.searchsorted(self.teams, self.home_teams)
-        away_team_indices = np.searchsorted(self.teams, self.away_teams)
+        stats = self.stats
         attack = params[: self.n_teams]
         defence = params[self.n_teams : 2 * self.n_teams]
 
         home_exp, away_exp = expected_goals(
-            home_atk=attack[home_team_indices],
-            away_atk=attack[away_team_indices],
-            home_def=defence[home_team_indices],
-            away_def=defence[away_team_indices],
+            home_atk=attack[stats.home_idx],
+            away_atk=attack[stats.away_idx],
+            home_def=defence[stats.home_idx],
+            away_def=defence[stats.away_idx],
             home_adv=params[-2],
         )
 
-        home_llk = poisson_logpmf(self.home_goals, home_exp)
-        away_llk = poisson_logpmf(self.away_goals, away_exp)
+        home_llk = poisson_logpmf(stats.home_goals, home_exp)
+        away_llk = poisson_logpmf(stats.away_goals, away_exp)
 
         dc_adj = rho_correction(
-            home_goals=self.home_goals,
-            away_goals=self.away_goals,
+            home_goals=stats.home_goals,
+            away_goals=stats.away_goals,
             home_exp=home_exp,
             away_exp=away_exp,
             rho=params[-1],
         )
 
-        llk = (home_llk + away_llk + np.log(dc_adj)) * self.weights
-
-        return float(-np.sum(llk))
+        llk = (home_llk + away_llk + np.log(dc_adj)) * stats.weights
 
-    def predict(self, home_team: str, away_team: str) -> dict[str, float]:
-        """Predicts the probabilities of the different possible match outcomes."""
-        if not self.fitted:
-            raise ValueError(
-                "Model params not fitted, please call `fit()` before predicting values"
-            )
+        return float(-np.sum(llk)) + self._prior_penalty(params)
 
-        logger.info(f"Predicting fixture: {home_team} vs {away_team}")
-
-        home_atk, home_def = self.get_team_strength(home_team)
-        away_atk, away_def = self.get_team_strength(away_team)
-        home_goal_exp, away_goal_exp = expected_goals(
-            home_atk=home_atk,
-            away_atk=away_atk,
-            home_def=home_def,
-            away_def=away_def,
-            home_adv=self._params[-2],
+    def _fit_jac(self, params: FloatArray) -> FloatArray:
+        """Gradient of the model fit objective."""
+        grad = loglikelihood_gradient(
+            params=params,
+            home_idx=self.stats.home_idx,
+            away_idx=self.stats.away_idx,
+            home_goals=self.stats.home_goals,
+            away_goals=self.stats.away_goals,
+            weights=self.stats.weights,
+            n_teams=self.n_teams,
+        )
+        return self._prior_gradient(params) - grad
+
+    def _fit_hess(self, params: FloatArray) -> FloatArray:
+        """Hessian of the model fit objective.
+
+        Exact for the team strength parameters, falling back to finite differences of
+        the fused gradient for covariate models.
+        """
+        if self.n_covariates:
+            return super()._fit_hess(params)
+        hess = -loglikelihood_hessian(
+            params=params,
+            home_idx=self.stats.home_idx,
+            away_idx=self.stats.away_idx,
+            home_goals=self.stats.home_goals,
+            away_goals=self.stats.away_goals,
+            weights=self.stats.weights,
+            n_teams=self.n_teams,
         )
+        n_strengths = 2 * self.n_teams
+        hess[np.arange(n_strengths), np.arange(n_strengths)] += self.prior_precision
+        return hess
 
-        m = joint_probability_matrix(
-            home_goal_exp=home_goal_exp, away_goal_exp=away_goal_exp
+    def predict_intervals(
+        self,
+        home_teams: StrArray,
+        away_teams: StrArray,
+        level: float = 0.95,
+        max_goals: int | None = None,
+        home_covariates: FloatArray | None = None,
+        away_covariates: FloatArray | None = None,
+    ) -> dict[str, FloatArray]:
+        """Delta-method standard errors and intervals of the predicted outcomes.
+
+        The derivatives of each output w.r.t. the fixture's goal expectations and rho
+        come from the score matrix derivatives, and are combined with the covariance of
+        the parameters they load on. Unseen teams' strengths are treated as known.
+        Returns `{output}_se`, `{output}_lower` and `{output}_upper` columns.
+        """
+        covariance = self.parameter_covariance()
+        home_goal_exp, away_goal_exp = self.expected_goals_many(
+            home_teams, away_teams, home_covariates, away_covariates
         )
-        m = low_scoreline_correction(
-            m=m,
-            home_goal_exp=home_goal_exp,
-            away_goal_exp=away_goal_exp,
-            rho=self._params[-1],
+        rho = self._params[-1]
+        dist = score_distribution(
+            home_goal_exp, away_goal_exp, rho=rho, max_goals=max_goals
+        )
+        derivatives = score_derivatives(
+            home_goal_exp, away_goal_exp, rho=rho, max_goals=dist.max_goals
         )
 
-        results = {
-            "home_win": np.sum(np.tril(m, -1)),
-            "away_win": np.sum(np.triu(m, 1)),
-            "home_clean_sheet": m[:, 0].sum(),
-            "away_clean_sheet": m[0, :].sum(),
-            "home_goals_for": home_goal_exp,
-            "away_goals_for": away_goal_exp,
-            "home_attack": home_atk,
-            "away_attack": away_atk,
-            "home_defence": home_def,
-            "away_defence": away_def,
+        # Covariance of each fixture's (eta_h, eta_a, rho) from the parameters' covariance
+        home_idx = np.array([self._team_index.get(t, -1) for t in home_teams])
+        away_idx = np.array([self._team_index.get(t, -1) for t in away_teams])
+        loadings = np.zeros((len(home_teams), 3, len(self._params)))
+        rows = np.arange(len(home_teams))
+        for predictor, attack_idx, defence_idx in (
+            (0, home_idx, away_idx),
+            (1, away_idx, home_idx),
+        ):
+            seen = attack_idx >= 0
+            loadings[rows[seen], predictor, attack_idx[seen]] = 1
+            seen = defence_idx >= 0
+            loadings[rows[seen], predictor, defence_idx[seen] + self.n_teams] = 1
+        beta = slice(2 * self.n_teams, 2 * self.n_teams + self.n_covariates)
+        loadings[:, 0, beta] = design_matrix(home_covariates, len(home_teams))
+        loadings[:, 1, beta] = design_matrix(away_covariates, len(home_teams))
+        loadings[:, 0, -2] = 1
+        loadings[:, 2, -1] = 1
+        local_cov = loadings @ covariance @ loadings.transpose(0, 2, 1)
+
+        values = score_outputs(dist)
+        gradients = {
+            name: np.stack([score_outputs(d)[name] for d in derivatives], axis=1)
+            for name in values
         }
+        values |= {"home_goals_for": home_goal_exp, "away_goals_for": away_goal_exp}
+        zeros = np.zeros_like(home_goal_exp)
+        gradients["home_goals_for"] = np.stack((home_goal_exp, zeros, zeros), axis=1)
+        gradients["away_goals_for"] = np.stack((zeros, away_goal_exp, zeros), axis=1)
+
+        z = norm.ppf(0.5 + level / 2)
+        intervals = {}
+        for name, value in values.items():
+            grad = gradients[name]
+            se = np.sqrt(
+                np.maximum(np.einsum("ni,nij,nj->n", grad, local_cov, grad), 0)
+            )
+            upper_bound = np.inf if name.endswith("goals_for") else 1
+            intervals[f"{name}_se"] = se
+            intervals[f"{name}_lower"] = np.clip(value - z * se, 0, upper_bound)
+            intervals[f"{name}_upper"] = np.clip(value + z * se, 0, upper_bound)
+        return intervals
 
-        return {
-            k: float(round(v, 4)) if isinstance(v, float) else v
-            for k, v in results.items()
-        }
+    def _score_distribution(
+        self,
+        home_rate: FloatArray,
+        away_rate: FloatArray,
+        max_goals: int | None = None,
+        tol: float = TAIL_TOLERANCE,
+    ) -> ScoreDistribution:
+        """Rho-corrected joint scoreline distribution given the goal rates."""
+        return score_distribution(
+            home_goal_exp=home_rate,
+            away_goal_exp=away_rate,
+            rho=self._params[-1],
+            max_goals=max_goals,
+            tol=tol,
+        )
 
-    def evaluate(
+    def _loglikelihood(
         self,
-        home_team: StrArray,
-        away_team: StrArray,
+        home_rate: FloatArray,
+        away_rate: FloatArray,
         home_goals: IntArray,
         away_goals: IntArray,
-    ) -> float:
-        """Evaluate the performance of the fitted model against a test set."""
-        preds = np.array(
-            [
-                self.predict(home, away)
-                for home, away in zip(home_team, away_team, strict=False)
-            ]
+    ) -> FloatArray:
+        """Rho-corrected Poisson log-likelihood of each scoreline."""
+        dc_adj = rho_correction(
+            home_goals=home_goals,
+            away_goals=away_goals,
+            home_exp=home_rate,
+            away_exp=away_rate,
+            rho=self._params[-1],
+        )
+        return (  # type: ignore[no-any-return]
+            poisson_logpmf(home_goals, home_rate)
+            + poisson_logpmf(away_goals, away_rate)
+            + np.log(dc_adj)
         )
-
-        home_preds = np.array([p.home_forecast.goals_for for p in preds])
-        away_preds = np.array([p.away_forecast.goals_for for p in preds])
-
-        home_errors = np.abs(home_goals - home_preds)
-        away_errors = np.abs(away_goals - away_preds)
-
-        mae = float(np.mean((home_errors + away_errors) / 2))
-        logger.info(f"MAE: {mae:.3f}")
-        return mae
-
-    def get_all_team_strengths(self) -> dict[str, dict[str, float]]:
-        """Get a dictionary of team to attack and defence strengths as fitted by the model."""
-        return {
-            team: {"attack": self._params[i], "defence": self._params[i + self.n_teams]}
-            for i, team in enumerate(self.teams)
-        }
-
-    def get_team_strength(self, team: str) -> tuple[float, float]:
-        """Get the attack and defence strength for a single team."""
-        all_strengths = self.get_all_team_strengths()
-        if team not in all_strengths:
-            return self._new_team_strength()
-
-        team_atk, team_def = all_strengths[team].values()
-        return team_atk, team_def
-
-    def _new_team_strength(self) -> tuple[float, float]:
-        """Approximation of team strengths for unseen teams."""
-        # TODO: Use covariate priors e.g. FIFA ratings
-        n_teams = len(self.teams)
-        attack = sorted(self._params[:n_teams])
-        defence = sorted(self._params[n_teams : 2 * n_teams])
-        mean_atk = np.percentile(attack, 0.4)
-        mean_def = np.percentile(defence, 0.4)
-        return mean_atk, mean_def
 
 
 @njit  # type: ignore[misc]
@@ -247,46 +255,282 @@ def rho_correction(
     return corrections
 
 
-@njit  # type: ignore[misc]
-def low_scoreline_correction(
-    m: FloatArray, home_goal_exp: float, away_goal_exp: float, rho: float
+def local_derivatives(
+    params: FloatArray,
+    home_idx: IntArray,
+    away_idx: IntArray,
+    home_goals: IntArray,
+    away_goals: IntArray,
+    n_teams: int,
+) -> tuple[FloatArray, ...]:
+    """Per-fixture derivatives of the log-likelihood w.r.t. the linear predictors.
+
+    The linear predictors are the log goal expectations (`eta_h`, `eta_a`) and rho.
+    Returns the first derivatives (g_h, g_a, g_r) followed by the upper triangle of the
+    second derivatives (h_hh, h_aa, h_ha, h_hr, h_ar, h_rr).
+    """
+    attack = params[:n_teams]
+    defence = params[n_teams : 2 * n_teams]
+    rho = params[-1]
+    home_exp = np.exp(attack[home_idx] + defence[away_idx] + params[-2])
+    away_exp = np.exp(attack[away_idx] + defence[home_idx])
+    both_exp = home_exp * away_exp
+
+    m00 = ((home_goals == 0) & (away_goals == 0)).astype(np.float64)
+    m01 = ((home_goals == 0) & (away_goals == 1)).astype(np.float64)
+    m10 = ((home_goals == 1) & (away_goals == 0)).astype(np.float64)
+    m11 = ((home_goals == 1) & (away_goals == 1)).astype(np.float64)
+
+    # tau and its partial derivatives, noting that d(tau)/d(eta) is also d2(tau)/d(eta)2
+    tau = 1 - m00 * rho * both_exp + m01 * rho * home_exp + m10 * rho * away_exp
+    tau -= m11 * rho
+    tau_h = -m00 * rho * both_exp + m01 * rho * home_exp
+    tau_a = -m00 * rho * both_exp + m10 * rho * away_exp
+    tau_r = -m00 * both_exp + m01 * home_exp + m10 * away_exp - m11
+    tau_ha = -m00 * rho * both_exp
+    tau_hr = -m00 * both_exp + m01 * home_exp
+    tau_ar = -m00 * both_exp + m10 * away_exp
+
+    g_h = home_goals - home_exp + tau_h / tau
+    g_a = away_goals - away_exp + tau_a / tau
+    g_r = tau_r / tau
+
+    tau_sq = tau**2
+    h_hh = -home_exp + tau_h / tau - tau_h**2 / tau_sq
+    h_aa = -away_exp + tau_a / tau - tau_a**2 / tau_sq
+    h_ha = tau_ha / tau - tau_h * tau_a / tau_sq
+    h_hr = tau_hr / tau - tau_h * tau_r / tau_sq
+    h_ar = tau_ar / tau - tau_a * tau_r / tau_sq
+    h_rr = -(tau_r**2) / tau_sq
+
+    return g_h, g_a, g_r, h_hh, h_aa, h_ha, h_hr, h_ar, h_rr
+
+
+def loglikelihood_gradient(
+    params: FloatArray,
+    home_idx: IntArray,
+    away_idx: IntArray,
+    home_goals: IntArray,
+    away_goals: IntArray,
+    weights: FloatArray,
+    n_teams: int,
 ) -> FloatArray:
-    """Dixon-Coles low score correction e.g. 0-0, 0-1, 1-0, 1-1."""
-    m[0, 0] *= 1 - home_goal_exp * away_goal_exp * rho
-    m[0, 1] *= 1 + home_goal_exp * rho
-    m[1, 0] *= 1 + home_goal_exp * rho
-    m[1, 1] *= 1 - rho
-    m /= m.sum()
-    return m
-
-
-def time_decay(dates: DateArray, xi: float) -> FloatArray:
-    """Exponentially decay fixtures so that old ones influence the current strength less."""
-    return np.exp(-xi * (dates.max() - dates).astype(int))  # type: ignore[no-any-return]
-
+    """Exact gradient of the weighted Dixon-Coles log-likelihood."""
+    g_h, g_a, g_r, *_ = local_derivatives(
+        params, home_idx, away_idx, home_goals, away_goals, n_teams
+    )
+    g_h *= weights
+    g_a *= weights
+
+    grad = np.empty_like(params, dtype=np.float64)
+    grad[:n_teams] = np.bincount(home_idx, g_h, n_teams) + np.bincount(
+        away_idx, g_a, n_teams
+    )
+    grad[n_teams : 2 * n_teams] = np.bincount(away_idx, g_h, n_teams) + np.bincount(
+        home_idx, g_a, n_teams
+    )
+    grad[-2] = g_h.sum()
+    grad[-1] = np.dot(g_r, weights)
+    return grad
+
+
+def loglikelihood_hessian(
+    params: FloatArray,
+    home_idx: IntArray,
+    away_idx: IntArray,
+    home_goals: IntArray,
+    away_goals: IntArray,
+    weights: FloatArray,
+    n_teams: int,
+) -> FloatArray:
+    """Exact Hessian of the weighted Dixon-Coles log-likelihood.
+
+    Each fixture contributes J^T H J, where H is the 3x3 Hessian w.r.t. (eta_h, eta_a,
+    rho) and J maps the parameters onto those predictors. The sparse contributions are
+    scattered into the dense matrix with a single `np.bincount`.
+    """
+    _, _, _, h_hh, h_aa, h_ha, h_hr, h_ar, h_rr = local_derivatives(
+        params, home_idx, away_idx, home_goals, away_goals, n_teams
+    )
+    n_params = len(params)
+    local = (
+        np.array([[h_hh, h_ha, h_hr], [h_ha, h_aa, h_ar], [h_hr, h_ar, h_rr]]) * weights
+    )  # (3, 3, n_fixtures)
+
+    # Parameter index and the predictor it loads on, for each fixture
+    param_idx = np.stack(
+        (
+            home_idx,
+            away_idx + n_teams,
+            np.full_like(home_idx, 2 * n_teams),
+            away_idx,
+            home_idx + n_teams,
+            np.full_like(home_idx, 2 * n_teams + 1),
+        )
+    )
+    predictor = np.array([0, 0, 0, 1, 1, 2])
 
-@njit  # type: ignore[misc]
-def stirling_gammaln(n: int) -> float:
-    """Stirling's approximation for gammaln."""
-    return n * np.log(n) - n + 0.5 * np.log(2 * np.pi * n)  # type: ignore[no-any-return]
+    flat_idx = param_idx[:, np.newaxis, :] * n_params + param_idx[np.newaxis, :, :]
+    values = local[predictor[:, np.newaxis], predictor[np.newaxis, :]]
+    hess = np.bincount(flat_idx.ravel(), values.ravel(), minlength=n_params * n_params)
+    return hess.reshape(n_params, n_params)
 
 
-@vectorize(["float64(int64, float64)"])  # type: ignore[misc]
-def poisson_logpmf(k: int, mu: float) -> float:
-    """Fast Poisson log-PMF using Stirling's approximation for gammaln."""
-    return k * np.log(mu) - stirling_gammaln(k + 1) - mu  # type: ignore[no-any-return]
+@njit(fastmath=FASTMATH, cache=True)  # type: ignore[misc]
+def dixon_coles_nll(
+    params: FloatArray,
+    home_idx: IntArray,
+    away_idx: IntArray,
+    home_goals: IntArray,
+    away_goals: IntArray,
+    home_x: FloatArray,
+    away_x: FloatArray,
+    weights: FloatArray,
+    n_teams: int,
+    grad: FloatArray,
+) -> float:
+    """Fused weighted negative log-likelihood (and gradient) in a single pass.
+
+    Equivalent to `DixonColesModel._fit_step` and `loglikelihood_gradient` without any
+    temporary arrays. If `grad` is non-empty, the gradient is written into it.
+    """
+    with_grad = grad.size > 0
+    if with_grad:
+        grad[:] = 0.0
+
+    beta = 2 * n_teams
+    n_covariates = home_x.shape[1]
+    home_adv = params[beta + n_covariates]
+    rho = params[beta + n_covariates + 1]
+    nll = 0.0
+    for i in range(home_idx.size):
+        h, a = home_idx[i], away_idx[i]
+        hg, ag = home_goals[i], away_goals[i]
+        w = weights[i]
+
+        eta_h = params[h] + params[n_teams + a] + home_adv
+        eta_a = params[a] + params[n_teams + h]
+        if n_covariates:
+            eta_h += covariate_effect(params, beta, home_x, i)
+            eta_a += covariate_effect(params, beta, away_x, i)
+        home_exp = math.exp(eta_h)
+        away_exp = math.exp(eta_a)
+
+        tau, tau_h, tau_a, tau_r = 1.0, 0.0, 0.0, 0.0
+        if hg == 0 and ag == 0:
+            tau_h = tau_a = -rho * home_exp * away_exp
+            tau = 1.0 + tau_h
+            tau_r = -home_exp * away_exp
+        elif hg == 0 and ag == 1:
+            tau_h = rho * home_exp
+            tau = 1.0 + tau_h
+            tau_r = home_exp
+        elif hg == 1 and ag == 0:
+            tau_a = rho * away_exp
+            tau = 1.0 + tau_a
+            tau_r = away_exp
+        elif hg == 1 and ag == 1:
+            tau = 1.0 - rho
+            tau_r = -1.0
+
+        llk = hg * eta_h - home_exp - log_factorial(hg)
+        llk += ag * eta_a - away_exp - log_factorial(ag)
+        nll -= w * (llk + math.log(tau))
+
+        if with_grad:
+            g_h = w * (hg - home_exp + tau_h / tau)
+            g_a = w * (ag - away_exp + tau_a / tau)
+            grad[h] -= g_h
+            grad[n_teams + a] -= g_h
+            grad[beta + n_covariates] -= g_h
+            grad[a] -= g_a
+            grad[n_teams + h] -= g_a
+            grad[beta + n_covariates + 1] -= w * tau_r / tau
+            for j in range(n_covariates):
+                grad[beta + j] -= g_h * home_x[i, j] + g_a * away_x[i, j]
+
+    return nll
+
+
+def score_distribution(
+    home_goal_exp: FloatArray,
+    away_goal_exp: FloatArray,
+    rho: float | FloatArray,
+    max_goals: int | None = None,
+    tol: float = TAIL_TOLERANCE,
+) -> ScoreDistribution:
+    """Build the rho-corrected joint scoreline distribution of a batch of fixtures."""
+    if max_goals is None:
+        max_goals = truncation_goals(home_goal_exp, away_goal_exp, tol=tol)
+    m = joint_probability_matrix(
+        home_goal_exp=home_goal_exp, away_goal_exp=away_goal_exp, max_goals=max_goals
+    )
+    # The correction preserves total mass, so the tail is known before it renormalises
+    tail_mass = 1 - m.sum(axis=(1, 2))
+    m = low_scoreline_correction(
+        m=m, home_goal_exp=home_goal_exp, away_goal_exp=away_goal_exp, rho=rho
+    )
+    return ScoreDistribution(matrix=m, tail_mass=tail_mass)
+
+
+def score_derivatives(
+    home_goal_exp: FloatArray, away_goal_exp: FloatArray, rho: float, max_goals: int
+) -> tuple[ScoreDistribution, ScoreDistribution, ScoreDistribution]:
+    """Derivatives of the rho-corrected score matrices w.r.t. eta_h, eta_a and rho.
+
+    Every market output is a sum over scoreline cells, so applying it to these
+    matrices gives the output's derivative. The tail mass is assumed negligible.
+    """
+    m = joint_probability_matrix(
+        home_goal_exp=home_goal_exp, away_goal_exp=away_goal_exp, max_goals=max_goals
+    )
+    goals = np.arange(max_goals)
+    both_exp = home_goal_exp * away_goal_exp
+    tau = low_scoreline_correction(
+        m=np.ones_like(m),
+        home_goal_exp=home_goal_exp,
+        away_goal_exp=away_goal_exp,
+        rho=rho,
+        normalise=False,
+    )
+
+    d_home = tau * m * (goals[:, np.newaxis] - home_goal_exp[:, np.newaxis, np.newaxis])
+    d_home[:, 0, 0] -= m[:, 0, 0] * both_exp * rho
+    d_home[:, 0, 1] += m[:, 0, 1] * home_goal_exp * rho
+
+    d_away = tau * m * (goals - away_goal_exp[:, np.newaxis, np.newaxis])
+    d_away[:, 0, 0] -= m[:, 0, 0] * both_exp * rho
+    d_away[:, 1, 0] += m[:, 1, 0] * away_goal_exp * rho
+
+    d_rho = np.zeros_like(m)
+    d_rho[:, 0, 0] = -m[:, 0, 0] * both_exp
+    d_rho[:, 0, 1] = m[:, 0, 1] * home_goal_exp
+    d_rho[:, 1, 0] = m[:, 1, 0] * away_goal_exp
+    d_rho[:, 1, 1] = -m[:, 1, 1]
+
+    no_tail = np.zeros_like(home_goal_exp)
+    return (
+        ScoreDistribution(matrix=d_home, tail_mass=no_tail),
+        ScoreDistribution(matrix=d_away, tail_mass=no_tail),
+        ScoreDistribution(matrix=d_rho, tail_mass=no_tail),
+    )
 
 
-@njit  # type: ignore[misc]
-def joint_probability_matrix(
-    home_goal_exp: float, away_goal_exp: float, max_goals: int = 7
+def low_scoreline_correction(
+    m: FloatArray,
+    home_goal_exp: FloatArray,
+    away_goal_exp: FloatArray,
+    rho: float | FloatArray,
+    normalise: bool = True,
 ) -> FloatArray:
-    """Build the joint score probability matrix."""
-    gammaln = stirling_gammaln(np.arange(max_goals) + 1)
-    goals = np.arange(max_goals)
-    home_probs = np.exp(-home_goal_exp + goals * np.log(home_goal_exp) - gammaln)
-    away_probs = np.exp(-away_goal_exp + goals * np.log(away_goal_exp) - gammaln)
-    return np.outer(home_probs, away_probs)
+    """Dixon-Coles low score correction e.g. 0-0, 0-1, 1-0, 1-1, for a stack of matrices."""
+    m[:, 0, 0] *= 1 - home_goal_exp * away_goal_exp * rho
+    m[:, 0, 1] *= 1 + home_goal_exp * rho
+    m[:, 1, 0] *= 1 + away_goal_exp * rho
+    m[:, 1, 1] *= 1 - rho
+    if normalise:
+        m /= m.sum(axis=(1, 2), keepdims=True)
+    return m
 
 
 @njit  # type: ignore[misc]
@@ -0,0 +1,330 @@
+"""Dynamic Dixon-Coles team strengths, filtered result by result."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.fixtures.forecasts.base import score_outputs, unseen_team_strength
+from app.fixtures.forecasts.dixon_coles import (
+    DixonColesModel,
+    local_derivatives,
+    score_distribution,
+)
+from app.fixtures.forecasts.encoding import DateArray, FloatArray, IntArray, StrArray
+from app.fixtures.forecasts.priors import DEFAULT_PRIOR_SD, TeamPrior
+from app.logger import logger
+
+
+@dataclass
+class FilterState:
+    """Filtered strengths at the end of a match day."""
+
+    date: np.datetime64
+    mean: FloatArray
+    cov: FloatArray
+
+
+@dataclass
+class SmoothedStrengths:
+    """Smoothed attack and defence of every team on every match day."""
+
+    teams: StrArray
+    dates: DateArray
+    mean: FloatArray  # (n_dates, 2 * n_teams), laid out as [attack, defence]
+    sd: FloatArray
+
+    @property
+    def attack(self) -> FloatArray:
+        """Smoothed attack, (n_dates, n_teams)."""
+        return self.mean[:, : len(self.teams)]
+
+    @property
+    def defence(self) -> FloatArray:
+        """Smoothed defence, (n_dates, n_teams)."""
+        return self.mean[:, len(self.teams) :]
+
+
+class DynamicDixonColesModel:
+    """Dixon-Coles model whose attack and defence strengths follow a random walk.
+
+    The strengths are a Gaussian state, laid out as [attack, defence], that diffuses
+    with `process_var` per day. Each result updates the state with a single extended
+    Kalman step on the Dixon-Coles log-likelihood of the score, an O(n_teams^2)
+    rank-two update, so new results never require a refit. Home advantage and rho are
+    held at the values of the static fit the model starts from.
+    """
+
+    process_var = 2e-5
+
+    def __init__(
+        self,
+        teams: StrArray,
+        mean: FloatArray,
+        cov: FloatArray,
+        home_adv: float,
+        rho: float,
+        date: np.datetime64,
+        process_var: float | None = None,
+        keep_history: bool = False,
+        promoted_prior: TeamPrior | None = None,
+    ) -> None:
+        """Initialise the filter from a Gaussian belief about the strengths at `date`."""
+        if process_var is not None:
+            self.process_var = process_var
+
+        self.teams = np.asarray(teams)
+        self.n_teams = len(teams)
+        self._team_index = {team: i for i, team in enumerate(self.teams)}
+        self.mean = np.array(mean, dtype=np.float64)
+        self.cov = np.array(cov, dtype=np.float64)
+        self.home_adv = home_adv
+        self.rho = rho
+        self.date = np.datetime64(date, "D")
+        self.keep_history = keep_history
+        self.promoted_prior = promoted_prior
+        self.history: list[FilterState] = []
+
+        # Mean and variance each team entered with, to pad states from before it existed
+        self._initial_mean = self.mean.copy()
+        self._initial_var = np.diag(self.cov).copy()
+
+    @classmethod
+    def from_static(
+        cls,
+        model: DixonColesModel,
+        process_var: float | None = None,
+        keep_history: bool = False,
+    ) -> "DynamicDixonColesModel":
+        """Start from a fitted static model and its parameter covariance."""
+        if model.n_covariates:
+            raise ValueError("Dynamic models cannot start from a covariate model")
+        n_strengths = 2 * model.n_teams
+        return cls(
+            teams=model.teams,
+            mean=model._params[:n_strengths],
+            cov=model.parameter_covariance()[:n_strengths, :n_strengths],
+            home_adv=float(model._params[-2]),
+            rho=float(model._params[-1]),
+            date=model.data.date.max(),
+            process_var=process_var,
+            keep_history=keep_history,
+            promoted_prior=model.promoted_prior,
+        )
+
+    def process_noise(self, n_teams: int | None = None) -> FloatArray:
+        """Daily random walk covariance of the strengths.
+
+        Shifting every attack up and every defence down by the same amount leaves the
+        likelihood unchanged, so no noise is added along that direction.
+        """
+        n = self.n_teams if n_teams is None else n_teams
+        shift = np.concatenate((np.ones(n), -np.ones(n))) / np.sqrt(2 * n)
+        return self.process_var * (np.eye(2 * n) - np.outer(shift, shift))  # type: ignore[no-any-return]
+
+    def predict_step(self, date: np.datetime64) -> None:
+        """Diffuse the strengths forward to `date`."""
+        days = int((np.datetime64(date, "D") - self.date).astype(int))
+        if days < 0:
+            raise ValueError(f"Cannot filter back in time from {self.date} to {date}")
+        if days == 0:
+            return
+
+        if self.keep_history:
+            self.history.append(
+                FilterState(self.date, self.mean.copy(), self.cov.copy())
+            )
+        self.cov += days * self.process_noise()
+        self.date = np.datetime64(date, "D")
+
+    def update(
+        self,
+        home_team: StrArray,
+        away_team: StrArray,
+        home_goals: IntArray,
+        away_goals: IntArray,
+        date: DateArray,
+    ) -> None:
+        """Filter new results (e.g. a gameweek) in date order, one result at a time."""
+        order = np.argsort(date, kind="stable")
+        for i in order:
+            self.predict_step(date[i])
+            self.update_result(
+                home_team=home_team[i],
+                away_team=away_team[i],
+                home_goals=int(home_goals[i]),
+                away_goals=int(away_goals[i]),
+            )
+
+    def update_result(
+        self, home_team: str, away_team: str, home_goals: int, away_goals: int
+    ) -> None:
+        """Extended Kalman update of the strengths with a single result.
+
+        The score only loads on the home and away log goal expectations, so the update
+        is rank two: with PH^T the covariance of the state with the two predictors, S
+        their covariance, W their Poisson information and g the score of the result,
+        the mean moves by PH^T (I + WS)^-1 g and the covariance shrinks by
+        PH^T (I + WS)^-1 W HP.
+        """
+        for team in (home_team, away_team):
+            if team not in self._team_index:
+                self._add_team(team)
+
+        n = self.n_teams
+        h, a = self._team_index[home_team], self._team_index[away_team]
+        # State positions loading on the home (h_attack + a_defence) and away predictors
+        home_pos, away_pos = [h, n + a], [a, n + h]
+
+        pht = np.column_stack(
+            (self.cov[:, home_pos].sum(axis=1), self.cov[:, away_pos].sum(axis=1))
+        )
+        s = np.array([pht[home_pos].sum(axis=0), pht[away_pos].sum(axis=0)])
+
+        params = np.concatenate((self.mean, [self.home_adv, self.rho]))
+        g_h, g_a, *_ = local_derivatives(
+            params,
+            np.array([h]),
+            np.array([a]),
+            np.array([home_goals]),
+            np.array([away_goals]),
+            n,
+        )
+        g = np.array([g_h[0], g_a[0]])
+        w = np.diag(
+            np.exp(
+                [self.mean[home_pos].sum() + self.home_adv, self.mean[away_pos].sum()]
+            )
+        )
+
+        gain = np.linalg.inv(np.eye(2) + w @ s)
+        self.mean += pht @ (gain @ g)
+        shrink = gain @ w
+        self.cov -= pht @ ((shrink + shrink.T) / 2) @ pht.T
+
+    def _add_team(self, team: str) -> None:
+        """Add an unseen team to the state, drawn from the promoted team prior.
+
+        Without a prior, the team starts from the unseen team approximation.
+        """
+        n = self.n_teams
+        if (prior := self.promoted_prior) is not None:
+            attack, defence = prior.attack_mean, prior.defence_mean
+            attack_var, defence_var = prior.attack_sd**2, prior.defence_sd**2
+        else:
+            attack, defence = unseen_team_strength(
+                attack=self.mean[:n], defence=self.mean[n:]
+            )
+            attack_var = defence_var = DEFAULT_PRIOR_SD**2
+        logger.info(f"Adding {team} to the dynamic model")
+        self.mean = _insert_team(self.mean, n, attack, defence)
+        self.cov = _insert_team_cov(self.cov, n, attack_var, defence_var)
+        self._initial_mean = _insert_team(self._initial_mean, n, attack, defence)
+        self._initial_var = _insert_team(self._initial_var, n, attack_var, defence_var)
+        self.teams = np.append(self.teams, team)
+        self.n_teams += 1
+        self._team_index[team] = n
+
+    def get_team_strengths(self, teams: StrArray) -> tuple[FloatArray, FloatArray]:
+        """Get the current attack and defence strengths for an array of teams."""
+        idx = np.array([self._team_index.get(team, -1) for team in teams], dtype=int)
+        attack = self.mean[idx]
+        defence = self.mean[idx + self.n_teams]
+
+        unseen = idx < 0
+        if unseen.any() and self.promoted_prior is not None:
+            attack[unseen] = self.promoted_prior.attack_mean
+            defence[unseen] = self.promoted_prior.defence_mean
+        elif unseen.any():
+            attack[unseen], defence[unseen] = unseen_team_strength(
+                attack=self.mean[: self.n_teams], defence=self.mean[self.n_teams :]
+            )
+        return attack, defence
+
+    def predict_many(
+        self, home_teams: StrArray, away_teams: StrArray, max_goals: int | None = None
+    ) -> dict[str, FloatArray]:
+        """Predicts the outcome probabilities of many fixtures from the current state."""
+        home_atk, home_def = self.get_team_strengths(home_teams)
+        away_atk, away_def = self.get_team_strengths(away_teams)
+        home_goal_exp = np.exp(home_atk + away_def + self.home_adv)
+        away_goal_exp = np.exp(away_atk + home_def)
+        dist = score_distribution(
+            home_goal_exp=home_goal_exp,
+            away_goal_exp=away_goal_exp,
+            rho=self.rho,
+            max_goals=max_goals,
+        )
+        return score_outputs(dist) | {
+            "home_goals_for": home_goal_exp,
+            "away_goals_for": away_goal_exp,
+            "home_attack": home_atk,
+            "away_attack": away_atk,
+            "home_defence": home_def,
+            "away_defence": away_def,
+        }
+
+    def smooth(self) -> SmoothedStrengths:
+        """Rauch-Tung-Striebel smoothed strengths on every filtered match day.
+
+        Requires `keep_history`. States from before a team was added are padded with
+        the strength it was added with.
+        """
+        if not self.keep_history:
+            raise ValueError(
+                "Smoothing requires a model created with keep_history=True"
+            )
+
+        states = [*self.history, FilterState(self.date, self.mean, self.cov)]
+        n = self.n_teams
+        means = np.empty((len(states), 2 * n))
+        sds = np.empty((len(states), 2 * n))
+
+        smooth_mean, smooth_cov = self.mean, self.cov
+        means[-1], sds[-1] = smooth_mean, np.sqrt(np.diag(smooth_cov))
+        for k in range(len(states) - 2, -1, -1):
+            mean, cov = self._padded(states[k])
+            days = int((states[k + 1].date - states[k].date).astype(int))
+            pred_cov = cov + days * self.process_noise(n)
+            smoother_gain = cov @ np.linalg.pinv(pred_cov, hermitian=True)
+            smooth_mean = mean + smoother_gain @ (smooth_mean - mean)
+            smooth_cov = cov + smoother_gain @ (smooth_cov - pred_cov) @ smoother_gain.T
+            means[k], sds[k] = smooth_mean, np.sqrt(np.maximum(np.diag(smooth_cov), 0))
+
+        return SmoothedStrengths(
+            teams=self.teams,
+            dates=np.array([state.date for state in states], dtype="datetime64[D]"),
+            mean=means,
+            sd=sds,
+        )
+
+    def _padded(self, state: FilterState) -> tuple[FloatArray, FloatArray]:
+        """State resized to the current teams, padding teams added since."""
+        n_state = len(state.mean) // 2
+        if n_state == self.n_teams:
+            return state.mean, state.cov
+
+        n = self.n_teams
+        idx = np.concatenate((np.arange(n_state), np.arange(n_state) + n))
+        mean, cov = self._initial_mean.copy(), np.diag(self._initial_var)
+        mean[idx] = state.mean
+        cov[np.ix_(idx, idx)] = state.cov
+        return mean, cov
+
+
+def _insert_team(
+    values: FloatArray, n_teams: int, attack: float, defence: float
+) -> FloatArray:
+    """Append a team to per-team values laid out as [attack, defence]."""
+    return np.concatenate((values[:n_teams], [attack], values[n_teams:], [defence]))
+
+
+def _insert_team_cov(
+    cov: FloatArray, n_teams: int, attack_var: float, defence_var: float
+) -> FloatArray:
+    """Append an independent team to a strength covariance."""
+    idx = np.concatenate((np.arange(n_teams), np.arange(n_teams) + n_teams + 1))
+    expanded = np.zeros((2 * n_teams + 2, 2 * n_teams + 2))
+    expanded[np.ix_(idx, idx)] = cov
+    expanded[n_teams, n_teams] = attack_var
+    expanded[-1, -1] = defence_var
+    return expanded
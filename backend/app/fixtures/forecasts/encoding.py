@@ -0,0 +1,248 @@
+"""Integer encoding and sufficient statistics of fixture results."""
+
+from dataclasses import dataclass, field
+from typing import TypeAlias
+
+import numpy as np
+import numpy.typing as npt
+
+StrArray: TypeAlias = npt.NDArray[np.str_]
+IntArray: TypeAlias = npt.NDArray[np.int_]
+DateArray: TypeAlias = npt.NDArray[np.datetime64]
+FloatArray: TypeAlias = npt.NDArray[np.float64]
+
+
+def no_covariates(n_rows: int = 0) -> FloatArray:
+    """Empty covariate design matrix."""
+    return np.zeros((n_rows, 0))
+
+
+def design_matrix(covariates: FloatArray | None, n_rows: int) -> FloatArray:
+    """Covariates as a C-contiguous float64 (n_rows, n_covariates) design matrix."""
+    if covariates is None:
+        return no_covariates(n_rows)
+    design = np.ascontiguousarray(covariates, dtype=np.float64).reshape(n_rows, -1)
+    if not np.isfinite(design).all():
+        raise ValueError("Covariates must be finite")
+    return design
+
+
+@dataclass
+class EncodedFixtures:
+    """Fixture results with teams encoded as integer indices into `teams`.
+
+    `home_x` and `away_x` are optional covariate design matrices of the home and away
+    log-linear predictors, one row per fixture.
+    """
+
+    teams: StrArray
+    home_idx: IntArray
+    away_idx: IntArray
+    home_goals: IntArray
+    away_goals: IntArray
+    date: DateArray
+    home_x: FloatArray = field(default_factory=no_covariates)
+    away_x: FloatArray = field(default_factory=no_covariates)
+
+    @classmethod
+    def from_results(
+        cls,
+        home_team: StrArray,
+        away_team: StrArray,
+        home_goals: IntArray,
+        away_goals: IntArray,
+        date: DateArray,
+        home_covariates: FloatArray | None = None,
+        away_covariates: FloatArray | None = None,
+    ) -> "EncodedFixtures":
+        """Encode team names as indices into the sorted array of unique teams."""
+        teams, team_idx = np.unique(
+            np.concatenate((home_team, away_team)), return_inverse=True
+        )
+        n_fixtures = len(home_team)
+        return cls(
+            teams=teams,
+            home_idx=team_idx[:n_fixtures].astype(np.int64),
+            away_idx=team_idx[n_fixtures:].astype(np.int64),
+            home_goals=np.asarray(home_goals, dtype=np.int64),
+            away_goals=np.asarray(away_goals, dtype=np.int64),
+            date=np.asarray(date, dtype="datetime64[D]"),
+            home_x=design_matrix(home_covariates, n_fixtures),
+            away_x=design_matrix(away_covariates, n_fixtures),
+        )
+
+    def extend(
+        self,
+        home_team: StrArray,
+        away_team: StrArray,
+        home_goals: IntArray,
+        away_goals: IntArray,
+        date: DateArray,
+        home_covariates: FloatArray | None = None,
+        away_covariates: FloatArray | None = None,
+    ) -> "EncodedFixtures":
+        """Append results, giving previously unseen teams the next free indices."""
+        team_index = {team: i for i, team in enumerate(self.teams)}
+        for team in np.concatenate((home_team, away_team)):
+            team_index.setdefault(team, len(team_index))
+
+        new_teams = np.array(list(team_index)[self.n_teams :], dtype=str)
+        home_x = design_matrix(home_covariates, len(home_team))
+        away_x = design_matrix(away_covariates, len(home_team))
+        if home_x.shape[1] != self.n_covariates or away_x.shape[1] != self.n_covariates:
+            raise ValueError(
+                f"Expected {self.n_covariates} covariates for the new results"
+            )
+        return EncodedFixtures(
+            teams=np.concatenate((self.teams, new_teams)),
+            home_idx=np.concatenate(
+                (self.home_idx, [team_index[team] for team in home_team])
+            ).astype(np.int64),
+            away_idx=np.concatenate(
+                (self.away_idx, [team_index[team] for team in away_team])
+            ).astype(np.int64),
+            home_goals=np.concatenate((self.home_goals, home_goals)).astype(np.int64),
+            away_goals=np.concatenate((self.away_goals, away_goals)).astype(np.int64),
+            date=np.concatenate((self.date, date)).astype("datetime64[D]"),
+            home_x=np.concatenate((self.home_x, home_x)),
+            away_x=np.concatenate((self.away_x, away_x)),
+        )
+
+    @property
+    def n_teams(self) -> int:
+        """Number of distinct teams."""
+        return len(self.teams)
+
+    @property
+    def n_covariates(self) -> int:
+        """Number of covariates in each predictor's design matrix."""
+        return self.home_x.shape[1]  # type: ignore[no-any-return]
+
+    def __len__(self) -> int:
+        """Number of fixtures."""
+        return len(self.home_idx)
+
+
+@dataclass
+class SufficientStats:
+    """Distinct (home, away, home goals, away goals) cells with aggregated weights.
+
+    The weighted log-likelihood only depends on the fixtures through these cells, so
+    objective evaluations scale with the number of distinct cells rather than fixtures.
+    `cell_idx` maps each fixture to its cell, so the cells can be reweighted (e.g. for a
+    different time decay) without regrouping. With covariates, fixtures only share a
+    cell if their covariate rows are also equal.
+    """
+
+    home_idx: IntArray
+    away_idx: IntArray
+    home_goals: IntArray
+    away_goals: IntArray
+    weights: FloatArray
+    cell_idx: IntArray
+    home_x: FloatArray = field(default_factory=no_covariates)
+    away_x: FloatArray = field(default_factory=no_covariates)
+
+    @classmethod
+    def from_fixtures(
+        cls, fixtures: EncodedFixtures, weights: FloatArray
+    ) -> "SufficientStats":
+        """Group fixtures into cells and sum the weights of each cell."""
+        key = cell_keys(
+            fixtures.home_idx,
+            fixtures.away_idx,
+            fixtures.home_goals,
+            fixtures.away_goals,
+            n_teams=fixtures.n_teams,
+        )
+        first, cell_idx = group_cells(key, fixtures.home_x, fixtures.away_x)
+        return cls(
+            home_idx=fixtures.home_idx[first],
+            away_idx=fixtures.away_idx[first],
+            home_goals=fixtures.home_goals[first],
+            away_goals=fixtures.away_goals[first],
+            weights=np.bincount(cell_idx, weights, len(first)),
+            cell_idx=cell_idx,
+            home_x=np.ascontiguousarray(fixtures.home_x[first]),
+            away_x=np.ascontiguousarray(fixtures.away_x[first]),
+        )
+
+    def reweight(self, weights: FloatArray) -> "SufficientStats":
+        """Aggregate new per-fixture weights into the existing cells."""
+        return SufficientStats(
+            home_idx=self.home_idx,
+            away_idx=self.away_idx,
+            home_goals=self.home_goals,
+            away_goals=self.away_goals,
+            weights=np.bincount(self.cell_idx, weights, len(self)),
+            cell_idx=self.cell_idx,
+            home_x=self.home_x,
+            away_x=self.away_x,
+        )
+
+    def extend(
+        self, fixtures: EncodedFixtures, weights: FloatArray, decay: float
+    ) -> "SufficientStats":
+        """Decay the existing cells and merge in newly appended fixtures.
+
+        `fixtures` is the extended set of fixtures, of which the last `len(weights)` are
+        new. Only the existing cells and the new fixtures are regrouped.
+        """
+        new = slice(len(fixtures) - len(weights), None)
+        home_idx = np.concatenate((self.home_idx, fixtures.home_idx[new]))
+        away_idx = np.concatenate((self.away_idx, fixtures.away_idx[new]))
+        home_goals = np.concatenate((self.home_goals, fixtures.home_goals[new]))
+        away_goals = np.concatenate((self.away_goals, fixtures.away_goals[new]))
+        home_x = np.concatenate((self.home_x, fixtures.home_x[new]))
+        away_x = np.concatenate((self.away_x, fixtures.away_x[new]))
+
+        key = cell_keys(
+            home_idx, away_idx, home_goals, away_goals, n_teams=fixtures.n_teams
+        )
+        first, inverse = group_cells(key, home_x, away_x)
+        return SufficientStats(
+            home_idx=home_idx[first],
+            away_idx=away_idx[first],
+            home_goals=home_goals[first],
+            away_goals=away_goals[first],
+            weights=np.bincount(
+                inverse, np.concatenate((self.weights * decay, weights)), len(first)
+            ),
+            cell_idx=np.concatenate((inverse[self.cell_idx], inverse[len(self) :])),
+            home_x=np.ascontiguousarray(home_x[first]),
+            away_x=np.ascontiguousarray(away_x[first]),
+        )
+
+    def __len__(self) -> int:
+        """Number of distinct cells."""
+        return len(self.home_idx)
+
+
+def cell_keys(
+    home_idx: IntArray,
+    away_idx: IntArray,
+    home_goals: IntArray,
+    away_goals: IntArray,
+    n_teams: int,
+) -> IntArray:
+    """Combine (home, away, home goals, away goals) into a single integer key."""
+    n_goals = max(home_goals.max(), away_goals.max()) + 1
+    key = (home_idx * n_teams + away_idx) * n_goals + home_goals
+    return key * n_goals + away_goals  # type: ignore[no-any-return]
+
+
+def group_cells(
+    key: IntArray, home_x: FloatArray, away_x: FloatArray
+) -> tuple[IntArray, IntArray]:
+    """First row of each distinct cell, and the cell of every row.
+
+    Rows share a cell when their keys and any covariate rows are equal.
+    """
+    if home_x.shape[1] == 0:
+        _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+    else:
+        rows = np.column_stack((key, home_x, away_x))
+        _, first, inverse = np.unique(
+            rows, axis=0, return_index=True, return_inverse=True
+        )
+    return first, inverse.ravel()
@@ -0,0 +1,22 @@
+"""Registry of the forecasting model families."""
+
+from app.fixtures.forecasts.base import ForecastModel
+from app.fixtures.forecasts.bivariate_poisson import BivariatePoissonModel
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.fixtures.forecasts.negative_binomial import NegativeBinomialModel
+
+DEFAULT_FAMILY = DixonColesModel.family
+
+MODEL_FAMILIES: dict[str, type[ForecastModel]] = {
+    model.family: model
+    for model in (DixonColesModel, BivariatePoissonModel, NegativeBinomialModel)
+}
+
+
+def get_model_family(family: str) -> type[ForecastModel]:
+    """Model class of a family, by name."""
+    if family not in MODEL_FAMILIES:
+        raise ValueError(
+            f"Unknown model family '{family}', expected one of {list(MODEL_FAMILIES)}"
+        )
+    return MODEL_FAMILIES[family]
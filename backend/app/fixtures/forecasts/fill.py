@@ -4,28 +4,42 @@ from typing import TypeAlias
 
 import numpy as np
 import numpy.typing as npt
-import pandas as pd
 from sqlalchemy import Row
 from sqlalchemy.orm import Session, aliased
 
 from app.config import config
 from app.database.core import get_session
-from app.fixtures.forecasts.dixon_coles import DixonColesModel
-from app.fixtures.forecasts.models import FixtureForecast
+from app.fixtures.forecasts.artifacts import ArtifactKey, ModelArtifact, artifact_store
+from app.fixtures.forecasts.base import ForecastModel
+from app.fixtures.forecasts.covariates import XG_COVARIATES, RollingXG, rolling_xg
+from app.fixtures.forecasts.encoding import StrArray
+from app.fixtures.forecasts.families import DEFAULT_FAMILY, get_model_family
+from app.fixtures.forecasts.loader import TRAIN_COLUMNS, load_results
+from app.fixtures.forecasts.priors import get_promoted_teams, load_prior_table
+from app.fixtures.forecasts.service import upsert_forecasts
 from app.fixtures.models import Fixture
 from app.logger import logger
 from app.results.models import Result
+from app.seasons.service import get_previous_season
 from app.teams.models import Team
 
 FORECAST_HORIZON = 10
+FIT_RESTARTS = 4
+FIT_SEED = 0
 
 TrainResults: TypeAlias = dict[
     str, npt.NDArray[np.datetime64] | npt.NDArray[np.float64] | npt.NDArray[np.str_]
 ]
 
 
-def get_train_results(session: Session, end_season: str, end_gw: int) -> TrainResults:
-    """Get the results for the training set."""
+def get_train_results(
+    session: Session, end_season: str, end_gw: int, expected_goals: bool = False
+) -> TrainResults:
+    """Get the results for the training set.
+
+    With `expected_goals`, the results' home and away xG (NaN where missing) are
+    included as `home_xg` and `away_xg`.
+    """
     logger.info("Loading train set...")
     latest_date = (
         session.query(Fixture.date)
@@ -39,35 +53,12 @@ def get_train_results(session: Session, end_season: str, end_gw: int) -> TrainRe
             f"No results found for the given season {end_season} and gameweek {end_gw}"
         )
 
-    HomeTeam = aliased(Team)
-    AwayTeam = aliased(Team)
-
-    results = (
-        session.query(
-            Fixture.date,
-            HomeTeam.name.label("home_team"),
-            AwayTeam.name.label("away_team"),
-            Result.home_score,
-            Result.away_score,
-        )
-        .join(Result.fixture)
-        .join(HomeTeam, Fixture.home_team_id == HomeTeam.id)
-        .join(AwayTeam, Fixture.away_team_id == AwayTeam.id)
-        .filter(Fixture.date <= latest_date.date)
-        .all()
+    columns = TRAIN_COLUMNS + (("home_xg", "away_xg") if expected_goals else ())
+    train: TrainResults = load_results(
+        session, Fixture.date <= latest_date.date, columns=columns
     )
-    logger.info(f"Train set size: {len(results)}")
-
-    return {
-        "date": np.array(
-            pd.to_datetime([r.date for r in results], format="mixed", utc=True),
-            dtype="datetime64[D]",
-        ),
-        "home_team": np.array([r.home_team for r in results]),
-        "away_team": np.array([r.away_team for r in results]),
-        "home_goals": np.array([r.home_score for r in results]),
-        "away_goals": np.array([r.away_score for r in results]),
-    }
+    logger.info(f"Train set size: {len(train['date'])}")
+    return train
 
 
 def get_test_fixtures(
@@ -94,13 +85,65 @@ def get_test_fixtures(
     return fixtures
 
 
+def get_fitted_model(
+    train: TrainResults,
+    season: str,
+    gameweek: int,
+    promoted: StrArray | None = None,
+    family: str = DEFAULT_FAMILY,
+    xg: RollingXG | None = None,
+) -> ForecastModel:
+    """Reuse a stored fit of the training data by a model `family`, or fit and store one.
+
+    The season's `promoted` teams are shrunk towards the promoted team prior, when the
+    prior table has one for the season. Given the training fixtures' rolling `xg`, the
+    model includes the expected goals covariates. New fits are warm-started from the
+    previous gameweek's stored fit of the same model when available.
+    """
+    covariates = {}
+    if xg is not None:
+        home_x, away_x = xg.design()
+        covariates = {
+            "home_covariates": home_x,
+            "away_covariates": away_x,
+            "covariate_names": XG_COVARIATES,
+        }
+    model = get_model_family(family)(**train, **covariates)  # type: ignore[arg-type]
+    if (prior := load_prior_table().get(season)) is not None:
+        model.set_priors(prior, teams=np.array([]) if promoted is None else promoted)
+    key = ArtifactKey.for_model(season=season, gameweek=gameweek, model=model)
+    if (artifact := artifact_store.load(key)) is not None:
+        logger.info(f"Reusing stored model fit {key.filename}")
+        return artifact.to_model()
+
+    prev_season, prev_gw = (
+        (season, gameweek - 1) if gameweek > 1 else (get_previous_season(season), 38)
+    )
+    previous = artifact_store.latest(
+        season=prev_season, gameweek=prev_gw, xi=model.xi, family=family
+    )
+    if previous is not None and previous.covariate_names == model.covariate_names:
+        model.warm_start(teams=previous.teams, params=previous.params)
+        model.fit()
+    else:
+        model.fit_multistart(n_starts=FIT_RESTARTS, seed=FIT_SEED)
+
+    artifact_store.save(key, ModelArtifact.from_model(model))
+    return model
+
+
 def fill_fixture_forecasts(
     session: Session,
     split_gameweek: int | None = None,
     split_season: str | None = None,
     horizon: int = FORECAST_HORIZON,
+    family: str = DEFAULT_FAMILY,
+    covariates: bool = False,
 ) -> None:
-    """Back-fill team performance forecasts over historical data."""
+    """Back-fill team performance forecasts of a model `family` over historical data.
+
+    With `covariates`, the model includes the teams' rolling expected goals.
+    """
     logger.info("Filling 'FixtureForecasts' table...")
     split_gw: int = split_gameweek or config.CURRENT_GAMEWEEK
     split_szn: str = split_season or config.CURRENT_SEASON
@@ -109,19 +152,48 @@ def fill_fixture_forecasts(
         session=session,
         end_season=split_szn,
         end_gw=split_gw,
+        expected_goals=covariates,
     )
+    xg = None
+    if covariates:
+        xg = rolling_xg(
+            home_team=train["home_team"],  # type: ignore[arg-type]
+            away_team=train["away_team"],  # type: ignore[arg-type]
+            home_xg=train.pop("home_xg"),  # type: ignore[arg-type]
+            away_xg=train.pop("away_xg"),  # type: ignore[arg-type]
+            date=train["date"],  # type: ignore[arg-type]
+        )
     test = get_test_fixtures(
         session=session,
         season=split_szn,
         start_gw=split_gw,
         horizon=horizon,
     )
-    model = DixonColesModel(**train)  # type: ignore[arg-type]
-    model.fit()
-    for fixture in test:
-        yhat = model.predict(home_team=fixture.home_team, away_team=fixture.away_team)
-        ff = FixtureForecast(fixture_id=fixture.fixture_id, **yhat)  # type: ignore
-        session.add(ff)
+    model = get_fitted_model(
+        train=train,
+        season=split_szn,
+        gameweek=split_gw,
+        promoted=get_promoted_teams(session=session, season=split_szn),
+        family=family,
+        xg=xg,
+    )
+    home_teams = np.array([fixture.home_team for fixture in test])
+    away_teams = np.array([fixture.away_team for fixture in test])
+    home_x, away_x = (
+        xg.fixture_design(home_teams, away_teams) if xg is not None else (None, None)
+    )
+    yhat = model.predict_many(
+        home_teams=home_teams,
+        away_teams=away_teams,
+        home_covariates=home_x,
+        away_covariates=away_x,
+    )
+    upsert_forecasts(
+        session=session,
+        fixture_ids=[fixture.fixture_id for fixture in test],
+        forecasts=yhat,
+        model_version=model.version,
+    )
     session.commit()
 
 
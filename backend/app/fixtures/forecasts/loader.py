@@ -0,0 +1,73 @@
+"""Columnar loading of played results into typed arrays."""
+
+from typing import Any, TypeAlias
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.orm import Session
+
+from app.database.utils import fetch_columns
+from app.fixtures.forecasts.encoding import StrArray
+from app.fixtures.models import Fixture
+from app.results.models import Result
+from app.teams.cache import team_cache
+
+ResultColumns: TypeAlias = dict[str, npt.NDArray[Any]]
+
+# Selectable result columns, by output name, and their array dtypes. Teams are
+# selected as their integer ids and decoded with a single lookup array.
+RESULT_COLUMNS: dict[str, tuple[ColumnElement[Any], npt.DTypeLike]] = {
+    "fixture_id": (Fixture.fixture_id, np.int64),
+    "season": (Fixture.season, "<U8"),
+    "gameweek": (Fixture.gameweek, np.int64),
+    # Day of the kick-off, as numpy has no time zone aware timestamps
+    "date": (func.date(Fixture.date), "datetime64[D]"),
+    "home_team": (Fixture.home_team_id, np.int64),
+    "away_team": (Fixture.away_team_id, np.int64),
+    "home_goals": (Result.home_score, np.int64),
+    "away_goals": (Result.away_score, np.int64),
+    "home_xg": (Result.home_xg, np.float64),
+    "away_xg": (Result.away_xg, np.float64),
+}
+
+TRAIN_COLUMNS = ("date", "home_team", "away_team", "home_goals", "away_goals")
+
+
+def get_team_names(session: Session) -> StrArray:
+    """Team names indexed by team id, from the team cache, to decode arrays of ids."""
+    teams = team_cache.index(session).by_id
+    if not teams:
+        return np.array([], dtype=str)
+    ids, names = zip(*((i, team.name) for i, team in teams.items()), strict=True)
+    names_array = np.array(names, dtype=str)
+    lookup = np.full(max(ids) + 1, "", dtype=names_array.dtype)
+    lookup[list(ids)] = names_array
+    return lookup
+
+
+def load_results(
+    session: Session,
+    *criteria: ColumnElement[bool],
+    columns: tuple[str, ...] = TRAIN_COLUMNS,
+) -> ResultColumns:
+    """Played results matching `criteria`, as one typed array per column.
+
+    Rows are streamed straight into preallocated arrays and team ids are decoded to
+    names with one vectorised lookup, so no per-row Python objects are kept.
+    """
+    statement = (
+        select(*(RESULT_COLUMNS[name][0].label(name) for name in columns))
+        .join(Result, Result.fixture_id == Fixture.fixture_id)
+        .where(*criteria)
+    )
+    arrays = fetch_columns(
+        session, statement, {name: RESULT_COLUMNS[name][1] for name in columns}
+    )
+
+    team_columns = [name for name in ("home_team", "away_team") if name in arrays]
+    if team_columns:
+        names = get_team_names(session)
+        for name in team_columns:
+            arrays[name] = names[arrays[name]]
+    return arrays
@@ -0,0 +1,149 @@
+"""Betting market probabilities derived from joint scoreline distributions."""
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.stats import poisson
+
+from app.fixtures.forecasts.encoding import FloatArray, IntArray
+
+# Upper bound on the scoreline probability mass dropped by adaptive truncation
+TAIL_TOLERANCE = 1e-8
+TOTAL_GOALS_LINES = (0.5, 1.5, 2.5, 3.5, 4.5)
+ASIAN_HANDICAP_LINES = (-1.5, -1.0, -0.5, -0.25, 0.0, 0.25, 0.5, 1.0, 1.5)
+
+
+@dataclass
+class ScoreDistribution:
+    """Joint scoreline probabilities of a batch of fixtures.
+
+    `matrix[f, i, j]` is the probability fixture `f` finishes `i`-`j`. The matrices are
+    renormalised over the truncated scorelines, and `tail_mass` records the probability
+    of the scorelines beyond the truncation, before renormalising.
+    """
+
+    matrix: FloatArray
+    tail_mass: FloatArray
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    @property
+    def max_goals(self) -> int:
+        """Number of goals per team covered, i.e. scores 0 to `max_goals - 1`."""
+        return self.matrix.shape[1]  # type: ignore[no-any-return]
+
+    @property
+    def home_goals(self) -> FloatArray:
+        """Exact home goals distribution, (n_fixtures, max_goals)."""
+        return self.matrix.sum(axis=2)  # type: ignore[no-any-return]
+
+    @property
+    def away_goals(self) -> FloatArray:
+        """Exact away goals distribution, (n_fixtures, max_goals)."""
+        return self.matrix.sum(axis=1)  # type: ignore[no-any-return]
+
+    @property
+    def total_goals(self) -> FloatArray:
+        """Exact total goals distribution, (n_fixtures, 2 * max_goals - 1)."""
+        goals = np.arange(self.max_goals)
+        return self._collapse(goals[:, np.newaxis] + goals)
+
+    @property
+    def goal_difference(self) -> FloatArray:
+        """Home minus away goals distribution, from `1 - max_goals` to `max_goals - 1`."""
+        goals = np.arange(self.max_goals)
+        return self._collapse(goals[:, np.newaxis] - goals + self.max_goals - 1)
+
+    def _collapse(self, index: IntArray) -> FloatArray:
+        """Sum the scoreline probabilities sharing an index, for every fixture at once."""
+        one_hot = np.eye(index.max() + 1)[index.ravel()]
+        return self.matrix.reshape(len(self), -1) @ one_hot  # type: ignore[no-any-return]
+
+    def outcomes(self) -> tuple[FloatArray, FloatArray, FloatArray]:
+        """Home win, draw and away win probabilities."""
+        return (
+            np.tril(self.matrix, -1).sum(axis=(1, 2)),
+            np.trace(self.matrix, axis1=1, axis2=2),
+            np.triu(self.matrix, 1).sum(axis=(1, 2)),
+        )
+
+    def correct_score(self, home_goals: int, away_goals: int) -> FloatArray:
+        """Probability of an exact scoreline."""
+        if max(home_goals, away_goals) >= self.max_goals:
+            return np.zeros(len(self))
+        return self.matrix[:, home_goals, away_goals]  # type: ignore[no-any-return]
+
+    def over(self, line: float) -> FloatArray:
+        """Probability of more than `line` total goals."""
+        totals = np.arange(2 * self.max_goals - 1)
+        return self.total_goals[:, totals > line].sum(axis=1)  # type: ignore[no-any-return]
+
+    def under(self, line: float) -> FloatArray:
+        """Probability of fewer than `line` total goals."""
+        totals = np.arange(2 * self.max_goals - 1)
+        return self.total_goals[:, totals < line].sum(axis=1)  # type: ignore[no-any-return]
+
+    def both_teams_to_score(self) -> FloatArray:
+        """Probability that both teams score at least once."""
+        return self.matrix[:, 1:, 1:].sum(axis=(1, 2))  # type: ignore[no-any-return]
+
+    def asian_handicap(self, line: float) -> tuple[FloatArray, FloatArray, FloatArray]:
+        """Home win, push and loss probabilities with `line` added to the home score.
+
+        Quarter lines split the stake across the two neighbouring lines, so their
+        probabilities are the stake-weighted average of both halves.
+        """
+        if (4 * line) % 2 == 1:
+            lower = self.asian_handicap(line - 0.25)
+            upper = self.asian_handicap(line + 0.25)
+            return (
+                (lower[0] + upper[0]) / 2,
+                (lower[1] + upper[1]) / 2,
+                (lower[2] + upper[2]) / 2,
+            )
+        margin = np.arange(1 - self.max_goals, self.max_goals) + line
+        dist = self.goal_difference
+        return (
+            dist[:, margin > 0].sum(axis=1),
+            dist[:, margin == 0].sum(axis=1),
+            dist[:, margin < 0].sum(axis=1),
+        )
+
+    def markets(self) -> dict[str, FloatArray]:
+        """The standard market probabilities, a column per selection."""
+        home_win, draw, away_win = self.outcomes()
+        btts = self.both_teams_to_score()
+        columns = {
+            "home_win": home_win,
+            "draw": draw,
+            "away_win": away_win,
+            "btts_yes": btts,
+            "btts_no": 1 - btts,
+        }
+        for line in TOTAL_GOALS_LINES:
+            columns[f"over_{line:g}"] = self.over(line)
+            columns[f"under_{line:g}"] = self.under(line)
+        for line in ASIAN_HANDICAP_LINES:
+            win, push, loss = self.asian_handicap(line)
+            columns[f"ah_{line:+g}_home"] = win
+            columns[f"ah_{line:+g}_push"] = push
+            columns[f"ah_{line:+g}_away"] = loss
+        return columns
+
+
+def truncation_goals(
+    home_goal_exp: FloatArray, away_goal_exp: FloatArray, tol: float = TAIL_TOLERANCE
+) -> int:
+    """Fewest goals per team so every fixture's dropped scoreline mass is below `tol`.
+
+    The mass outside the truncated matrix is bounded by the two Poisson marginal tails,
+    so each is held below `tol / 2` for the highest expectation in the batch. The rho
+    correction only moves mass between the four lowest scorelines, so the bound holds.
+    """
+    if home_goal_exp.size == 0:
+        # An empty batch has no tail to bound, but keep the low scorelines the
+        # Dixon-Coles correction adjusts
+        return 2
+    max_exp = max(np.max(home_goal_exp), np.max(away_goal_exp))
+    return int(poisson.isf(tol / 2, max_exp)) + 1
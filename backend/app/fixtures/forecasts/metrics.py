@@ -0,0 +1,74 @@
+"""Scoring rules for fixture outcome forecasts."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from app.fixtures.forecasts.encoding import FloatArray, IntArray
+
+
+@dataclass
+class ForecastScores:
+    """Probabilistic and point scores of fixture forecasts against results."""
+
+    log_loss: float
+    brier: float
+    rps: float
+    mae: float
+
+    @classmethod
+    def from_predictions(
+        cls,
+        home_win: FloatArray,
+        draw: FloatArray,
+        away_win: FloatArray,
+        home_goals_for: FloatArray,
+        away_goals_for: FloatArray,
+        home_goals: IntArray,
+        away_goals: IntArray,
+    ) -> ForecastScores:
+        """Score outcome probabilities and goal expectations against the results."""
+        probs = np.column_stack((home_win, draw, away_win))
+        outcomes = outcome_indicators(home_goals=home_goals, away_goals=away_goals)
+        goal_errors = np.abs(home_goals - home_goals_for) + np.abs(
+            away_goals - away_goals_for
+        )
+        return cls(
+            log_loss=log_loss(probs, outcomes),
+            brier=brier_score(probs, outcomes),
+            rps=ranked_probability_score(probs, outcomes),
+            mae=float(np.mean(goal_errors / 2)),
+        )
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the scores as a dictionary."""
+        return asdict(self)
+
+    def __str__(self) -> str:
+        """Scores formatted on a single line."""
+        return ", ".join(f"{k}: {v:.4f}" for k, v in self.as_dict().items())
+
+
+def outcome_indicators(home_goals: IntArray, away_goals: IntArray) -> FloatArray:
+    """One-hot (home win, draw, away win) indicators of each result."""
+    outcome = np.sign(away_goals - home_goals) + 1
+    return np.eye(3)[outcome]  # type: ignore[no-any-return]
+
+
+def log_loss(probs: FloatArray, outcomes: FloatArray, eps: float = 1e-15) -> float:
+    """Mean negative log probability assigned to the observed outcome."""
+    observed = np.sum(probs * outcomes, axis=1)
+    return float(-np.mean(np.log(np.clip(observed, eps, 1))))
+
+
+def brier_score(probs: FloatArray, outcomes: FloatArray) -> float:
+    """Mean squared error of the outcome probabilities."""
+    return float(np.mean(np.sum((probs - outcomes) ** 2, axis=1)))
+
+
+def ranked_probability_score(probs: FloatArray, outcomes: FloatArray) -> float:
+    """Mean ranked probability score over the ordered (home, draw, away) outcomes."""
+    cum_diff = np.cumsum(probs - outcomes, axis=1)[:, :-1]
+    return float(np.mean(np.sum(cum_diff**2, axis=1) / (probs.shape[1] - 1)))
@@ -1,10 +1,14 @@
+import datetime as dt
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Float, ForeignKey, Integer
+from pydantic import Field
+from sqlalchemy import Float, ForeignKey, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.core import Base
 from app.models import KolModel
+from app.teams.models import TeamRead
+from app.validations import Season
 
 if TYPE_CHECKING:
     from app.fixtures.models import Fixture
@@ -12,6 +16,11 @@ if TYPE_CHECKING:
 
 class FixtureForecast(Base):
     __tablename__ = "fixture_forecasts"
+    __table_args__ = (
+        UniqueConstraint(
+            "fixture_id", "model_version", name="uix_fixture_model_version"
+        ),
+    )
 
     forecast_id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True
@@ -19,6 +28,7 @@ class FixtureForecast(Base):
     fixture_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("fixture.fixture_id"), index=True
     )
+    model_version: Mapped[str] = mapped_column(String(100), nullable=False)
     home_win: Mapped[float] = mapped_column(Float, nullable=False)
     away_win: Mapped[float] = mapped_column(Float, nullable=False)
     home_clean_sheet: Mapped[float] = mapped_column(Float, nullable=False)
@@ -30,9 +40,7 @@ class FixtureForecast(Base):
     home_defence: Mapped[float] = mapped_column(Float, nullable=False)
     away_defence: Mapped[float] = mapped_column(Float, nullable=False)
 
-    fixture: Mapped["Fixture"] = relationship(
-        "Fixture", uselist=False, back_populates="forecast"
-    )
+    fixture: Mapped["Fixture"] = relationship("Fixture", back_populates="forecasts")
 
     def __str__(self) -> str:
         return (
@@ -53,3 +61,25 @@ class FixtureForecastRead(KolModel):
     away_attack: float
     home_defence: float
     away_defence: float
+
+
+class ForecastQuery(KolModel):
+    season: Season
+    gameweek: int = Field(ge=1, le=38)
+    team_id: int | None = None
+    model_version: str | None = None
+
+
+class FixtureForecastItem(KolModel):
+    fixture_id: int
+    date: dt.datetime | None
+    home_team: TeamRead
+    away_team: TeamRead
+    forecast: FixtureForecastRead
+
+
+class GameweekForecastsRead(KolModel):
+    season: str
+    gameweek: int
+    model_version: str
+    items: list[FixtureForecastItem]
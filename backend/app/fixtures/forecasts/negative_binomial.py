@@ -0,0 +1,204 @@
+"""Negative binomial team strength model."""
+
+import math
+from typing import Any
+
+import numpy as np
+from numba import njit
+from scipy.stats import nbinom
+
+from app.fixtures.forecasts.base import (
+    FASTMATH,
+    ForecastModel,
+    covariate_effect,
+    log_factorial,
+)
+from app.fixtures.forecasts.encoding import FloatArray, IntArray
+from app.fixtures.forecasts.markets import TAIL_TOLERANCE, ScoreDistribution
+
+
+class NegativeBinomialModel(ForecastModel):
+    """Negative binomial team strength model.
+
+    Home and away goals are independent negative binomials with means at the team goal
+    rates and a shared `dispersion` alpha, so each has variance mu + alpha * mu^2.
+    As alpha goes to zero this is the independent Poisson model.
+    """
+
+    family = "negative_binomial"
+    extra_params = ("dispersion",)
+    extra_init = (0.05,)
+    extra_bounds = ((1e-4, 2.0),)
+
+    @staticmethod
+    def kernel(*args: Any) -> float:
+        """Fused negative binomial negative log-likelihood, see `negative_binomial_nll`."""
+        return negative_binomial_nll(*args)  # type: ignore[no-any-return]
+
+    def _score_distribution(
+        self,
+        home_rate: FloatArray,
+        away_rate: FloatArray,
+        max_goals: int | None = None,
+        tol: float = TAIL_TOLERANCE,
+    ) -> ScoreDistribution:
+        """Independent negative binomial scoreline distribution given the goal rates."""
+        return score_distribution(
+            home_rate=home_rate,
+            away_rate=away_rate,
+            dispersion=self._params[-1],
+            max_goals=max_goals,
+            tol=tol,
+        )
+
+    def _loglikelihood(
+        self,
+        home_rate: FloatArray,
+        away_rate: FloatArray,
+        home_goals: IntArray,
+        away_goals: IntArray,
+    ) -> FloatArray:
+        """Negative binomial log-likelihood of each scoreline."""
+        return negative_binomial_loglikelihood(  # type: ignore[no-any-return]
+            home_goals, away_goals, home_rate, away_rate, self._params[-1]
+        )
+
+
+@njit(fastmath=FASTMATH, cache=True)  # type: ignore[misc]
+def negative_binomial_terms(
+    goals: int, eta: float, dispersion: float
+) -> tuple[float, float, float]:
+    """Negative binomial log-PMF and its derivatives w.r.t. the log mean and dispersion.
+
+    With r = 1 / dispersion, the log-PMF is
+    sum_{j<k} log(r + j) - log(k!) - r log(1 + alpha mu) + k (eta - log(r + mu)), where
+    the sum replaces lgamma(k + r) - lgamma(r) for integer goals.
+    """
+    r = 1.0 / dispersion
+    mu = math.exp(eta)
+    log_ratio = 0.0
+    digamma_ratio = 0.0
+    for j in range(goals):
+        log_ratio += math.log(r + j)
+        digamma_ratio += 1.0 / (r + j)
+
+    log1p_mu = math.log1p(dispersion * mu)
+    log_pmf = log_ratio - log_factorial(goals) - r * log1p_mu
+    log_pmf += goals * (eta - math.log(r + mu))
+
+    d_eta = r * (goals - mu) / (r + mu)
+    d_r = digamma_ratio - log1p_mu + (mu - goals) / (r + mu)
+    return log_pmf, d_eta, -(r**2) * d_r
+
+
+@njit(fastmath=FASTMATH, cache=True)  # type: ignore[misc]
+def negative_binomial_nll(
+    params: FloatArray,
+    home_idx: IntArray,
+    away_idx: IntArray,
+    home_goals: IntArray,
+    away_goals: IntArray,
+    home_x: FloatArray,
+    away_x: FloatArray,
+    weights: FloatArray,
+    n_teams: int,
+    grad: FloatArray,
+) -> float:
+    """Fused weighted negative binomial negative log-likelihood (and gradient).
+
+    If `grad` is non-empty, the gradient is written into it.
+    """
+    with_grad = grad.size > 0
+    if with_grad:
+        grad[:] = 0.0
+
+    beta = 2 * n_teams
+    n_covariates = home_x.shape[1]
+    home_adv = params[beta + n_covariates]
+    dispersion = params[beta + n_covariates + 1]
+    nll = 0.0
+    for i in range(home_idx.size):
+        h, a = home_idx[i], away_idx[i]
+        w = weights[i]
+
+        eta_h = params[h] + params[n_teams + a] + home_adv
+        eta_a = params[a] + params[n_teams + h]
+        if n_covariates:
+            eta_h += covariate_effect(params, beta, home_x, i)
+            eta_a += covariate_effect(params, beta, away_x, i)
+        home_llk, g_h, g_dh = negative_binomial_terms(home_goals[i], eta_h, dispersion)
+        away_llk, g_a, g_da = negative_binomial_terms(away_goals[i], eta_a, dispersion)
+        nll -= w * (home_llk + away_llk)
+
+        if with_grad:
+            grad[h] -= w * g_h
+            grad[n_teams + a] -= w * g_h
+            grad[beta + n_covariates] -= w * g_h
+            grad[a] -= w * g_a
+            grad[n_teams + h] -= w * g_a
+            grad[beta + n_covariates + 1] -= w * (g_dh + g_da)
+            for j in range(n_covariates):
+                grad[beta + j] -= w * (g_h * home_x[i, j] + g_a * away_x[i, j])
+
+    return nll
+
+
+@njit(cache=True)  # type: ignore[misc]
+def negative_binomial_loglikelihood(
+    home_goals: IntArray,
+    away_goals: IntArray,
+    home_rate: FloatArray,
+    away_rate: FloatArray,
+    dispersion: float,
+) -> FloatArray:
+    """Independent negative binomial log-likelihood of each scoreline."""
+    llk = np.empty(home_goals.size)
+    for i in range(home_goals.size):
+        home_llk, _, _ = negative_binomial_terms(
+            home_goals[i], math.log(home_rate[i]), dispersion
+        )
+        away_llk, _, _ = negative_binomial_terms(
+            away_goals[i], math.log(away_rate[i]), dispersion
+        )
+        llk[i] = home_llk + away_llk
+    return llk
+
+
+def truncation_goals(
+    home_rate: FloatArray,
+    away_rate: FloatArray,
+    dispersion: float,
+    tol: float = TAIL_TOLERANCE,
+) -> int:
+    """Fewest goals per team so every fixture's dropped scoreline mass is below `tol`.
+
+    As in the Poisson case each marginal tail is held below `tol / 2`, here for the
+    heavier negative binomial tail at the highest rate in the batch.
+    """
+    if home_rate.size == 0:
+        # An empty batch has no tail to bound
+        return 2
+    max_rate = max(np.max(home_rate), np.max(away_rate))
+    r = 1 / dispersion
+    return int(nbinom.isf(tol / 2, r, r / (r + max_rate))) + 1
+
+
+def score_distribution(
+    home_rate: FloatArray,
+    away_rate: FloatArray,
+    dispersion: float,
+    max_goals: int | None = None,
+    tol: float = TAIL_TOLERANCE,
+) -> ScoreDistribution:
+    """Build the independent negative binomial scoreline distribution of a batch."""
+    if max_goals is None:
+        max_goals = truncation_goals(home_rate, away_rate, dispersion, tol=tol)
+    goals = np.arange(max_goals)
+    r = 1 / dispersion
+    home_probs = nbinom.pmf(goals, r, r / (r + home_rate[:, np.newaxis]))
+    away_probs = nbinom.pmf(goals, r, r / (r + away_rate[:, np.newaxis]))
+    m = home_probs[:, :, np.newaxis] * away_probs[:, np.newaxis, :]
+
+    tail_mass = 1 - m.sum(axis=(1, 2))
+    m /= m.sum(axis=(1, 2), keepdims=True)
+    return ScoreDistribution(matrix=m, tail_mass=tail_mass)
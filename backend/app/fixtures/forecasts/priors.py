@@ -0,0 +1,180 @@
+"""Gaussian priors on the strengths of newly promoted teams."""
+
+import json
+from dataclasses import asdict, dataclass
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.database.core import get_session
+from app.fixtures.forecasts.backtest import (
+    TRAIN_KEYS,
+    BacktestResults,
+    get_backtest_results,
+)
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.fixtures.forecasts.encoding import FloatArray, StrArray
+from app.fixtures.models import Fixture
+from app.logger import logger
+from app.seasons.service import get_next_season, get_previous_season
+from app.teams.models import Team
+
+PRIOR_TABLE_PATH = config.MODEL_ARTIFACT_DIR / "promoted_priors.json"
+MIN_PRIOR_SD = 0.05
+DEFAULT_PRIOR_SD = 0.2
+
+
+@dataclass(frozen=True)
+class TeamPrior:
+    """Independent Gaussian priors on a team's attack and defence."""
+
+    attack_mean: float
+    attack_sd: float
+    defence_mean: float
+    defence_sd: float
+    n_observations: int = 0
+
+    @classmethod
+    def from_strengths(cls, attack: FloatArray, defence: FloatArray) -> "TeamPrior":
+        """Fit the prior to observed strengths, e.g. of past promoted teams."""
+        n = len(attack)
+        if n == 0:
+            raise ValueError("At least one observed strength is needed for a prior")
+
+        def sd(values: FloatArray) -> float:
+            if n < 2:
+                return DEFAULT_PRIOR_SD
+            return max(float(np.std(values, ddof=1)), MIN_PRIOR_SD)
+
+        return cls(
+            attack_mean=float(np.mean(attack)),
+            attack_sd=sd(attack),
+            defence_mean=float(np.mean(defence)),
+            defence_sd=sd(defence),
+            n_observations=n,
+        )
+
+
+@dataclass
+class PriorTable:
+    """Promoted team prior of each season, derived only from earlier seasons."""
+
+    priors: dict[str, TeamPrior]
+
+    def get(self, season: str) -> TeamPrior | None:
+        """Prior for the teams promoted into `season`, if there is enough history."""
+        return self.priors.get(season)
+
+    def save(self, path: Path = PRIOR_TABLE_PATH) -> None:
+        """Write the table as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({s: asdict(p) for s, p in self.priors.items()}, indent=2)
+        )
+        load_prior_table.cache_clear()
+
+    @classmethod
+    def load(cls, path: Path = PRIOR_TABLE_PATH) -> "PriorTable":
+        """Read a table written by `save`, or an empty table if there is none."""
+        if not path.exists():
+            return cls(priors={})
+        return cls(
+            priors={s: TeamPrior(**p) for s, p in json.loads(path.read_text()).items()}
+        )
+
+
+@cache
+def load_prior_table(path: Path = PRIOR_TABLE_PATH) -> PriorTable:
+    """The stored prior table, read once per process."""
+    return PriorTable.load(path)
+
+
+def promoted_teams(season_teams: StrArray, previous_teams: StrArray) -> StrArray:
+    """Teams in a season that were not in the previous one."""
+    return np.setdiff1d(season_teams, previous_teams)  # type: ignore[no-any-return]
+
+
+def build_prior_table(results: BacktestResults) -> PriorTable:
+    """Derive each season's promoted team prior from earlier promoted teams.
+
+    A single model is advanced through the results a season at a time, and the strengths
+    of each season's promoted teams are recorded at the end of that season. The prior
+    of a season pools every promoted team of the seasons before it, including a prior
+    for the season after the last one.
+    """
+    seasons = list(dict.fromkeys(results["season"].tolist()))
+    model: DixonColesModel | None = None
+    attack: list[float] = []
+    defence: list[float] = []
+    priors = {}
+
+    for i, season in enumerate(seasons):
+        if attack:
+            priors[season] = TeamPrior.from_strengths(
+                np.array(attack), np.array(defence)
+            )
+
+        in_season = results["season"] == season
+        train = {k: results[k][in_season] for k in TRAIN_KEYS}
+        if model is None:
+            model = DixonColesModel(**train)  # type: ignore[arg-type]
+            model.fit()
+        else:
+            model.advance(**train)  # type: ignore[arg-type]
+
+        if i > 0:
+            previous = results["season"] == seasons[i - 1]
+            promoted = promoted_teams(
+                season_teams=np.unique(results["home_team"][in_season]),
+                previous_teams=np.unique(results["home_team"][previous]),
+            )
+            promoted_atk, promoted_def = model.get_team_strengths(promoted)
+            attack.extend(promoted_atk.tolist())
+            defence.extend(promoted_def.tolist())
+            logger.info(f"{season} promoted teams: {', '.join(promoted)}")
+
+    if attack:
+        next_season = get_next_season(seasons[-1])
+        priors[next_season] = TeamPrior.from_strengths(
+            np.array(attack), np.array(defence)
+        )
+    return PriorTable(priors=priors)
+
+
+def get_season_teams(session: Session, season: str) -> StrArray:
+    """Names of the teams with fixtures in a season."""
+    rows = (
+        session.query(Team.name)
+        .join(Fixture, Fixture.home_team_id == Team.id)
+        .filter(Fixture.season == season)
+        .distinct()
+        .all()
+    )
+    return np.array([r.name for r in rows])
+
+
+def get_promoted_teams(session: Session, season: str) -> StrArray:
+    """Teams with fixtures in `season` but none in the previous season."""
+    return promoted_teams(
+        season_teams=get_season_teams(session=session, season=season),
+        previous_teams=get_season_teams(
+            session=session, season=get_previous_season(season)
+        ),
+    )
+
+
+def fill_prior_table(session: Session, seasons: list[str] | None = None) -> PriorTable:
+    """Build the promoted team prior table from the stored results and save it."""
+    results = get_backtest_results(session=session, seasons=seasons or config.SEASONS)
+    table = build_prior_table(results)
+    table.save()
+    logger.info(f"Saved promoted team priors for {len(table.priors)} seasons")
+    return table
+
+
+if __name__ == "__main__":
+    with get_session() as session:
+        fill_prior_table(session=session)
@@ -0,0 +1,149 @@
+"""Storage and retrieval of fixture forecasts by model version."""
+
+from collections.abc import Mapping
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload
+
+from app.fixtures.forecasts.cache import CachedGameweek, ForecastKey, forecast_cache
+from app.fixtures.forecasts.families import DEFAULT_FAMILY
+from app.fixtures.forecasts.models import (
+    FixtureForecast,
+    FixtureForecastItem,
+    FixtureForecastRead,
+    ForecastQuery,
+    GameweekForecastsRead,
+)
+from app.fixtures.models import Fixture
+from app.logger import logger
+
+# Rows per upsert statement
+UPSERT_BATCH_SIZE = 1_000
+
+FORECAST_COLUMNS = tuple(FixtureForecastRead.model_fields)
+
+# Session info key of the model versions written in its transaction
+WRITTEN_VERSIONS = "written_forecast_versions"
+
+
+def upsert_forecasts(
+    *,
+    session: Session,
+    fixture_ids: npt.ArrayLike,
+    forecasts: Mapping[str, npt.NDArray[Any]],
+    model_version: str,
+    batch_size: int = UPSERT_BATCH_SIZE,
+) -> int:
+    """Insert or replace the forecasts of many fixtures by a model version.
+
+    `forecasts` holds a column per forecast output, aligned with `fixture_ids`, as
+    returned by batched prediction. Rows are keyed on (fixture_id, model_version), so
+    rerunning a split replaces its forecasts. Each batch is one `INSERT ... ON
+    CONFLICT DO UPDATE` executed for many rows, which Postgres sends as a single
+    multi-row statement and SQLite runs through executemany. Returns the number of
+    rows written; the caller commits, which invalidates the version's cached gameweeks.
+    """
+    dialects = {"postgresql": postgresql, "sqlite": sqlite}
+    dialect = session.get_bind().dialect.name
+    if dialect not in dialects:
+        raise ValueError(f"Forecast upserts are not supported on {dialect}")
+
+    table = FixtureForecast.__table__
+    statement = dialects[dialect].insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.fixture_id, table.c.model_version],
+        set_={column: statement.excluded[column] for column in FORECAST_COLUMNS},
+    )
+
+    ids = np.asarray(fixture_ids, dtype=np.int64).tolist()
+    values = np.column_stack(
+        [np.asarray(forecasts[column], dtype=np.float64) for column in FORECAST_COLUMNS]
+    ).tolist()
+    rows = [
+        {
+            "fixture_id": fixture_id,
+            "model_version": model_version,
+            **dict(zip(FORECAST_COLUMNS, row, strict=True)),
+        }
+        for fixture_id, row in zip(ids, values, strict=True)
+    ]
+
+    connection = session.connection()
+    for start in range(0, len(rows), batch_size):
+        connection.execute(statement, rows[start : start + batch_size])
+    session.info.setdefault(WRITTEN_VERSIONS, set()).add(model_version)
+    logger.info(f"Upserted {len(rows)} {model_version} fixture forecasts")
+    return len(rows)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_written_forecasts(session: Session) -> None:
+    """Drop cached gameweeks of the model versions a committed transaction wrote."""
+    for version in session.info.pop(WRITTEN_VERSIONS, ()):
+        forecast_cache.invalidate(version)
+
+
+def get_gameweek_forecasts(
+    *, session: Session, season: str, gameweek: int, model_version: str
+) -> GameweekForecastsRead:
+    """A gameweek's fixtures with their forecasts by one model version, in
+    kick-off order."""
+    forecasts = (
+        session.query(FixtureForecast)
+        .join(FixtureForecast.fixture)
+        .options(
+            joinedload(FixtureForecast.fixture).joinedload(Fixture.home_team),
+            joinedload(FixtureForecast.fixture).joinedload(Fixture.away_team),
+        )
+        .filter(
+            Fixture.season == season,
+            Fixture.gameweek == gameweek,
+            FixtureForecast.model_version == model_version,
+        )
+        .order_by(Fixture.date, Fixture.fixture_id)
+        .all()
+    )
+    return GameweekForecastsRead(
+        season=season,
+        gameweek=gameweek,
+        model_version=model_version,
+        items=[
+            FixtureForecastItem(
+                fixture_id=forecast.fixture_id,
+                date=forecast.fixture.date,
+                home_team=forecast.fixture.home_team,
+                away_team=forecast.fixture.away_team,
+                forecast=forecast,
+            )
+            for forecast in forecasts
+        ],
+    )
+
+
+def get_cached_forecasts(*, session: Session, query_in: ForecastQuery) -> bytes:
+    """Serialized forecasts of a gameweek, or of one team's fixtures in it.
+
+    Gameweeks are read once per model version and held as JSON in the process-wide
+    cache, so repeat requests neither query the database nor re-serialize.
+    """
+    key = ForecastKey(
+        season=query_in.season,
+        gameweek=query_in.gameweek,
+        model_version=query_in.model_version or DEFAULT_FAMILY,
+    )
+    cached = forecast_cache.get(
+        key,
+        lambda: CachedGameweek.serialize(
+            get_gameweek_forecasts(
+                session=session,
+                season=key.season,
+                gameweek=key.gameweek,
+                model_version=key.model_version,
+            )
+        ),
+    )
+    return cached.for_team(query_in.team_id)
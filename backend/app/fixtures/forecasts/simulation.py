@@ -0,0 +1,302 @@
+"""Monte Carlo simulation of the remainder of a season from fitted team strengths."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+from numba import njit
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, aliased
+
+from app.database.core import get_session
+from app.fixtures.forecasts.base import ForecastModel
+from app.fixtures.forecasts.encoding import FloatArray, IntArray, StrArray
+from app.fixtures.forecasts.fill import get_fitted_model, get_train_results
+from app.fixtures.models import Fixture
+from app.logger import logger
+from app.results.models import Result
+from app.teams.models import Team
+
+N_SIMULATIONS = 100_000
+N_TITLE, N_TOP, N_RELEGATED = 1, 4, 3
+
+
+@dataclass
+class SeasonSimulation:
+    """Distribution of final league positions over simulated seasons."""
+
+    teams: StrArray
+    position_probs: FloatArray  # (n_teams, n_teams), team by final position
+    expected_points: FloatArray
+    n_simulations: int
+
+    @property
+    def title(self) -> FloatArray:
+        """Probability of finishing first."""
+        return self.position_probs[:, :N_TITLE].sum(axis=1)  # type: ignore[no-any-return]
+
+    @property
+    def top_four(self) -> FloatArray:
+        """Probability of finishing in the top four."""
+        return self.position_probs[:, :N_TOP].sum(axis=1)  # type: ignore[no-any-return]
+
+    @property
+    def relegation(self) -> FloatArray:
+        """Probability of finishing in the bottom three."""
+        return self.position_probs[:, -N_RELEGATED:].sum(axis=1)  # type: ignore[no-any-return]
+
+    def table(self) -> list[dict[str, str | float]]:
+        """Teams ordered by expected points, with their headline probabilities."""
+        return [
+            {
+                "team": str(self.teams[i]),
+                "expected_points": float(self.expected_points[i]),
+                "title": float(self.title[i]),
+                "top_four": float(self.top_four[i]),
+                "relegation": float(self.relegation[i]),
+            }
+            for i in np.argsort(-self.expected_points)
+        ]
+
+
+def simulate_season(
+    model: ForecastModel,
+    teams: StrArray,
+    played: dict[str, npt.NDArray[np.generic]],
+    remaining: dict[str, StrArray],
+    n_simulations: int = N_SIMULATIONS,
+    seed: int | None = None,
+    max_workers: int | None = None,
+) -> SeasonSimulation:
+    """Simulate the remaining fixtures on top of the table of played results.
+
+    Scorelines are sampled from each fixture's joint score matrix.
+    Simulations are split into seeded chunks across worker processes, and only
+    position counts and points totals are aggregated.
+    """
+    team_index = {team: i for i, team in enumerate(teams)}
+    points, goal_diff, goals_for = league_table(
+        home_idx=np.array([team_index[t] for t in played["home_team"]], dtype=np.int64),
+        away_idx=np.array([team_index[t] for t in played["away_team"]], dtype=np.int64),
+        home_goals=played["home_goals"].astype(np.int64),
+        away_goals=played["away_goals"].astype(np.int64),
+        n_teams=len(teams),
+    )
+
+    dist = model.score_distribution(
+        home_teams=remaining["home_team"], away_teams=remaining["away_team"]
+    )
+    cdf = np.cumsum(dist.matrix.reshape(len(dist), dist.max_goals**2), axis=1)
+    cdf[:, -1] = 1.0
+
+    n_chunks = min(max_workers or os.cpu_count() or 1, n_simulations)
+    seeds = np.random.SeedSequence(seed).generate_state(n_chunks).tolist()
+    sims_per_chunk = np.diff(np.linspace(0, n_simulations, n_chunks + 1).astype(int))
+    chunk_args = [
+        (
+            cdf,
+            np.array([team_index[t] for t in remaining["home_team"]], dtype=np.int64),
+            np.array([team_index[t] for t in remaining["away_team"]], dtype=np.int64),
+            points,
+            goal_diff,
+            goals_for,
+            int(n_sims),
+            dist.max_goals,
+            chunk_seed,
+        )
+        for n_sims, chunk_seed in zip(sims_per_chunk, seeds, strict=True)
+    ]
+    logger.info(
+        f"Simulating {n_simulations} seasons of {len(cdf)} fixtures in {n_chunks} chunks"
+    )
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        parts = list(pool.map(_simulate_chunk, chunk_args))
+
+    position_counts = np.sum([p[0] for p in parts], axis=0)
+    points_total = np.sum([p[1] for p in parts], axis=0)
+    return SeasonSimulation(
+        teams=teams,
+        position_probs=position_counts / n_simulations,
+        expected_points=points_total / n_simulations,
+        n_simulations=n_simulations,
+    )
+
+
+def _simulate_chunk(
+    args: tuple[
+        FloatArray, IntArray, IntArray, IntArray, IntArray, IntArray, int, int, int
+    ],
+) -> tuple[npt.NDArray[np.int64], FloatArray]:
+    """Run a chunk of simulations in a worker process."""
+    return simulate_seasons(*args)  # type: ignore[no-any-return]
+
+
+def league_table(
+    home_idx: IntArray,
+    away_idx: IntArray,
+    home_goals: IntArray,
+    away_goals: IntArray,
+    n_teams: int,
+) -> tuple[IntArray, IntArray, IntArray]:
+    """Points, goal difference and goals scored of each team from results."""
+    home_points = np.select([home_goals > away_goals, home_goals == away_goals], [3, 1])
+    away_points = np.select([away_goals > home_goals, home_goals == away_goals], [3, 1])
+    points = np.bincount(home_idx, home_points, n_teams) + np.bincount(
+        away_idx, away_points, n_teams
+    )
+    goals_for = np.bincount(home_idx, home_goals, n_teams) + np.bincount(
+        away_idx, away_goals, n_teams
+    )
+    goals_against = np.bincount(home_idx, away_goals, n_teams) + np.bincount(
+        away_idx, home_goals, n_teams
+    )
+    return (
+        points.astype(np.int64),
+        (goals_for - goals_against).astype(np.int64),
+        goals_for.astype(np.int64),
+    )
+
+
+@njit(cache=True)  # type: ignore[misc]
+def simulate_seasons(
+    cdf: FloatArray,
+    home_idx: IntArray,
+    away_idx: IntArray,
+    points: IntArray,
+    goal_diff: IntArray,
+    goals_for: IntArray,
+    n_simulations: int,
+    max_goals: int,
+    seed: int,
+) -> tuple[npt.NDArray[np.int64], FloatArray]:
+    """Sample scorelines for the remaining fixtures and rank the final tables.
+
+    `cdf` is each fixture's flattened (home goals, away goals) cumulative score
+    distribution. Teams are ranked by points, then goal difference, then goals scored,
+    with any remaining ties broken at random. Returns the (team, position) counts and
+    the total points of each team over all simulations.
+    """
+    np.random.seed(seed)
+    n_teams = points.size
+    position_counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+    points_total = np.zeros(n_teams)
+    sim_points = np.empty(n_teams, dtype=np.int64)
+    sim_goal_diff = np.empty(n_teams, dtype=np.int64)
+    sim_goals_for = np.empty(n_teams, dtype=np.int64)
+    rank_key = np.empty(n_teams)
+
+    for _ in range(n_simulations):
+        sim_points[:] = points
+        sim_goal_diff[:] = goal_diff
+        sim_goals_for[:] = goals_for
+
+        for f in range(home_idx.size):
+            score = np.searchsorted(cdf[f], np.random.random())
+            home_goals, away_goals = divmod(score, max_goals)
+            h, a = home_idx[f], away_idx[f]
+            sim_goals_for[h] += home_goals
+            sim_goals_for[a] += away_goals
+            sim_goal_diff[h] += home_goals - away_goals
+            sim_goal_diff[a] += away_goals - home_goals
+            if home_goals > away_goals:
+                sim_points[h] += 3
+            elif home_goals == away_goals:
+                sim_points[h] += 1
+                sim_points[a] += 1
+            else:
+                sim_points[a] += 3
+
+        for t in range(n_teams):
+            rank_key[t] = (
+                sim_points[t] * 1e6
+                + (sim_goal_diff[t] + 500) * 1e3
+                + sim_goals_for[t]
+                + np.random.random()
+            )
+            points_total[t] += sim_points[t]
+
+        order = np.argsort(-rank_key)
+        for position in range(n_teams):
+            position_counts[order[position], position] += 1
+
+    return position_counts, points_total
+
+
+def get_season_results(
+    session: Session, season: str, gameweek: int
+) -> tuple[dict[str, npt.NDArray[np.generic]], dict[str, StrArray]]:
+    """Results up to and including `gameweek`, and every other fixture of the season.
+
+    Fixtures still to be played include those postponed from earlier gameweeks and
+    those not yet scheduled into a gameweek.
+    """
+    HomeTeam = aliased(Team)
+    AwayTeam = aliased(Team)
+    query = (
+        session.query(
+            HomeTeam.name.label("home_team"),
+            AwayTeam.name.label("away_team"),
+            Result.home_score,
+            Result.away_score,
+        )
+        .select_from(Fixture)
+        .outerjoin(Result, Result.fixture_id == Fixture.fixture_id)
+        .join(HomeTeam, Fixture.home_team_id == HomeTeam.id)
+        .join(AwayTeam, Fixture.away_team_id == AwayTeam.id)
+        .filter(Fixture.season == season)
+    )
+    played = query.filter(
+        Result.result_id.isnot(None), Fixture.gameweek <= gameweek
+    ).all()
+    remaining = query.filter(
+        or_(
+            Result.result_id.is_(None),
+            Fixture.gameweek.is_(None),
+            Fixture.gameweek > gameweek,
+        )
+    ).all()
+    return (
+        {
+            "home_team": np.array([f.home_team for f in played], dtype=str),
+            "away_team": np.array([f.away_team for f in played], dtype=str),
+            "home_goals": np.array([f.home_score for f in played], dtype=int),
+            "away_goals": np.array([f.away_score for f in played], dtype=int),
+        },
+        {
+            "home_team": np.array([f.home_team for f in remaining], dtype=str),
+            "away_team": np.array([f.away_team for f in remaining], dtype=str),
+        },
+    )
+
+
+def simulate_from_gameweek(
+    session: Session,
+    season: str,
+    gameweek: int,
+    n_simulations: int = N_SIMULATIONS,
+    seed: int | None = None,
+) -> SeasonSimulation:
+    """Simulate the rest of a season from the model fitted up to `gameweek`."""
+    train = get_train_results(session=session, end_season=season, end_gw=gameweek)
+    model = get_fitted_model(train=train, season=season, gameweek=gameweek)
+    played, remaining = get_season_results(
+        session=session, season=season, gameweek=gameweek
+    )
+    teams = np.unique(np.concatenate((remaining["home_team"], played["home_team"])))
+    return simulate_season(
+        model=model,
+        teams=teams,
+        played=played,
+        remaining=remaining,
+        n_simulations=n_simulations,
+        seed=seed,
+    )
+
+
+if __name__ == "__main__":
+    with get_session() as session:
+        simulation = simulate_from_gameweek(session=session, season="2324", gameweek=19)
+        for row in simulation.table():
+            logger.info(row)
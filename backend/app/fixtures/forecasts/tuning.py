@@ -0,0 +1,167 @@
+"""Time decay (xi) hyperparameter search for the Dixon-Coles model."""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+
+import numpy as np
+import numpy.typing as npt
+
+from app.config import config
+from app.database.core import get_session
+from app.fixtures.forecasts.backtest import (
+    TRAIN_KEYS,
+    BacktestResults,
+    fit_to_split,
+    get_backtest_results,
+)
+from app.fixtures.forecasts.base import ForecastModel
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.fixtures.forecasts.encoding import FloatArray
+from app.logger import logger
+
+XI_GRID: tuple[float, ...] = (0.0, 0.0005, 0.001, 0.0015, 0.002, 0.003, 0.004, 0.006)
+EVAL_ROUNDS = 38
+
+
+@dataclass
+class XiCandidate:
+    """Out-of-sample performance of a time decay candidate."""
+
+    xi: float
+    loglikelihood: float
+    mean_loglikelihood: float
+    n_fits: int
+    n_fixtures: int
+    fit_time: float
+
+    def __str__(self) -> str:
+        """Candidate formatted on a single line."""
+        return (
+            f"xi={self.xi:g} loglikelihood={self.loglikelihood:.2f} "
+            f"mean={self.mean_loglikelihood:.4f} fits={self.n_fits} "
+            f"fixtures={self.n_fixtures} "
+            f"fit_time={self.fit_time:.2f}s"
+        )
+
+
+def search_xi(
+    results: BacktestResults,
+    grid: tuple[float, ...] = XI_GRID,
+    eval_rounds: int = EVAL_ROUNDS,
+    max_workers: int | None = None,
+) -> list[XiCandidate]:
+    """Score each xi by its walk-forward predictive log-likelihood over the last rounds.
+
+    Split points are spread over worker processes. At each split a worker fits every
+    candidate in ascending order of xi on the same encoded data, reweighting the
+    sufficient statistics and warm-starting each fit from its neighbour's optimum.
+    Between splits the model is advanced by a round rather than rebuilt.
+    """
+    grid = tuple(sorted(grid))
+    split_points = np.arange(
+        results["round"].max() - eval_rounds, results["round"].max()
+    )
+    n_chunks = min(max_workers or os.cpu_count() or 1, len(split_points))
+    chunks = [c for c in np.array_split(split_points, n_chunks) if len(c)]
+    logger.info(f"Searching {len(grid)} xi candidates over {len(split_points)} splits")
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        parts = list(pool.map(score_chunk, repeat(results), chunks, repeat(grid)))
+
+    loglikelihood = np.sum([p[0] for p in parts], axis=0)
+    fit_time = np.sum([p[1] for p in parts], axis=0)
+    n_fits = np.sum([p[2] for p in parts], axis=0)
+    n_fixtures = np.sum([p[3] for p in parts], axis=0)
+
+    candidates = [
+        XiCandidate(
+            xi=xi,
+            loglikelihood=float(loglikelihood[i]),
+            mean_loglikelihood=float(loglikelihood[i] / max(n_fixtures[i], 1)),
+            n_fits=int(n_fits[i]),
+            n_fixtures=int(n_fixtures[i]),
+            fit_time=float(fit_time[i]),
+        )
+        for i, xi in enumerate(grid)
+    ]
+    for candidate in candidates:
+        logger.info(f"Candidate {candidate}")
+    return candidates
+
+
+def score_chunk(
+    results: BacktestResults,
+    split_points: npt.NDArray[np.int_],
+    grid: tuple[float, ...],
+) -> tuple[FloatArray, FloatArray, npt.NDArray[np.int_], npt.NDArray[np.int_]]:
+    """Fit every candidate at each split point and score the following round.
+
+    Returns the summed predictive log-likelihood, fit time, number of converged fits
+    and number of fixtures scored per candidate.
+    """
+    rounds = results["round"]
+    loglikelihood = np.zeros(len(grid))
+    fit_time = np.zeros(len(grid))
+    n_fits = np.zeros(len(grid), dtype=int)
+    n_fixtures = np.zeros(len(grid), dtype=int)
+    model: ForecastModel | None = None
+
+    for split in split_points:
+        test = rounds == split + 1
+        for i, xi in enumerate(grid):
+            start = time.perf_counter()
+            try:
+                if model is None:
+                    model = fit_to_split(DixonColesModel, results, split, xi=xi)
+                elif i == 0:
+                    model.set_xi(xi)
+                    model.advance(
+                        **{k: results[k][rounds == split] for k in TRAIN_KEYS}
+                    )
+                else:
+                    model.set_xi(xi)
+                    model.fit()
+                n_fits[i] += 1
+            except ValueError as e:
+                # Rebuild from every round up to the split for the next fit, as a
+                # failed fit leaves the model unfitted or missing the rounds it failed on
+                logger.warning(f"Fit failed for xi={xi:g} at split {split}: {e}")
+                model = None
+                continue
+            finally:
+                fit_time[i] += time.perf_counter() - start
+
+            # A candidate is only scored on the splits where its own fit converged
+            loglikelihood[i] += model.loglikelihood_many(
+                home_teams=results["home_team"][test],
+                away_teams=results["away_team"][test],
+                home_goals=results["home_goals"][test],
+                away_goals=results["away_goals"][test],
+            ).sum()
+            n_fixtures[i] += int(test.sum())
+
+    return loglikelihood, fit_time, n_fits, n_fixtures
+
+
+def tune_xi(
+    seasons: list[str] | None = None,
+    grid: tuple[float, ...] = XI_GRID,
+    max_workers: int | None = None,
+) -> XiCandidate:
+    """Search the xi grid over the historical results and return the best candidate."""
+    with get_session() as session:
+        results = get_backtest_results(
+            session=session, seasons=seasons or config.SEASONS
+        )
+
+    candidates = search_xi(results, grid=grid, max_workers=max_workers)
+    best = max(candidates, key=lambda c: c.mean_loglikelihood)
+    logger.info(f"Best time decay: {best}")
+    return best
+
+
+if __name__ == "__main__":
+    tune_xi()
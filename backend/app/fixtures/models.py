@@ -1,6 +1,7 @@
+import datetime as dt
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.core import Base
@@ -20,12 +21,15 @@ class Fixture(Base):
     __table_args__ = (
         UniqueConstraint("home_team_id", "date", name="uix_home_team_date"),
         UniqueConstraint("away_team_id", "date", name="uix_away_team_date"),
+        Index("ix_fixture_season_gameweek_date", "season", "gameweek", "date"),
     )
 
     fixture_id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True
     )
-    date: Mapped[str] = mapped_column(String(100), nullable=True)
+    date: Mapped[dt.datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
     season: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     gameweek: Mapped[int] = mapped_column(Integer, nullable=True, index=True)
     home_team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), nullable=False)
@@ -40,8 +44,8 @@ class Fixture(Base):
     result: Mapped["Result"] = relationship(
         "Result", uselist=False, back_populates="fixture"
     )
-    forecast: Mapped["FixtureForecast"] = relationship(
-        "FixtureForecast", uselist=False, back_populates="fixture"
+    forecasts: Mapped[list["FixtureForecast"]] = relationship(
+        "FixtureForecast", back_populates="fixture"
     )
 
     def __str__(self) -> str:
@@ -51,14 +55,14 @@ class Fixture(Base):
 class FixtureQuery(BaseQuery):
     season: Season | None = None
     gameweek: int | None = NullGameweek
-    date: str | None = None
+    date: dt.date | None = None
     team_id: int | None = None
     sort_by: str | None = "date"
     sort_desc: bool = False
 
 
 class FixtureCreate(KolModel):
-    date: str | None = None
+    date: dt.datetime | None = None
     season: Season
     gameweek: int | None = NullGameweek
     home_team_id: int
@@ -66,13 +70,13 @@ class FixtureCreate(KolModel):
 
 
 class FixtureUpdate(KolModel):
-    date: str | None = None
+    date: dt.datetime | None = None
     gameweek: int | None = NullGameweek
 
 
 class FixtureRead(KolModel):
     fixture_id: int
-    date: str | None
+    date: dt.datetime | None
     gameweek: int | None
     season: str
     home_team: TeamRead
@@ -1,26 +1,68 @@
+import datetime as dt
+from collections.abc import Sequence
 from typing import Any
 
-from sqlalchemy import or_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Row, or_, select
+from sqlalchemy.orm import Session
 
 from app.database.utils import sort_and_paginate
-from app.fixtures.models import Fixture, FixtureCreate, FixtureQuery, FixtureUpdate
-from app.teams.models import Team
+from app.fixtures.models import (
+    Fixture,
+    FixtureCreate,
+    FixtureQuery,
+    FixtureRead,
+    FixtureUpdate,
+)
+from app.results.models import Result, ResultRead
+from app.teams.cache import team_cache
 from app.teams.service import get_team_from_season_id
 
+# Columns of a fixtures listing, with teams by id to be read from the team cache
+FIXTURE_COLUMNS = (
+    Fixture.fixture_id,
+    Fixture.date,
+    Fixture.gameweek,
+    Fixture.season,
+    Fixture.home_team_id,
+    Fixture.away_team_id,
+    Result.home_score,
+    Result.away_score,
+    Result.home_xg,
+    Result.away_xg,
+)
+
+
+def fixture_row_to_read(row: Row[Any], session: Session) -> FixtureRead:
+    """A fixtures listing row as `FixtureRead`, built without re-validating columns."""
+    return FixtureRead.model_construct(
+        fixture_id=row.fixture_id,
+        date=row.date,
+        gameweek=row.gameweek,
+        season=row.season,
+        home_team=team_cache.get(session, row.home_team_id),
+        away_team=team_cache.get(session, row.away_team_id),
+        result=None
+        if row.home_score is None
+        else ResultRead.model_construct(
+            home_score=row.home_score,
+            away_score=row.away_score,
+            home_xg=row.home_xg,
+            away_xg=row.away_xg,
+        ),
+    )
+
 
 def get_fixtures_query(*, session: Session, query_in: FixtureQuery) -> dict[str, Any]:
-    query = session.query(Fixture).options(
-        joinedload(Fixture.home_team),
-        joinedload(Fixture.away_team),
-        joinedload(Fixture.result),
+    # Plain column rows, without eager joins to teams, so pages need no subquery
+    query = session.query(*FIXTURE_COLUMNS).outerjoin(
+        Result, Result.fixture_id == Fixture.fixture_id
     )
 
     if query_in.season:
-        query = query.filter_by(season=query_in.season)
+        query = query.filter(Fixture.season == query_in.season)
 
     if query_in.gameweek:
-        query = query.filter_by(gameweek=query_in.gameweek)
+        query = query.filter(Fixture.gameweek == query_in.gameweek)
 
     if query_in.team_id:
         query = query.filter(
@@ -31,13 +73,19 @@ def get_fixtures_query(*, session: Session, query_in: FixtureQuery) -> dict[str,
         )
 
     if query_in.date:
-        query = query.filter_by(date=query_in.date)
+        # Kick-offs on the day, as a range so the date index is used
+        start = dt.datetime.combine(query_in.date, dt.time(), tzinfo=dt.timezone.utc)
+        query = query.filter(
+            Fixture.date >= start, Fixture.date < start + dt.timedelta(days=1)
+        )
 
-    return sort_and_paginate(
+    page = sort_and_paginate(
         query=query,
         table=Fixture,
         query_in=query_in,
     )
+    page["items"] = [fixture_row_to_read(row, session) for row in page["items"]]
+    return page
 
 
 def get_fixture(
@@ -47,7 +95,7 @@ def get_fixture(
     season: str,
     gameweek: int,
     was_home: bool | None,
-    other_team: str | None,
+    other_team: str | int | None,
 ) -> Fixture:
     if isinstance(team, int):
         team = get_team_from_season_id(
@@ -65,7 +113,7 @@ def get_fixture(
         query = query.filter(or_(Fixture.away_team == team, Fixture.home_team == team))
 
     if other_team:
-        if isinstance(other_team, str):
+        if isinstance(other_team, int):
             other_team = get_team_from_season_id(
                 session=session, season=season, team_id=other_team
             ).name
@@ -94,15 +142,21 @@ def get_fixture(
     return fixtures[0]
 
 
-def get_seasons_fixtures(*, session: Session, season: str) -> list[Fixture]:
-    # TODO: Do we need results here? Limit the scope to just id, teams and date?
+def get_seasons_fixtures(
+    *, session: Session, season: str
+) -> Sequence[tuple[int, dt.datetime | None, int, int]]:
+    """Ids, kick-offs and team ids of a season's fixtures, with teams to be read
+    from the team cache."""
     return (
-        session.query(Fixture)
-        .options(
-            joinedload(Fixture.home_team).load_only(Team.name),
-            joinedload(Fixture.away_team).load_only(Team.name),
+        session.execute(
+            select(
+                Fixture.fixture_id,
+                Fixture.date,
+                Fixture.home_team_id,
+                Fixture.away_team_id,
+            ).where(Fixture.season == season)
         )
-        .filter_by(season=season)
+        .tuples()
         .all()
     )
 
@@ -8,6 +8,7 @@ from app.config import config
 from app.enums import Environment
 from app.exceptions import add_exception_handlers
 from app.fixtures.api import router as fixtures_router
+from app.fixtures.forecasts.api import router as forecasts_router
 from app.middleware import DbSessionMiddleware, ProcessTimeMiddleware
 from app.seasons.api import router as seasons_router
 from app.sentry import configure_sentry
@@ -43,6 +44,7 @@ app.add_middleware(DbSessionMiddleware)
 
 # API routes
 api_router = APIRouter()
+api_router.include_router(forecasts_router)
 api_router.include_router(fixtures_router)
 api_router.include_router(teams_router)
 api_router.include_router(seasons_router)
@@ -1,5 +1,10 @@
+from typing import Literal, TypeAlias
+
 from pydantic import BaseModel, ConfigDict, Field
 
+# Offset pages by number, keyset pages continue after a cursor
+PaginationMode: TypeAlias = Literal["offset", "keyset"]
+
 
 class KolModel(BaseModel):
     model_config = ConfigDict(
@@ -15,6 +20,8 @@ class BaseQuery(KolModel):
     sort_desc: bool = True
     page: int = Field(default=0, ge=0)
     page_size: int = Field(default=10, ge=1)
+    pagination: PaginationMode = "offset"
+    cursor: str | None = None
 
 
 class Pagination(KolModel):
@@ -22,6 +29,7 @@ class Pagination(KolModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: str | None = None
 
 
 class Message(BaseModel):
@@ -8,22 +8,33 @@ from app.database.core import get_session
 from app.fixtures.service import get_seasons_fixtures
 from app.logger import logger
 from app.results.models import Result
+from app.teams.cache import team_cache
 
 FixtureMap: TypeAlias = dict[tuple[str, str], int]
 
+XG_COLUMNS = ("home_xg", "away_xg")
+
 
 def read_results_data(
     filepath: str, fixture_id_map: FixtureMap
-) -> Generator[dict[str, int], None, None]:
-    """Read raw result data from csv file."""
+) -> Generator[dict[str, int | float | None], None, None]:
+    """Read raw result data from csv file.
+
+    Expected goals are read from the optional `home_xg` and `away_xg` columns.
+    """
     with open(filepath) as f:
-        next(f)
+        header = next(f).strip().split(",")
+        has_xg = all(column in header for column in XG_COLUMNS)
+        xg_columns = [header.index(c) for c in XG_COLUMNS] if has_xg else []
         for row in f:
             fields = row.strip().split(",")
+            xg = [fields[i] for i in xg_columns] or ["", ""]
             yield {
                 "fixture_id": fixture_id_map[(fields[1], fields[2])],
                 "home_score": int(fields[3]),
                 "away_score": int(fields[4]),
+                "home_xg": float(xg[0]) if xg[0] else None,
+                "away_xg": float(xg[1]) if xg[1] else None,
             }
 
 
@@ -44,7 +55,11 @@ def make_results_table(seasons: list[str], session: Session) -> None:
         logger.info(f"Filling {season} season")
         season_fixtures = get_seasons_fixtures(session=session, season=season)
         fixture_id_map: FixtureMap = {
-            (f.home_team.name, f.away_team.name): f.fixture_id for f in season_fixtures
+            (
+                team_cache.get(session, home_team_id).name,
+                team_cache.get(session, away_team_id).name,
+            ): fixture_id
+            for fixture_id, _, home_team_id, away_team_id in season_fixtures
         }
         fill_results_table_from_file(
             session=session, season=season, fixture_id_map=fixture_id_map
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer
+from sqlalchemy import Float, ForeignKey, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.core import Base
@@ -21,6 +21,8 @@ class Result(Base):
     )
     home_score: Mapped[int] = mapped_column(Integer, nullable=False)
     away_score: Mapped[int] = mapped_column(Integer, nullable=False)
+    home_xg: Mapped[float | None] = mapped_column(Float, nullable=True)
+    away_xg: Mapped[float | None] = mapped_column(Float, nullable=True)
 
     fixture: Mapped["Fixture"] = relationship(
         "Fixture", uselist=False, back_populates="result"
@@ -37,3 +39,5 @@ class Result(Base):
 class ResultRead(KolModel):
     home_score: int
     away_score: int
+    home_xg: float | None = None
+    away_xg: float | None = None
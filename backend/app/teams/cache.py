@@ -0,0 +1,192 @@
+"""In-process cache of the teams and their season ids, which rarely change once
+filled."""
+
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Hashable
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from sqlalchemy import Connection, event, func, select
+from sqlalchemy.orm import Session
+
+from app.database.core import engine
+from app.teams.models import SeasonTeam, Team, TeamRead
+
+# Seconds before the cached version is checked against the database, which bounds
+# how stale the teams can be when written by another process, such as the fill scripts
+TEAM_CACHE_TTL = 600.0
+
+# Tables the cache is built from, whose writes invalidate it
+REFERENCE_TABLES = (Team.__tablename__, SeasonTeam.__tablename__)
+
+# Connection info key flagging a transaction that wrote teams
+WROTE_TEAMS = "wrote_teams"
+
+
+def get_reference_version(session: Session) -> tuple[int, ...]:
+    """Row counts and largest ids of the teams tables, which change on any fill."""
+    return tuple(
+        value
+        for table in (Team, SeasonTeam)
+        for value in session.execute(
+            select(func.count(), func.coalesce(func.max(table.id), 0))
+        ).one()
+    )
+
+
+@dataclass(frozen=True)
+class TeamIndex:
+    """A snapshot of the teams and their season ids, indexed for constant time
+    lookups."""
+
+    by_id: dict[int, TeamRead]
+    by_name: dict[str, TeamRead]
+    by_tricode: dict[str, TeamRead]
+    by_season_id: dict[tuple[str, int], TeamRead]
+    by_season: dict[str, tuple[TeamRead, ...]]
+    version: tuple[int, ...]
+    checked_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def load(cls, session: Session) -> "TeamIndex":
+        version = get_reference_version(session)
+        teams = [
+            TeamRead.model_validate(row)
+            for row in session.execute(
+                select(Team.id, Team.tricode, Team.name, Team.short_name)
+            )
+        ]
+        by_id = {team.id: team for team in teams}
+        by_season_id = {
+            (row.season, row.season_team_id): by_id[row.team_id]
+            for row in session.execute(
+                select(
+                    SeasonTeam.season, SeasonTeam.season_team_id, SeasonTeam.team_id
+                ).order_by(SeasonTeam.season, SeasonTeam.season_team_id)
+            )
+        }
+        by_season: defaultdict[str, list[TeamRead]] = defaultdict(list)
+        for (season, _), team in by_season_id.items():
+            by_season[season].append(team)
+        return cls(
+            by_id=by_id,
+            by_name={team.name: team for team in teams},
+            by_tricode={team.tricode: team for team in teams},
+            by_season_id=by_season_id,
+            by_season={season: tuple(ts) for season, ts in by_season.items()},
+            version=version,
+        )
+
+
+class TeamCache:
+    """The teams and their season ids, loaded once and shared by every request and
+    fill script of the process.
+
+    Writes through this process's engine drop the cache. Once the TTL passes, the
+    version of the tables is checked and the cache is reloaded only if it changed.
+    """
+
+    def __init__(self, ttl: float = TEAM_CACHE_TTL) -> None:
+        self.ttl = ttl
+        self._index: TeamIndex | None = None
+        self._lock = threading.Lock()
+        # Bumped on invalidation, so loads that raced a write are not cached
+        self._generation = 0
+
+    def index(self, session: Session) -> TeamIndex:
+        """The cached teams, loaded with `session` when missing or out of date."""
+        with self._lock:
+            index = self._index
+            if index is not None and time.monotonic() - index.checked_at < self.ttl:
+                return index
+            generation = self._generation
+        return self._refresh(session, index, generation)
+
+    def get(self, session: Session, team_id: int) -> TeamRead:
+        """A team by id."""
+        return self._lookup(
+            session, "by_id", team_id, f"'{team_id}' is not a valid team"
+        )
+
+    def get_by_name(self, session: Session, name: str) -> TeamRead:
+        """A team by full name."""
+        return self._lookup(session, "by_name", name, f"'{name}' is not a valid team")
+
+    def get_by_tricode(self, session: Session, tricode: str) -> TeamRead:
+        """A team by three letter code."""
+        return self._lookup(
+            session, "by_tricode", tricode, f"'{tricode}' is not a valid team"
+        )
+
+    def get_by_season_id(
+        self, session: Session, season: str, season_team_id: int
+    ) -> TeamRead:
+        """A team by its id within a season."""
+        return self._lookup(
+            session,
+            "by_season_id",
+            (season, season_team_id),
+            f"'{season_team_id}' is not a valid team for the {season} season",
+        )
+
+    def season_teams(self, session: Session, season: str) -> tuple[TeamRead, ...]:
+        """The teams of a season, by their season ids."""
+        return self.index(session).by_season.get(season, ())
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._index = None
+
+    def _lookup(
+        self, session: Session, by: str, key: Hashable, message: str
+    ) -> TeamRead:
+        """Look up a key, checking the version once on a miss in case it was added
+        by another process."""
+        index = self.index(session)
+        team = getattr(index, by).get(key)
+        if team is None:
+            with self._lock:
+                generation = self._generation
+            team = getattr(self._refresh(session, index, generation), by).get(key)
+        if team is None:
+            raise ValueError(message)
+        return team  # type: ignore[no-any-return]
+
+    def _refresh(
+        self, session: Session, index: TeamIndex | None, generation: int
+    ) -> TeamIndex:
+        """Keep `index` if the tables are unchanged since it was loaded, else reload."""
+        if index is not None and get_reference_version(session) == index.version:
+            index = replace(index, checked_at=time.monotonic())
+        else:
+            index = TeamIndex.load(session)
+        with self._lock:
+            if generation == self._generation:
+                self._index = index
+        return index
+
+
+team_cache = TeamCache()
+
+
+@event.listens_for(engine, "after_execute")
+def invalidate_written_teams(conn: Connection, clauseelement: Any, *_: Any) -> None:
+    """Drop the cached teams when an insert, update or delete writes them.
+
+    They are dropped again when the transaction ends, in case they were reloaded
+    before the write was committed or rolled back.
+    """
+    is_dml = getattr(clauseelement, "is_dml", False)
+    if is_dml and clauseelement.table.name in REFERENCE_TABLES:
+        conn.info[WROTE_TEAMS] = True
+        team_cache.invalidate()
+
+
+@event.listens_for(engine, "commit")
+@event.listens_for(engine, "rollback")
+def invalidate_transaction_teams(conn: Connection) -> None:
+    if conn.info.pop(WROTE_TEAMS, False):
+        team_cache.invalidate()
@@ -1,4 +1,3 @@
-from functools import lru_cache
 from typing import TypeAlias
 
 from sqlalchemy.orm import Session
@@ -6,16 +5,18 @@ from sqlalchemy.orm import Session
 from app.config import config
 from app.database.core import get_session
 from app.logger import logger
+from app.teams.cache import team_cache
 from app.teams.models import SeasonTeam, Team
 
 TeamsToAdd: TypeAlias = list[dict[str, str | int]]
 
 
-@lru_cache(maxsize=1)
 def get_existing_team_tricodes(session: Session) -> dict[str, int]:
-    """Get existing team tricodes from the database."""
-    teams = session.query(Team.tricode, Team.id).distinct().all()
-    return {t.tricode: t.id for t in teams}
+    """Get existing team tricodes from the team cache, reloaded after teams are added."""
+    return {
+        tricode: team.id
+        for tricode, team in team_cache.index(session).by_tricode.items()
+    }
 
 
 def make_teams_table(seasons: list[str], session: Session) -> TeamsToAdd:
@@ -1,39 +1,19 @@
-from collections.abc import Sequence
-from functools import lru_cache
-
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.teams.models import SeasonTeam, Team
+from app.teams.cache import team_cache
+from app.teams.models import TeamRead
 
 
-@lru_cache(maxsize=20)
-def get_team_from_season_id(*, session: Session, season: str, team_id: int) -> Team:
+def get_team_from_season_id(*, session: Session, season: str, team_id: int) -> TeamRead:
     """Get a team for a specific season by team_id."""
-    season_team = (
-        session.query(SeasonTeam)
-        .filter(SeasonTeam.season_team_id == team_id, SeasonTeam.season == season)
-        .first()
-    )
-
-    if not season_team:
-        raise ValueError(f"'{team_id}' is not a valid team for the {season} season")
-
-    return season_team.team
+    return team_cache.get_by_season_id(session, season, team_id)
 
 
-def get_team_from_name(*, session: Session, team_name: str) -> Team:
+def get_team_from_name(*, session: Session, team_name: str) -> TeamRead:
     """Get a team for a specific season by team_name."""
-    team = session.query(Team).filter(Team.name == team_name).first()
-    if not team:
-        raise ValueError(f"'{team_name}' is not a valid team")
-    return team
+    return team_cache.get_by_name(session, team_name)
 
 
-def get_seasons_teams(*, session: Session, season: str) -> Sequence[Team]:
+def get_seasons_teams(*, session: Session, season: str) -> tuple[TeamRead, ...]:
     """Get all teams for a specific season."""
-    return session.scalars(
-        select(Team)
-        .join(SeasonTeam, SeasonTeam.team_id == Team.id)
-        .where(SeasonTeam.season == season)
-    ).all()
+    return team_cache.season_teams(session, season)
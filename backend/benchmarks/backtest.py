@@ -0,0 +1,41 @@
+"""Benchmark the walk-forward backtest over a synthetic nine-season history.
+
+Run from the backend directory with `python -m benchmarks.backtest`.
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from app.fixtures.forecasts.backtest import score_forecasts, sort_results, walk_forward
+from app.logger import logger
+from benchmarks.data import FIXTURES_PER_GAMEWEEK, make_league
+
+
+def benchmark_backtest(n_seasons: int = 9) -> None:
+    """Time the walk-forward backtest with one and with all worker processes."""
+    league = make_league(n_seasons=n_seasons)
+    n_fixtures = len(league["home_goals"])
+    rounds = np.arange(n_fixtures) // FIXTURES_PER_GAMEWEEK
+    results = sort_results(
+        {
+            "fixture_id": np.arange(n_fixtures),
+            "round": rounds,
+            **league,
+        }
+    )
+    logger.setLevel(logging.WARNING)
+
+    for max_workers in (1, None):
+        start = time.perf_counter()
+        forecasts = walk_forward(results, max_workers=max_workers)
+        elapsed = time.perf_counter() - start
+        print(
+            f"max_workers={max_workers}: {elapsed:6.1f}s for "
+            f"{len(np.unique(forecasts['split']))} splits ({score_forecasts(forecasts)})"
+        )
+
+
+if __name__ == "__main__":
+    benchmark_backtest()
@@ -0,0 +1,54 @@
+"""Benchmark the block bootstrap against cold refits, and its gameweek intervals.
+
+Run from the backend directory with `python -m benchmarks.bootstrap`.
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from app.fixtures.forecasts.bootstrap import block_bootstrap
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.logger import logger
+from benchmarks.data import FIXTURES_PER_GAMEWEEK, make_league
+
+
+def benchmark_bootstrap(n_seasons: int = 3, n_replicates: int = 200) -> None:
+    """Time warm-started replicates and vectorised intervals for one gameweek."""
+    league = make_league(n_seasons=n_seasons)
+    model = DixonColesModel(**league)  # type: ignore[arg-type]
+    model.fit()
+    logger.setLevel(logging.WARNING)
+
+    start = time.perf_counter()
+    for _ in range(10):
+        DixonColesModel(**league).fit()  # type: ignore[arg-type]
+    cold = (time.perf_counter() - start) / 10
+
+    for max_workers in (1, None):
+        start = time.perf_counter()
+        replicates = block_bootstrap(
+            model, n_replicates=n_replicates, seed=0, max_workers=max_workers
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"max_workers={max_workers}: {n_replicates} replicates in {elapsed:.2f}s "
+            f"({elapsed / n_replicates * 1000:.1f}ms each, cold fit {cold * 1000:.1f}ms)"
+        )
+
+    home_teams = league["home_team"][-FIXTURES_PER_GAMEWEEK:]
+    away_teams = league["away_team"][-FIXTURES_PER_GAMEWEEK:]
+    start = time.perf_counter()
+    replicates.predict_intervals(home_teams, away_teams)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Gameweek intervals over {len(replicates)} replicates in "
+        f"{elapsed * 1000:.1f}ms ({replicates.params.nbytes / 1024:.0f}KiB of "
+        f"replicates, n_failed={replicates.n_failed}, "
+        f"max se {np.max(replicates.standard_errors()):.3f})"
+    )
+
+
+if __name__ == "__main__":
+    benchmark_bootstrap()
@@ -0,0 +1,70 @@
+"""Benchmark the rolling expected goals covariates and the covariate model fit.
+
+Run from the backend directory with `python -m benchmarks.covariates`.
+"""
+
+import time
+
+import numpy as np
+
+from app.fixtures.forecasts.covariates import XG_COVARIATES, rolling_xg
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from benchmarks.data import make_league
+
+N_REPEATS = 3
+
+
+def synthetic_xg(goals: np.ndarray, seed: int = 0) -> np.ndarray:
+    """Noisy expected goals centred on the scored goals."""
+    rng = np.random.default_rng(seed)
+    return rng.gamma(4, (goals + 0.5) / 4)  # type: ignore[no-any-return]
+
+
+def benchmark_covariates(n_seasons: int = 9) -> None:
+    """Time the rolling xG features and fits with and without them."""
+    league = make_league(n_seasons=n_seasons)
+    home_xg = synthetic_xg(league["home_goals"], seed=1)  # type: ignore[arg-type]
+    away_xg = synthetic_xg(league["away_goals"], seed=2)  # type: ignore[arg-type]
+    print(f"Fixtures: {len(home_xg)}")
+
+    start = time.perf_counter()
+    for _ in range(N_REPEATS):
+        xg = rolling_xg(
+            home_team=league["home_team"],  # type: ignore[arg-type]
+            away_team=league["away_team"],  # type: ignore[arg-type]
+            home_xg=home_xg,
+            away_xg=away_xg,
+            date=league["date"],  # type: ignore[arg-type]
+        )
+        home_x, away_x = xg.design()
+    elapsed = (time.perf_counter() - start) / N_REPEATS
+    print(f"Rolling xG and design matrices: {elapsed * 1000:8.1f}ms")
+
+    for name, covariates in (
+        ("no covariates", {}),
+        (
+            "rolling xG",
+            {
+                "home_covariates": home_x,
+                "away_covariates": away_x,
+                "covariate_names": XG_COVARIATES,
+            },
+        ),
+    ):
+        fits = []
+        for seed in range(N_REPEATS):
+            np.random.seed(seed)
+            model = DixonColesModel(**league, **covariates)  # type: ignore[arg-type]
+            start = time.perf_counter()
+            model.fit()
+            fits.append(time.perf_counter() - start)
+        print(
+            f"{name:<16} cells {len(model.stats):6d}  "
+            f"fit {np.median(fits) * 1000:8.1f}ms  "
+            f"loglikelihood={model.loglikelihood:.3f}  "
+            f"coefficients={np.round(model.coefficients, 3)}"
+        )
+
+
+if __name__ == "__main__":
+    benchmark_covariates()
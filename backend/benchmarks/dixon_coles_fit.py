@@ -0,0 +1,67 @@
+"""Benchmark Dixon-Coles fitting with finite-difference vs analytic derivatives, and
+a warm-started gameweek advance against a full refit.
+
+Run from the backend directory with `python -m benchmarks.dixon_coles_fit`.
+"""
+
+import time
+
+import numpy as np
+
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from benchmarks.data import FIXTURES_PER_GAMEWEEK, make_league
+
+N_REPEATS = 3
+FIT_OPTIONS = {
+    "finite-difference": {"jac": False},
+    "analytic gradient": {"jac": True},
+    "trust-region (exact hessian)": {"hess": True},
+}
+
+
+def benchmark_fit(n_seasons: int = 9) -> None:
+    """Time a full model fit for each derivative option."""
+    league = make_league(n_seasons=n_seasons)
+    print(f"Fixtures: {len(league['home_goals'])}")
+    for name, options in FIT_OPTIONS.items():
+        timings, nfev, llk = [], 0, 0.0
+        for seed in range(N_REPEATS):
+            np.random.seed(seed)
+            model = DixonColesModel(**league)  # type: ignore[arg-type]
+            start = time.perf_counter()
+            model.fit(**options)
+            timings.append(time.perf_counter() - start)
+            nfev, llk = model._res["nfev"], model.loglikelihood  # type: ignore[index]
+        print(
+            f"{name:<30} {np.median(timings) * 1000:8.1f}ms  "
+            f"nfev={nfev:<6} loglikelihood={llk:.3f}"
+        )
+
+
+def benchmark_advance(n_seasons: int = 9) -> None:
+    """Time advancing a fitted model by one gameweek against a cold refit."""
+    league = make_league(n_seasons=n_seasons)
+    n_train = len(league["home_goals"]) - FIXTURES_PER_GAMEWEEK
+    history = {k: v[:n_train] for k, v in league.items()}
+    gameweek = {k: v[n_train:] for k, v in league.items()}
+
+    np.random.seed(0)
+    model = DixonColesModel(**history)  # type: ignore[arg-type]
+    model.fit()
+    start = time.perf_counter()
+    model.advance(**gameweek)  # type: ignore[arg-type]
+    advance = time.perf_counter() - start
+    print(
+        f"{'advance (warm start)':<30} {advance * 1000:8.1f}ms  nit={model._res['nit']}"
+    )  # type: ignore[index]
+
+    model = DixonColesModel(**league)  # type: ignore[arg-type]
+    start = time.perf_counter()
+    model.fit()
+    refit = time.perf_counter() - start
+    print(f"{'full refit':<30} {refit * 1000:8.1f}ms  nit={model._res['nit']}")  # type: ignore[index]
+
+
+if __name__ == "__main__":
+    benchmark_fit()
+    benchmark_advance()
@@ -0,0 +1,51 @@
+"""Benchmark a single Dixon-Coles objective evaluation: NumPy path vs fused kernel.
+
+Run from the backend directory with `python -m benchmarks.dixon_coles_kernel`.
+"""
+
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from benchmarks.data import make_league
+
+N_CALLS = 1000
+
+
+def peak_allocation(func: Callable[[], Any]) -> int:
+    """Peak bytes traced by `tracemalloc` during a single call."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def benchmark_kernel(n_seasons: int = 9) -> None:
+    """Time and measure allocations per call of each objective implementation."""
+    model = DixonColesModel(**make_league(n_seasons=n_seasons))  # type: ignore[arg-type]
+    params = model._params
+    print(f"Fixtures: {len(model.data)}, cells: {len(model.stats)}")
+
+    candidates = {
+        "numpy objective": lambda: model._fit_step(params),
+        "numpy objective + gradient": lambda: (
+            model._fit_step(params),
+            model._fit_jac(params),
+        ),
+        "numba objective": lambda: model._fused_nll(params),
+        "numba objective + gradient": lambda: model._fused_step(params),
+    }
+    for name, func in candidates.items():
+        func()  # warm up the jit compilation
+        per_call = timeit.timeit(func, number=N_CALLS) / N_CALLS
+        print(
+            f"{name:<30} {per_call * 1e6:8.1f}us/call  "
+            f"peak alloc {peak_allocation(func) / 1024:8.1f}KiB"
+        )
+
+
+if __name__ == "__main__":
+    benchmark_kernel()
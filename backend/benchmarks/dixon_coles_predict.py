@@ -0,0 +1,41 @@
+"""Benchmark per-fixture `predict` against batched `predict_many`.
+
+Run from the backend directory with `python -m benchmarks.dixon_coles_predict`.
+"""
+
+import logging
+import time
+
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.logger import logger
+from benchmarks.data import make_league
+
+
+def benchmark_predict(n_seasons: int = 9) -> None:
+    """Time forecasting a season and the full history, one-by-one vs batched."""
+    league = make_league(n_seasons=n_seasons)
+    model = DixonColesModel(**league)  # type: ignore[arg-type]
+    model.fit()
+    logger.setLevel(logging.WARNING)
+
+    home_teams, away_teams = league["home_team"], league["away_team"]
+    model.predict_many(home_teams[:1], away_teams[:1])  # warm up the jit compilation
+    for n_fixtures in (380, len(home_teams)):
+        start = time.perf_counter()
+        for home, away in zip(
+            home_teams[:n_fixtures], away_teams[:n_fixtures], strict=True
+        ):
+            model.predict(home, away)
+        looped = time.perf_counter() - start
+
+        start = time.perf_counter()
+        model.predict_many(home_teams[:n_fixtures], away_teams[:n_fixtures])
+        batched = time.perf_counter() - start
+        print(
+            f"{n_fixtures:>5} fixtures: predict {looped * 1000:8.1f}ms  "
+            f"predict_many {batched * 1000:6.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    benchmark_predict()
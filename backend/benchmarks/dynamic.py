@@ -0,0 +1,77 @@
+"""Benchmark the dynamic model's per-gameweek filter update against refitting.
+
+Run from the backend directory with `python -m benchmarks.dynamic`.
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.fixtures.forecasts.dynamic import DynamicDixonColesModel
+from app.fixtures.forecasts.metrics import ForecastScores
+from app.logger import logger
+from benchmarks.data import FIXTURES_PER_GAMEWEEK, make_league
+
+FIXTURES_PER_SEASON = 380
+
+
+def benchmark_dynamic(n_seasons: int = 9, n_train_seasons: int = 3) -> None:
+    """Walk through the seasons after the first few a gameweek at a time.
+
+    Each gameweek is forecast before its results are added, by filtering the dynamic
+    model, by advancing the warm-started static model, and by a full static refit.
+    """
+    league = make_league(n_seasons=n_seasons)
+    n_train = n_train_seasons * FIXTURES_PER_SEASON
+    static = DixonColesModel(**{k: v[:n_train] for k, v in league.items()})  # type: ignore[arg-type]
+    static.fit()
+    logger.setLevel(logging.WARNING)
+    dynamic = DynamicDixonColesModel.from_static(static)
+
+    timings: dict[str, list[float]] = {"filter": [], "advance": [], "refit": []}
+    preds: dict[str, list[dict[str, np.ndarray]]] = {"filter": [], "advance": []}
+    for start in range(n_train, len(league["date"]), FIXTURES_PER_GAMEWEEK):
+        gameweek = {
+            k: v[start : start + FIXTURES_PER_GAMEWEEK] for k, v in league.items()
+        }
+        home_teams, away_teams = gameweek["home_team"], gameweek["away_team"]
+        preds["filter"].append(dynamic.predict_many(home_teams, away_teams))  # type: ignore[arg-type]
+        preds["advance"].append(static.predict_many(home_teams, away_teams))  # type: ignore[arg-type]
+
+        t0 = time.perf_counter()
+        dynamic.update(**gameweek)  # type: ignore[arg-type]
+        t1 = time.perf_counter()
+        static.advance(**gameweek)  # type: ignore[arg-type]
+        t2 = time.perf_counter()
+        timings["filter"].append(t1 - t0)
+        timings["advance"].append(t2 - t1)
+        if len(timings["refit"]) < 10:
+            history = {k: v[: start + FIXTURES_PER_GAMEWEEK] for k, v in league.items()}
+            t0 = time.perf_counter()
+            DixonColesModel(**history).fit()  # type: ignore[arg-type]
+            timings["refit"].append(time.perf_counter() - t0)
+
+    n_gameweeks = len(timings["filter"])
+    print(f"{n_gameweeks} gameweeks of {FIXTURES_PER_GAMEWEEK} results, 20 teams")
+    for name, times in timings.items():
+        print(f"{name:>8}: {np.mean(times) * 1000:7.2f}ms per gameweek")
+
+    test = {k: v[n_train:] for k, v in league.items()}
+    for name, batches in preds.items():
+        columns = {k: np.concatenate([b[k] for b in batches]) for k in batches[0]}
+        scores = ForecastScores.from_predictions(
+            home_win=columns["home_win"],
+            draw=columns["draw"],
+            away_win=columns["away_win"],
+            home_goals_for=columns["home_goals_for"],
+            away_goals_for=columns["away_goals_for"],
+            home_goals=test["home_goals"],  # type: ignore[arg-type]
+            away_goals=test["away_goals"],  # type: ignore[arg-type]
+        )
+        print(f"{name:>8}: {scores}")
+
+
+if __name__ == "__main__":
+    benchmark_dynamic()
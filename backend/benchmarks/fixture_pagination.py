@@ -0,0 +1,87 @@
+"""Benchmark the latency of a fixtures page against its depth.
+
+Compares offset pages that count the total on every request, as before, with offset
+pages reusing the cached total and with keyset pages, on an in-memory SQLite
+database.
+
+Run from the backend directory with `ENVIRONMENT=test python -m benchmarks.fixture_pagination`.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.database.core import Base, engine
+from app.database.utils import encode_cursor, totals_cache
+from app.fixtures.models import Fixture, FixtureQuery
+from app.fixtures.service import get_fixtures_query
+from app.logger import logger
+from benchmarks.train_loader import populate
+
+N_REPEATS = 20
+PAGE_SIZE = 20
+DEPTHS = (0, 10, 100, 250, 500)
+
+
+def cursor_at(session: Session, depth: int) -> str | None:
+    """Cursor of the row ending the page before `depth`, in keyset order."""
+    if depth == 0:
+        return None
+    row = (
+        session.query(Fixture.date, Fixture.fixture_id)
+        .order_by(Fixture.date.asc().nulls_last(), Fixture.fixture_id)
+        .offset(depth * PAGE_SIZE - 1)
+        .first()
+    )
+    return encode_cursor(list(row))  # type: ignore[arg-type]
+
+
+def measure(serve: Callable[[], object]) -> float:
+    """Median time of serving a page, in milliseconds."""
+    times = []
+    for _ in range(N_REPEATS):
+        start = time.perf_counter()
+        serve()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+
+def benchmark_fixture_pagination(n_seasons: int = 30) -> None:
+    """Time a page at increasing depths in each pagination mode."""
+    logger.setLevel(logging.WARNING)
+    Base.metadata.create_all(bind=engine)
+    with Session(bind=engine) as session:
+        populate(session, n_seasons=n_seasons)
+        n_fixtures = session.query(Fixture).count()
+        print(f"{n_fixtures} fixtures, {PAGE_SIZE} per page")
+        print(f"{'page':>6} {'offset+count':>14} {'offset':>10} {'keyset':>10}")
+        for depth in DEPTHS:
+            offset = FixtureQuery(sort_by="date", page=depth, page_size=PAGE_SIZE)
+            keyset = FixtureQuery(
+                sort_by="date",
+                page_size=PAGE_SIZE,
+                pagination="keyset",
+                cursor=cursor_at(session, depth),
+            )
+
+            def uncached(query_in: FixtureQuery = offset) -> object:
+                totals_cache.invalidate()
+                return get_fixtures_query(session=session, query_in=query_in)
+
+            timings = [
+                measure(serve)
+                for serve in (
+                    uncached,
+                    lambda q=offset: get_fixtures_query(session=session, query_in=q),
+                    lambda q=keyset: get_fixtures_query(session=session, query_in=q),
+                )
+            ]
+            print(f"{depth:>6} " + " ".join(f"{t:>10.2f}ms" for t in timings))
+        session.rollback()
+
+
+if __name__ == "__main__":
+    benchmark_fixture_pagination()
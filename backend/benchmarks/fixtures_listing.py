@@ -0,0 +1,83 @@
+"""Benchmark listing fixtures from the database into a serialized page.
+
+Compares the lean column projection, with teams from the team cache, with the
+previous path eager loading ORM teams and results through three outer joins, on an
+in-memory SQLite database.
+
+Run from the backend directory with `ENVIRONMENT=test python -m benchmarks.fixtures_listing`.
+"""
+
+import logging
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+from sqlalchemy.orm import Session, joinedload
+
+from app.database.core import Base, engine
+from app.database.utils import sort_and_paginate
+from app.fixtures.models import Fixture, FixtureQuery, FixtureReadPagination
+from app.fixtures.service import get_fixtures_query
+from app.logger import logger
+from benchmarks.train_loader import populate
+
+N_REPEATS = 10
+PAGE_SIZES = (20, 380, 2_000)
+
+
+def orm_fixtures_query(*, session: Session, query_in: FixtureQuery) -> dict[str, Any]:
+    """The previous listing: ORM fixtures with joined teams and results."""
+    query = session.query(Fixture).options(
+        joinedload(Fixture.home_team),
+        joinedload(Fixture.away_team),
+        joinedload(Fixture.result),
+    )
+    return sort_and_paginate(query=query, table=Fixture, query_in=query_in)
+
+
+def measure(serve: Callable[[], Any]) -> tuple[float, float]:
+    """Median wall time and peak traced allocation of serving a page."""
+    times = []
+    for _ in range(N_REPEATS):
+        start = time.perf_counter()
+        serve()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    serve()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(np.median(times)), peak / 2**20
+
+
+def benchmark_fixtures_listing(n_seasons: int = 30) -> None:
+    """Time and profile both listings, validated and serialized as the API does."""
+    logger.setLevel(logging.WARNING)
+    Base.metadata.create_all(bind=engine)
+    with Session(bind=engine) as session:
+        populate(session, n_seasons=n_seasons)
+        for page_size in PAGE_SIZES:
+            query_in = FixtureQuery(sort_by="date", page=1, page_size=page_size)
+            for name, listing in (
+                ("orm", orm_fixtures_query),
+                ("lean", get_fixtures_query),
+            ):
+
+                def serve(
+                    listing: Callable[..., Any] = listing,
+                    query_in: FixtureQuery = query_in,
+                ) -> str:
+                    page = listing(session=session, query_in=query_in)
+                    return FixtureReadPagination.model_validate(page).model_dump_json()
+
+                elapsed, peak = measure(serve)
+                print(
+                    f"{name:<5} {page_size:>5} rows  {elapsed * 1000:8.2f}ms  "
+                    f"{page_size / elapsed:10.0f} rows/s  peak {peak:6.2f}MiB"
+                )
+        session.rollback()
+
+
+if __name__ == "__main__":
+    benchmark_fixtures_listing()
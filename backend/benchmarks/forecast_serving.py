@@ -0,0 +1,106 @@
+"""Benchmark serving a gameweek's fixture forecasts.
+
+Compares the cached, pre-serialized response with querying and serializing the
+gameweek on every request, on an in-memory SQLite database.
+
+Run from the backend directory with `ENVIRONMENT=test python -m benchmarks.forecast_serving`.
+"""
+
+import datetime as dt
+import logging
+import time
+from collections.abc import Callable
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.database.core import Base, engine
+from app.fixtures.forecasts.cache import forecast_cache
+from app.fixtures.forecasts.models import ForecastQuery
+from app.fixtures.forecasts.service import (
+    FORECAST_COLUMNS,
+    get_cached_forecasts,
+    get_gameweek_forecasts,
+    upsert_forecasts,
+)
+from app.fixtures.models import Fixture
+from app.logger import logger
+from app.teams.models import Team
+from benchmarks.data import FIXTURES_PER_GAMEWEEK
+
+N_TEAMS = 20
+N_REQUESTS = 1_000
+
+
+def populate(session: Session) -> None:
+    """Insert one gameweek of fixtures and their forecasts."""
+    teams = [
+        Team(tricode=f"T{i:02d}", name=f"Team {i:02d}", short_name=f"T{i:02d}")
+        for i in range(N_TEAMS)
+    ]
+    session.add_all(teams)
+    session.flush()
+    fixtures = [
+        Fixture(
+            date=dt.datetime(2023, 8, 12, 12 + i % 3, i, tzinfo=dt.timezone.utc),
+            season="2324",
+            gameweek=1,
+            home_team_id=teams[2 * i].id,
+            away_team_id=teams[2 * i + 1].id,
+        )
+        for i in range(FIXTURES_PER_GAMEWEEK)
+    ]
+    session.add_all(fixtures)
+    session.flush()
+    rng = np.random.default_rng(0)
+    upsert_forecasts(
+        session=session,
+        fixture_ids=[f.fixture_id for f in fixtures],
+        forecasts={k: rng.random(len(fixtures)) for k in FORECAST_COLUMNS},
+        model_version="dixon_coles",
+    )
+
+
+def measure(serve: Callable[[], bytes]) -> float:
+    """Median time of serving a response, in microseconds."""
+    times = []
+    for _ in range(N_REQUESTS):
+        start = time.perf_counter()
+        serve()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1e6
+
+
+def benchmark_forecast_serving() -> None:
+    """Time serving a gameweek with and without the cache."""
+    logger.setLevel(logging.WARNING)
+    Base.metadata.create_all(bind=engine)
+    query_in = ForecastQuery(season="2324", gameweek=1)
+    with Session(bind=engine) as session:
+        populate(session)
+        for name, serve in (
+            (
+                "uncached",
+                lambda: (
+                    get_gameweek_forecasts(
+                        session=session,
+                        season="2324",
+                        gameweek=1,
+                        model_version="dixon_coles",
+                    )
+                    .model_dump_json()
+                    .encode()
+                ),
+            ),
+            (
+                "cached",
+                lambda: get_cached_forecasts(session=session, query_in=query_in),
+            ),
+        ):
+            print(f"{name:<10} {measure(serve):10.1f}us")
+        session.rollback()
+    forecast_cache.invalidate()
+
+
+if __name__ == "__main__":
+    benchmark_forecast_serving()
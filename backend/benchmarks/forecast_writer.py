@@ -0,0 +1,60 @@
+"""Benchmark writing a full backtest of fixture forecasts.
+
+Compares the batched upsert with adding one ORM object per forecast, on an in-memory
+SQLite database.
+
+Run from the backend directory with `ENVIRONMENT=test python -m benchmarks.forecast_writer`.
+"""
+
+import logging
+import time
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.database.core import Base, engine
+from app.fixtures.forecasts.models import FixtureForecast
+from app.fixtures.forecasts.service import FORECAST_COLUMNS, upsert_forecasts
+from app.logger import logger
+
+N_FORECASTS = 3420
+
+
+def orm_write(session: Session, fixture_ids: np.ndarray, forecasts: dict) -> None:
+    """The previous writer: one ORM object per forecast."""
+    for i, fixture_id in enumerate(fixture_ids):
+        forecast = {k: float(forecasts[k][i]) for k in FORECAST_COLUMNS}
+        session.add(
+            FixtureForecast(fixture_id=int(fixture_id), model_version="orm", **forecast)
+        )
+    session.flush()
+
+
+def benchmark_forecast_writer(n_forecasts: int = N_FORECASTS) -> None:
+    """Time both writers over a nine-season backtest's worth of forecasts."""
+    logger.setLevel(logging.WARNING)
+    Base.metadata.create_all(bind=engine)
+    rng = np.random.default_rng(0)
+    fixture_ids = np.arange(1, n_forecasts + 1)
+    forecasts = {k: rng.random(n_forecasts) for k in FORECAST_COLUMNS}
+
+    with Session(bind=engine) as session:
+        start = time.perf_counter()
+        orm_write(session, fixture_ids, forecasts)
+        print(f"orm             {(time.perf_counter() - start) * 1000:8.1f}ms")
+
+        for attempt in ("insert", "update"):
+            start = time.perf_counter()
+            upsert_forecasts(
+                session=session,
+                fixture_ids=fixture_ids,
+                forecasts=forecasts,
+                model_version="upsert",
+            )
+            session.flush()
+            print(f"upsert ({attempt}) {(time.perf_counter() - start) * 1000:8.1f}ms")
+        session.rollback()
+
+
+if __name__ == "__main__":
+    benchmark_forecast_writer()
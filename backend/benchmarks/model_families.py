@@ -0,0 +1,69 @@
+"""Benchmark fitting and batched prediction for every model family, and compare their
+walk-forward backtest scores over the same splits.
+
+Run from the backend directory with `python -m benchmarks.model_families`.
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from app.fixtures.forecasts.backtest import (
+    score_forecasts,
+    sort_results,
+    walk_forward_families,
+)
+from app.fixtures.forecasts.families import MODEL_FAMILIES
+from app.logger import logger
+from benchmarks.data import FIXTURES_PER_GAMEWEEK, make_league
+
+N_REPEATS = 3
+
+
+def benchmark_families(n_seasons: int = 9) -> None:
+    """Time a full fit and a batched prediction of the full history per family."""
+    league = make_league(n_seasons=n_seasons)
+    print(f"Fixtures: {len(league['home_goals'])}")
+    for family, model_class in MODEL_FAMILIES.items():
+        fits, predicts = [], []
+        for seed in range(N_REPEATS):
+            np.random.seed(seed)
+            model = model_class(**league)  # type: ignore[arg-type]
+            start = time.perf_counter()
+            model.fit()
+            fits.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            model.predict_many(league["home_team"], league["away_team"])  # type: ignore[arg-type]
+            predicts.append(time.perf_counter() - start)
+        print(
+            f"{family:<20} fit {np.median(fits) * 1000:8.1f}ms  "
+            f"predict {np.median(predicts) * 1000:8.1f}ms  "
+            f"loglikelihood={model.loglikelihood:.3f} {model.extra}"
+        )
+
+
+def benchmark_backtest(n_seasons: int = 3) -> None:
+    """Walk-forward backtest of every family in a single worker pool."""
+    league = make_league(n_seasons=n_seasons)
+    n_fixtures = len(league["home_goals"])
+    results = sort_results(
+        {
+            "fixture_id": np.arange(n_fixtures),
+            "round": np.arange(n_fixtures) // FIXTURES_PER_GAMEWEEK,
+            **league,
+        }
+    )
+    logger.setLevel(logging.WARNING)
+
+    start = time.perf_counter()
+    forecasts = walk_forward_families(results)
+    elapsed = time.perf_counter() - start
+    print(f"Backtest of {len(forecasts)} families: {elapsed:6.1f}s")
+    for family, family_forecasts in forecasts.items():
+        print(f"{family:<20} {score_forecasts(family_forecasts)}")
+
+
+if __name__ == "__main__":
+    benchmark_families()
+    benchmark_backtest()
@@ -0,0 +1,49 @@
+"""Benchmark Monte Carlo simulation of the second half of a season.
+
+Run from the backend directory with `python -m benchmarks.season_simulation`.
+"""
+
+import logging
+import time
+
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.fixtures.forecasts.simulation import simulate_season
+from app.logger import logger
+from benchmarks.data import make_league
+
+FIXTURES_PER_SEASON = 380
+
+
+def benchmark_simulation(n_simulations: int = 100_000) -> None:
+    """Report simulated seasons per second with one worker and with all workers."""
+    league = make_league(n_seasons=2)
+    train = {k: v[:FIXTURES_PER_SEASON] for k, v in league.items()}
+    model = DixonColesModel(**train)  # type: ignore[arg-type]
+    model.fit()
+    logger.setLevel(logging.WARNING)
+
+    half = FIXTURES_PER_SEASON + FIXTURES_PER_SEASON // 2
+    played = {k: v[FIXTURES_PER_SEASON:half] for k, v in league.items()}
+    remaining = {k: league[k][half:] for k in ("home_team", "away_team")}
+    simulate_season(model, model.teams, played, remaining, n_simulations=10)
+
+    for max_workers in (1, None):
+        start = time.perf_counter()
+        simulate_season(
+            model=model,
+            teams=model.teams,
+            played=played,
+            remaining=remaining,
+            n_simulations=n_simulations,
+            seed=0,
+            max_workers=max_workers,
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"workers={max_workers or 'all'}: {n_simulations} seasons in "
+            f"{elapsed:.2f}s ({n_simulations / elapsed:,.0f} seasons/s)"
+        )
+
+
+if __name__ == "__main__":
+    benchmark_simulation()
@@ -0,0 +1,152 @@
+"""Benchmark loading the training results from the database.
+
+Compares the columnar loader with the previous ORM path, which built the arrays from
+row objects and parsed the dates with pandas, on an in-memory SQLite database.
+
+Run from the backend directory with `ENVIRONMENT=test python -m benchmarks.train_loader`.
+"""
+
+import datetime as dt
+import logging
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session, aliased
+
+from app.database.core import Base, engine
+from app.fixtures.forecasts.fill import get_train_results
+from app.fixtures.models import Fixture
+from app.logger import logger
+from app.results.models import Result
+from app.teams.models import Team
+from benchmarks.data import FIXTURES_PER_GAMEWEEK, make_league
+
+N_REPEATS = 5
+
+
+def kick_off(date: np.datetime64, minute: int) -> dt.datetime:
+    """Kick-off time, distinct per fixture as the synthetic rounds are unscheduled."""
+    day = date.astype(dt.date)
+    return dt.datetime.combine(day, dt.time(), tzinfo=dt.timezone.utc) + dt.timedelta(
+        minutes=minute
+    )
+
+
+def populate(session: Session, n_seasons: int) -> tuple[str, int]:
+    """Insert a synthetic league history, returning its last (season, gameweek)."""
+    league = make_league(n_seasons=n_seasons)
+    names = np.unique(league["home_team"])
+    session.bulk_insert_mappings(
+        Team,  # type: ignore[arg-type]
+        [
+            {"id": i + 1, "tricode": n[-3:], "name": n, "short_name": n}
+            for i, n in enumerate(names)
+        ],
+    )
+    team_ids = {name: i + 1 for i, name in enumerate(names)}
+    n_fixtures = len(league["date"])
+    per_season = n_fixtures // n_seasons
+    session.bulk_insert_mappings(
+        Fixture,  # type: ignore[arg-type]
+        [
+            {
+                "fixture_id": i + 1,
+                "date": kick_off(league["date"][i], minute=i % per_season),
+                "season": str(i // per_season),
+                "gameweek": (i % per_season) // FIXTURES_PER_GAMEWEEK + 1,
+                "home_team_id": team_ids[league["home_team"][i]],
+                "away_team_id": team_ids[league["away_team"][i]],
+            }
+            for i in range(n_fixtures)
+        ],
+    )
+    session.bulk_insert_mappings(
+        Result,  # type: ignore[arg-type]
+        [
+            {
+                "fixture_id": i + 1,
+                "home_score": int(league["home_goals"][i]),
+                "away_score": int(league["away_goals"][i]),
+            }
+            for i in range(n_fixtures)
+        ],
+    )
+    session.flush()
+    return str(n_seasons - 1), (per_season - 1) // FIXTURES_PER_GAMEWEEK + 1
+
+
+def orm_train_results(session: Session, end_season: str, end_gw: int) -> Any:
+    """The previous loader: ORM rows, list comprehensions and pandas date parsing."""
+    latest = (
+        session.query(Fixture.date)
+        .filter(Fixture.season == end_season, Fixture.gameweek == end_gw)
+        .order_by(Fixture.date.desc())
+        .first()
+    )
+    HomeTeam = aliased(Team)
+    AwayTeam = aliased(Team)
+    results = (
+        session.query(
+            Fixture.date,
+            HomeTeam.name.label("home_team"),
+            AwayTeam.name.label("away_team"),
+            Result.home_score,
+            Result.away_score,
+        )
+        .join(Result.fixture)
+        .join(HomeTeam, Fixture.home_team_id == HomeTeam.id)
+        .join(AwayTeam, Fixture.away_team_id == AwayTeam.id)
+        .filter(Fixture.date <= latest.date)  # type: ignore[union-attr]
+        .all()
+    )
+    return {
+        "date": np.array(
+            pd.to_datetime([r.date for r in results], format="mixed", utc=True),
+            dtype="datetime64[D]",
+        ),
+        "home_team": np.array([r.home_team for r in results]),
+        "away_team": np.array([r.away_team for r in results]),
+        "home_goals": np.array([r.home_score for r in results]),
+        "away_goals": np.array([r.away_score for r in results]),
+    }
+
+
+def measure(load: Callable[[], Any]) -> tuple[float, float]:
+    """Median wall time and peak traced allocation of a loader."""
+    times = []
+    for _ in range(N_REPEATS):
+        start = time.perf_counter()
+        load()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(np.median(times)), peak / 2**20
+
+
+def benchmark_train_loader(n_seasons: int = 30) -> None:
+    """Time and profile both loaders over the full history."""
+    logger.setLevel(logging.WARNING)
+    Base.metadata.create_all(bind=engine)
+    with Session(bind=engine) as session:
+        season, gameweek = populate(session, n_seasons=n_seasons)
+        for name, loader in (
+            ("orm", orm_train_results),
+            ("columnar", get_train_results),
+        ):
+            n_rows = len(loader(session, season, gameweek)["date"])
+            elapsed, peak = measure(lambda: loader(session, season, gameweek))  # noqa: B023
+            print(
+                f"{name:<10} {n_rows} rows  {elapsed * 1000:8.1f}ms  "
+                f"{n_rows / elapsed:10.0f} rows/s  peak {peak:6.2f}MiB"
+            )
+        session.rollback()
+
+
+if __name__ == "__main__":
+    benchmark_train_loader()
@@ -0,0 +1,49 @@
+"""fixture date to timestamp
+
+Revision ID: c41f0a8e2b67
+Revises: b7e24c9d13a5
+Create Date: 2026-10-18 10:24:05.417230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f0a8e2b67'
+down_revision: Union[str, None] = 'b7e24c9d13a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing ISO 8601 strings of either form ('2023-08-11T19:00:00Z' or
+    # '2023-08-11 19:00:00+00:00') cast directly, taking UTC when there is no offset
+    op.execute("SET LOCAL TIME ZONE 'UTC'")
+    op.alter_column(
+        'fixture',
+        'date',
+        existing_type=sa.String(length=100),
+        type_=sa.DateTime(timezone=True),
+        existing_nullable=True,
+        postgresql_using="NULLIF(TRIM(date), '')::timestamptz",
+    )
+    op.create_index(op.f('ix_fixture_date'), 'fixture', ['date'], unique=False)
+    op.create_index('ix_fixture_season_gameweek_date', 'fixture', ['season', 'gameweek', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_fixture_season_gameweek_date', table_name='fixture')
+    op.drop_index(op.f('ix_fixture_date'), table_name='fixture')
+    op.alter_column(
+        'fixture',
+        'date',
+        existing_type=sa.DateTime(timezone=True),
+        type_=sa.String(length=100),
+        existing_nullable=True,
+        postgresql_using="""to_char(date AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"')""",
+    )
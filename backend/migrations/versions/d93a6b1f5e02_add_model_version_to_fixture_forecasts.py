@@ -0,0 +1,43 @@
+"""add model_version to fixture_forecasts
+
+Revision ID: d93a6b1f5e02
+Revises: c41f0a8e2b67
+Create Date: 2026-10-18 10:41:52.630914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd93a6b1f5e02'
+down_revision: Union[str, None] = 'c41f0a8e2b67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing forecasts were all made by the Dixon-Coles model
+    op.add_column('fixture_forecasts', sa.Column('model_version', sa.String(length=100), nullable=False, server_default='dixon_coles'))
+    op.alter_column('fixture_forecasts', 'model_version', server_default=None)
+    # Keep only the latest of any duplicated forecasts before enforcing uniqueness
+    op.execute(
+        """
+        DELETE FROM fixture_forecasts
+        WHERE forecast_id NOT IN (
+            SELECT MAX(forecast_id)
+            FROM fixture_forecasts
+            GROUP BY fixture_id, model_version
+        )
+        """
+    )
+    op.create_unique_constraint('uix_fixture_model_version', 'fixture_forecasts', ['fixture_id', 'model_version'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uix_fixture_model_version', 'fixture_forecasts', type_='unique')
+    op.drop_column('fixture_forecasts', 'model_version')
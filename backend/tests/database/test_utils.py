@@ -1,7 +1,19 @@
+import datetime as dt
+
+import pytest
 from sqlalchemy.orm import Session
 
-from app.database.utils import apply_sort, sort_and_paginate
+from app.database.utils import (
+    apply_sort,
+    decode_cursor,
+    encode_cursor,
+    keyset_columns,
+    sort_and_paginate,
+)
+from app.fixtures.models import Fixture
 from app.models import BaseQuery
+from app.results.models import Result
+from app.teams.models import Team
 from tests.conftest import MockTable
 
 
@@ -78,3 +90,77 @@ def test_sort_and_paginate(session: Session, mock_table):
     assert result["total_pages"] == 1
     assert result["page_size"] == 10
     assert result["page"] == 0
+
+
+def test_sort_and_paginate_keyset(session: Session, mock_table):
+    """Keyset pages follow the cursor through every row once."""
+    query = session.query(MockTable)
+    query_in = BaseQuery(page_size=2, sort_desc=False, pagination="keyset")
+
+    ids = []
+    while True:
+        result = sort_and_paginate(query, MockTable, query_in)
+        ids += [item.id for item in result["items"]]
+        if result["next_cursor"] is None:
+            break
+        query_in.cursor = result["next_cursor"]
+
+    assert ids == [1, 2, 3, 4, 5]
+    assert result["total"] == 5
+
+
+def test_sort_and_paginate_keyset_unindexed(session: Session, mock_table):
+    """Keyset pagination only sorts on indexed columns."""
+    query_in = BaseQuery(sort_by="name", pagination="keyset")
+    with pytest.raises(ValueError, match="unindexed column: name"):
+        sort_and_paginate(session.query(MockTable), MockTable, query_in)
+
+
+def test_sort_and_paginate_total_invalidated_on_write(session: Session, mock_table):
+    """Cached totals are recounted once their table is written."""
+    query = session.query(MockTable).filter(MockTable.id > 2)
+    query_in = BaseQuery(page_size=2)
+    assert sort_and_paginate(query, MockTable, query_in)["total"] == 3
+
+    session.add(MockTable(id=6, name="Kiwi"))
+    session.flush()
+    assert sort_and_paginate(query, MockTable, query_in)["total"] == 4
+
+
+def test_decode_cursor_parses_utc_suffix():
+    """Cursor timestamps with a `Z` suffix parse on every supported Python."""
+    cursor = encode_cursor(["2023-08-11T19:00:00Z", 1])
+    columns = keyset_columns(Fixture, "date")
+
+    assert decode_cursor(cursor, columns) == [
+        dt.datetime(2023, 8, 11, 19, tzinfo=dt.timezone.utc),
+        1,
+    ]
+
+
+def test_sort_and_paginate_total_keyed_on_joins(session: Session):
+    """Queries with the same criteria but different joins have their own totals."""
+    teams = [Team(tricode=f"T{i}", name=f"Team {i}", short_name=f"T{i}") for i in "AB"]
+    session.add_all(teams)
+    session.flush()
+    fixtures = [
+        Fixture(
+            date=dt.datetime(2023, 8, day, tzinfo=dt.timezone.utc),
+            season="2324",
+            gameweek=1,
+            home_team_id=teams[0].id,
+            away_team_id=teams[1].id,
+        )
+        for day in (12, 19)
+    ]
+    session.add_all(fixtures)
+    session.flush()
+    session.add(Result(fixture_id=fixtures[0].fixture_id, home_score=1, away_score=0))
+    session.flush()
+
+    query = session.query(Fixture).filter(Fixture.season == "2324")
+    played = query.join(Result, Result.fixture_id == Fixture.fixture_id)
+    query_in = BaseQuery(page_size=10)
+
+    assert sort_and_paginate(query, Fixture, query_in)["total"] == 2
+    assert sort_and_paginate(played, Fixture, query_in)["total"] == 1
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+N_TEAMS = 6
+
+
+@pytest.fixture
+def league() -> dict[str, np.ndarray]:
+    """Two seasons of a small double round-robin league with Poisson scores."""
+    rng = np.random.default_rng(42)
+    teams = np.array([f"Team {chr(65 + i)}" for i in range(N_TEAMS)])
+    home, away = np.array(
+        [(i, j) for i in range(N_TEAMS) for j in range(N_TEAMS) if i != j] * 2
+    ).T
+    attack = rng.normal(0.2, 0.3, N_TEAMS)
+    defence = rng.normal(-0.2, 0.3, N_TEAMS)
+    dates = np.datetime64("2023-08-01") + 3 * np.arange(len(home))
+    return {
+        "home_team": teams[home],
+        "away_team": teams[away],
+        "home_goals": rng.poisson(np.exp(attack[home] + defence[away] + 0.25)),
+        "away_goals": rng.poisson(np.exp(attack[away] + defence[home])),
+        "date": dates.astype("datetime64[D]"),
+    }
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from app.fixtures.forecasts.artifacts import (
+    ArtifactKey,
+    ModelArtifact,
+    ModelArtifactStore,
+)
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+
+
+@pytest.fixture
+def model(league) -> DixonColesModel:
+    np.random.seed(0)
+    model = DixonColesModel(**league)
+    model.fit()
+    return model
+
+
+def test_artifact_round_trip(tmp_path, model: DixonColesModel):
+    """A stored fit restores a model with identical predictions."""
+    store = ModelArtifactStore(root=tmp_path)
+    key = ArtifactKey.for_model(season="2324", gameweek=10, model=model)
+    store.save(key, ModelArtifact.from_model(model))
+
+    restored = ModelArtifactStore(root=tmp_path).load(key).to_model()
+
+    assert restored.aic == pytest.approx(model.aic)
+    np.testing.assert_array_equal(restored.teams, model.teams)
+    assert restored.predict("Team A", "Team B") == model.predict("Team A", "Team B")
+    np.testing.assert_array_equal(restored.standard_errors(), model.standard_errors())
+
+
+def test_artifact_key_tracks_training_data(league, model: DixonColesModel):
+    """Keys differ when the training data or time decay differ."""
+    key = ArtifactKey.for_model(season="2324", gameweek=10, model=model)
+    other_data = DixonColesModel(**{k: v[:-1] for k, v in league.items()})
+    other_xi = DixonColesModel(**league, xi=0.002)
+
+    assert key == ArtifactKey.for_model(season="2324", gameweek=10, model=model)
+    assert key != ArtifactKey.for_model(season="2324", gameweek=10, model=other_data)
+    assert key != ArtifactKey.for_model(season="2324", gameweek=10, model=other_xi)
+
+
+def test_store_evicts_least_recently_used(tmp_path, model: DixonColesModel):
+    """Only the most recently used artifacts are kept in memory."""
+    store = ModelArtifactStore(root=tmp_path, max_cached=2)
+    artifact = ModelArtifact.from_model(model)
+    keys = [ArtifactKey("2324", gw, model.xi, "hash") for gw in (1, 2, 3)]
+    for key in keys:
+        store.save(key, artifact)
+
+    assert list(store._cache) == keys[1:]
+    assert store.load(keys[0]) is not None
+    assert list(store._cache) == [keys[2], keys[0]]
+    assert store.load(ArtifactKey("2324", 4, model.xi, "hash")) is None
+
+
+def test_failed_save_keeps_previous_artifact(
+    tmp_path, monkeypatch, model: DixonColesModel
+):
+    """A save that fails part way leaves the previous artifact and no temp files."""
+    path = tmp_path / "model.npz"
+    artifact = ModelArtifact.from_model(model)
+    artifact.save(path)
+
+    def fail(*args, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(np, "savez", fail)
+    with pytest.raises(OSError):
+        artifact.save(path)
+
+    assert list(tmp_path.iterdir()) == [path]
+    assert ModelArtifact.load(path).aic == pytest.approx(model.aic)
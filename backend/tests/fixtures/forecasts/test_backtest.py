@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from app.fixtures.forecasts.backtest import (
+    forecast_chunk,
+    score_forecasts,
+    sort_results,
+    walk_forward,
+    write_forecasts,
+)
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.fixtures.forecasts.metrics import ranked_probability_score
+from app.fixtures.forecasts.models import FixtureForecast
+
+FIXTURES_PER_ROUND = 3
+
+
+@pytest.fixture
+def results(league) -> dict[str, np.ndarray]:
+    n_fixtures = len(league["home_team"])
+    rounds = np.arange(n_fixtures) // FIXTURES_PER_ROUND
+    return sort_results(
+        {
+            "fixture_id": np.arange(n_fixtures) + 1,
+            "season": np.full(n_fixtures, "2324"),
+            "gameweek": rounds + 1,
+            "round": rounds + 1,
+            **league,
+        }
+    )
+
+
+def test_walk_forward_forecasts_every_later_round(results):
+    """Each round after the training window is forecast once per split covering it."""
+    forecasts = walk_forward(results, horizon=2, min_train_rounds=15, max_workers=2)
+    n_rounds = results["round"].max() + 1
+
+    for split in np.unique(forecasts["split"]):
+        forecast_rounds = results["round"][
+            forecasts["fixture_id"][forecasts["split"] == split] - 1
+        ]
+        assert np.all((forecast_rounds > split) & (forecast_rounds <= split + 2))
+    assert len(np.unique(forecasts["split"])) == n_rounds - 15
+    np.testing.assert_allclose(
+        forecasts["home_win"] + forecasts["draw"] + forecasts["away_win"], 1
+    )
+
+    scores = score_forecasts(forecasts)
+    assert 0 < scores.rps < scores.brier < 1
+    assert scores.log_loss > 0
+
+
+def test_write_forecasts_keeps_latest_split(session, results):
+    """Only the forecast made closest to kick-off is written for each fixture."""
+    forecasts = walk_forward(results, horizon=2, min_train_rounds=15, max_workers=1)
+    write_forecasts(session=session, forecasts=forecasts)
+
+    rows = session.query(FixtureForecast).all()
+    assert len(rows) == len(np.unique(forecasts["fixture_id"]))
+
+
+def test_ranked_probability_score():
+    """RPS penalises probability mass further from the observed outcome more."""
+    outcomes = np.array([[1.0, 0.0, 0.0]])
+    near = ranked_probability_score(np.array([[0.5, 0.5, 0.0]]), outcomes)
+    far = ranked_probability_score(np.array([[0.5, 0.0, 0.5]]), outcomes)
+    assert near == pytest.approx(0.125)
+    assert far == pytest.approx(0.25)
+
+
+def test_walk_forward_needs_a_split(results):
+    """Results too short to train and forecast are rejected up front."""
+    with pytest.raises(ValueError, match="Cannot backtest dixon_coles"):
+        walk_forward(results, min_train_rounds=results["round"].max() + 1)
+
+
+def test_walk_forward_fails_when_no_split_fits(results, monkeypatch):
+    """A family whose every split is skipped fails with its name, not an IndexError."""
+
+    def fail(self):
+        raise ValueError("Optimization did not converge")
+
+    monkeypatch.setattr(DixonColesModel, "fit", fail)
+    with pytest.raises(ValueError, match="dixon_coles backtest failed to fit"):
+        walk_forward(results, min_train_rounds=15, max_workers=1)
+
+
+def test_forecast_chunk_refits_after_failed_fit(results, monkeypatch):
+    """A chunk whose first fit fails refits from scratch at the next split."""
+    fit = DixonColesModel.fit
+    calls = []
+
+    def fail_first(self, *args, **kwargs):
+        calls.append(len(self.data))
+        if len(calls) == 1:
+            raise ValueError("Optimization did not converge")
+        fit(self, *args, **kwargs)
+
+    monkeypatch.setattr(DixonColesModel, "fit", fail_first)
+    split_points = np.arange(15, 19)
+    forecasts = forecast_chunk(results, split_points, horizon=1)
+
+    np.testing.assert_array_equal(np.unique(forecasts["split"]), split_points[1:])
+    assert calls[1] == (results["round"] <= 16).sum()
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from app.fixtures.forecasts.bootstrap import block_bootstrap, gameweek_blocks
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+
+
+@pytest.fixture
+def model(league) -> DixonColesModel:
+    np.random.seed(0)
+    model = DixonColesModel(**league)
+    model.fit()
+    return model
+
+
+def test_gameweek_blocks(model: DixonColesModel):
+    """Fixtures three days apart fall into consecutive weekly blocks."""
+    blocks = gameweek_blocks(model)
+    assert blocks.min() == 0
+    assert np.all(np.diff(blocks) >= 0)
+    assert np.bincount(blocks).max() <= 3
+
+
+def test_block_bootstrap(model: DixonColesModel):
+    """Replicates are deterministic for a seed and agree with the analytic spread."""
+    replicates = block_bootstrap(model, n_replicates=40, seed=3, max_workers=2)
+    assert replicates.params.dtype == np.float32
+    assert len(replicates) + replicates.n_failed == 40
+
+    again = block_bootstrap(model, n_replicates=40, seed=3, max_workers=1)
+    np.testing.assert_array_equal(again.params, replicates.params)
+
+    np.testing.assert_allclose(
+        replicates.params[:, : model.n_teams].sum(axis=1), model.n_teams, rtol=1e-5
+    )
+    ratio = replicates.standard_errors()[:-1] / model.standard_errors()[:-1]
+    assert np.all((ratio > 0.3) & (ratio < 3))
+
+
+def test_bootstrap_predict_intervals(model: DixonColesModel):
+    """Gameweek intervals cover the point predictions, including unseen teams."""
+    replicates = block_bootstrap(model, n_replicates=40, seed=3, max_workers=2)
+    home_teams = np.array(["Team A", "Team C", "Promoted"])
+    away_teams = np.array(["Team B", "Promoted", "Team E"])
+    intervals = replicates.predict_intervals(home_teams, away_teams, level=0.99)
+    preds = model.predict_many(home_teams, away_teams)
+
+    for name in ("home_win", "draw", "away_win", "home_goals_for"):
+        assert np.all(intervals[f"{name}_se"] > 0)
+        assert np.all(intervals[f"{name}_lower"] <= preds[name])
+        assert np.all(preds[name] <= intervals[f"{name}_upper"])
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+from scipy.optimize import approx_fprime
+
+from app.fixtures.forecasts.artifacts import ModelArtifact
+from app.fixtures.forecasts.covariates import XG_COVARIATES, rolling_xg
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.fixtures.forecasts.families import MODEL_FAMILIES, get_model_family
+
+BETA = np.array([0.4, -0.2])
+
+
+def covariate_league(n_rounds: int = 10, seed: int = 0) -> dict[str, np.ndarray]:
+    """Round-robin league whose log goal rates load on two fixture-level covariates."""
+    rng = np.random.default_rng(seed)
+    n_teams = 6
+    teams = np.array([f"Team {chr(65 + i)}" for i in range(n_teams)])
+    home, away = np.array(
+        [(i, j) for i in range(n_teams) for j in range(n_teams) if i != j] * n_rounds
+    ).T
+    attack = rng.normal(0.2, 0.2, n_teams)
+    defence = rng.normal(-0.2, 0.2, n_teams)
+    home_x = rng.normal(0, 0.5, (len(home), 2))
+    away_x = rng.normal(0, 0.5, (len(home), 2))
+    dates = np.datetime64("2023-08-01") + np.arange(len(home)) // 3
+    return {
+        "home_team": teams[home],
+        "away_team": teams[away],
+        "home_goals": rng.poisson(
+            np.exp(attack[home] + defence[away] + home_x @ BETA + 0.25)
+        ),
+        "away_goals": rng.poisson(np.exp(attack[away] + defence[home] + away_x @ BETA)),
+        "date": dates.astype("datetime64[D]"),
+        "home_covariates": home_x,
+        "away_covariates": away_x,
+    }
+
+
+@pytest.mark.parametrize("family", list(MODEL_FAMILIES))
+def test_covariate_kernel_gradient_matches_finite_differences(family: str):
+    """The fused kernels' covariate coefficient gradients agree with numerical ones."""
+    np.random.seed(0)
+    league = covariate_league(n_rounds=2)
+    model = get_model_family(family)(**league, covariate_names=XG_COVARIATES)
+    params = model._params.copy()
+    params[2 * model.n_teams : 2 * model.n_teams + 2] = [0.3, -0.1]
+
+    _, grad = model._fused_step(params)
+    numerical = approx_fprime(params, model._fused_nll, 1e-7)
+    np.testing.assert_allclose(grad, numerical, atol=1e-3)
+
+
+def test_covariate_model_recovers_coefficients():
+    """Fitting simulated data recovers the covariate coefficients."""
+    np.random.seed(0)
+    model = DixonColesModel(**covariate_league(), xi=0.0, covariate_names=XG_COVARIATES)
+    model.fit()
+
+    assert model.fitted
+    np.testing.assert_allclose(model.coefficients, BETA, atol=0.1)
+
+
+def test_covariate_model_requires_covariates_to_predict():
+    np.random.seed(0)
+    league = covariate_league(n_rounds=2)
+    model = DixonColesModel(**league, covariate_names=XG_COVARIATES)
+    model.fit()
+
+    with pytest.raises(ValueError, match="pass home_covariates"):
+        model.predict("Team A", "Team B")
+    with pytest.raises(ValueError, match="Expected 1 covariates"):
+        DixonColesModel(**league, covariate_names=("xg_for",))
+
+
+def test_covariate_artifact_round_trip():
+    """Stored covariate models restore their coefficients and predict the same."""
+    np.random.seed(0)
+    model = DixonColesModel(
+        **covariate_league(n_rounds=2), covariate_names=XG_COVARIATES
+    )
+    model.fit()
+    restored = ModelArtifact.from_model(model).to_model()
+    x = {"home_covariates": [0.2, -0.1], "away_covariates": [-0.3, 0.4]}
+
+    assert restored.covariate_names == XG_COVARIATES
+    assert restored.predict("Team A", "Team B", **x) == model.predict(
+        "Team A", "Team B", **x
+    )
+
+
+def test_rolling_xg_matches_loop(league):
+    """Vectorised rolling xG agrees with a per-fixture loop over previous matches."""
+    rng = np.random.default_rng(1)
+    n_fixtures = len(league["home_team"])
+    home_xg = rng.gamma(2, 0.7, n_fixtures)
+    away_xg = rng.gamma(2, 0.5, n_fixtures)
+    home_xg[rng.random(n_fixtures) < 0.2] = np.nan
+    shuffle = rng.permutation(n_fixtures)
+    home_team, away_team = league["home_team"][shuffle], league["away_team"][shuffle]
+    home_xg, away_xg = home_xg[shuffle], away_xg[shuffle]
+    date = league["date"][shuffle]
+
+    xg = rolling_xg(home_team, away_team, home_xg, away_xg, date, window=4)
+
+    def expected(team: str, before: np.datetime64) -> list[float]:
+        played = [
+            (d, (h, a) if ht == team else (a, h))
+            for ht, at, h, a, d in zip(
+                home_team, away_team, home_xg, away_xg, date, strict=True
+            )
+            if team in (ht, at) and d < before
+        ]
+        last = np.array([v for _, v in sorted(played, key=lambda p: p[0])][-4:])
+        if not len(last):
+            return [np.nan, np.nan]
+        return [np.nanmean(col) if np.isfinite(col).any() else np.nan for col in last.T]
+
+    for i in range(n_fixtures):
+        np.testing.assert_allclose(xg.home[i], expected(home_team[i], date[i]))
+        np.testing.assert_allclose(xg.away[i], expected(away_team[i], date[i]))
+
+    end = date.max() + 1
+    for team, latest in zip(xg.teams, xg.latest, strict=True):
+        np.testing.assert_allclose(latest, expected(team, end))
+
+    home_x, away_x = xg.fixture_design(np.array(["Team A"]), np.array(["Unseen"]))
+    assert home_x[0, 1] == 0 and away_x[0, 0] == 0
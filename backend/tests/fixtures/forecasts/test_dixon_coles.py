@@ -0,0 +1,176 @@
+import numpy as np
+import pytest
+from scipy.optimize import approx_fprime
+from scipy.special import gammaln
+from scipy.stats import poisson
+
+from app.fixtures.forecasts.base import MAX_TABLE_GOALS, log_factorial, poisson_logpmf
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+
+
+@pytest.fixture
+def model(league) -> DixonColesModel:
+    np.random.seed(0)
+    return DixonColesModel(**league)
+
+
+@pytest.fixture
+def params(model: DixonColesModel) -> np.ndarray:
+    params = model._params.copy()
+    params[-1] = -0.15
+    return params
+
+
+def test_gradient_matches_finite_differences(model: DixonColesModel, params):
+    """Analytic gradient agrees with a numerical approximation of the objective."""
+    numerical = approx_fprime(params, model._fit_step, 1e-7)
+    np.testing.assert_allclose(model._fit_jac(params), numerical, atol=1e-3)
+
+
+def test_hessian_matches_finite_differences(model: DixonColesModel, params):
+    """Analytic Hessian agrees with a numerical approximation of the gradient."""
+    numerical = np.array(
+        [
+            approx_fprime(params, lambda x, i=i: model._fit_jac(x)[i], 1e-7)
+            for i in range(len(params))
+        ]
+    )
+    hess = model._fit_hess(params)
+    np.testing.assert_allclose(hess, hess.T)
+    np.testing.assert_allclose(hess, numerical, atol=1e-3)
+
+
+@pytest.mark.parametrize(
+    "options", [{"jac": False}, {"hess": True}, {"kernel": "numpy"}]
+)
+def test_fit_options_agree(league, options):
+    """All derivative options converge to the same optimum."""
+    np.random.seed(0)
+    reference = DixonColesModel(**league)
+    reference.fit()
+
+    np.random.seed(0)
+    model = DixonColesModel(**league)
+    model.fit(**options)
+
+    assert model.loglikelihood == pytest.approx(reference.loglikelihood, abs=1e-3)
+    np.testing.assert_allclose(model._params, reference._params, atol=1e-2)
+
+
+def test_fused_kernel_matches_numpy(model: DixonColesModel, params):
+    """The fused numba kernel agrees with the vectorised NumPy objective."""
+    nll, grad = model._fused_step(params)
+
+    assert nll == pytest.approx(model._fit_step(params))
+    assert model._fused_nll(params) == pytest.approx(nll)
+    np.testing.assert_allclose(grad, model._fit_jac(params), atol=1e-8)
+
+
+def test_log_factorial_matches_gammaln():
+    """Lookup table values (and the lgamma fallback beyond it) are exact."""
+    goals = np.arange(MAX_TABLE_GOALS + 10)
+    log_factorials = np.array([log_factorial(k) for k in goals])
+
+    np.testing.assert_allclose(log_factorials, gammaln(goals + 1), rtol=1e-12)
+    np.testing.assert_allclose(
+        poisson_logpmf(goals, 1.3), poisson.logpmf(goals, 1.3), rtol=1e-12
+    )
+
+
+def test_predict_many_matches_predict(league):
+    """Batched predictions agree with single fixture predictions."""
+    np.random.seed(0)
+    model = DixonColesModel(**league)
+    model.fit()
+    home_teams = np.append(league["home_team"][:5], "Promoted FC")
+    away_teams = np.append(league["away_team"][:5], league["away_team"][0])
+
+    batched = model.predict_many(home_teams=home_teams, away_teams=away_teams)
+    outcomes = batched["home_win"] + batched["draw"] + batched["away_win"]
+
+    np.testing.assert_allclose(outcomes, 1)
+    for i, (home, away) in enumerate(zip(home_teams, away_teams, strict=True)):
+        single = model.predict(home, away)
+        for key, value in single.items():
+            assert value == pytest.approx(batched[key][i], abs=1e-4)
+
+
+def test_advance_matches_full_refit(league):
+    """Advancing by a gameweek reaches the same optimum as refitting from scratch."""
+    n_train = len(league["home_team"]) - 3
+    history = {k: v[:n_train] for k, v in league.items()}
+    gameweek = {k: v[n_train:] for k, v in league.items()}
+
+    np.random.seed(0)
+    model = DixonColesModel(**history)
+    model.fit()
+    model.advance(**gameweek)
+
+    np.random.seed(0)
+    full = DixonColesModel(
+        **{k: np.concatenate((history[k], gameweek[k])) for k in league}
+    )
+    full.fit()
+
+    assert model.n_teams == full.n_teams
+    assert model._res["nit"] < full._res["nit"]
+    assert model.loglikelihood == pytest.approx(full.loglikelihood, abs=1e-4)
+    for team in full.teams:
+        np.testing.assert_allclose(
+            model.get_team_strength(team), full.get_team_strength(team), atol=1e-3
+        )
+
+
+def test_fit_multistart_is_deterministic(league):
+    """Seeded restarts reproduce the same best fit and report every restart."""
+    fits = []
+    for _ in range(2):
+        model = DixonColesModel(**league)
+        diagnostics = model.fit_multistart(n_starts=3, seed=7, max_workers=2)
+        fits.append(model)
+
+        assert len(diagnostics) == 3
+        assert model.loglikelihood == max(
+            d.loglikelihood for d in diagnostics if d.converged
+        )
+        assert all(d.n_fev > 0 and d.wall_time > 0 for d in diagnostics)
+
+    np.testing.assert_array_equal(fits[0]._params, fits[1]._params)
+    assert fits[0].diagnostics.seed == fits[1].diagnostics.seed
+
+
+def test_covariance_respects_constraint(model: DixonColesModel):
+    """The covariance is singular along the sum-to-n attack constraint."""
+    model.fit()
+    covariance = model.parameter_covariance()
+
+    np.testing.assert_allclose(covariance, covariance.T, atol=1e-12)
+    np.testing.assert_allclose(covariance[: model.n_teams].sum(axis=0), 0, atol=1e-10)
+    assert np.all(model.standard_errors()[model.n_teams :] > 0)
+    assert "attack_se" in model.get_all_team_strengths()["Team A"]
+
+
+def test_predict_intervals_match_numerical_delta_method(model: DixonColesModel):
+    """Delta-method errors agree with a numerical Jacobian of the predictions."""
+    model.fit()
+    home_teams = np.array(["Team A", "Team C", "Team F"])
+    away_teams = np.array(["Team B", "Team D", "Team A"])
+    intervals = model.predict_intervals(home_teams, away_teams, max_goals=15)
+
+    params = model._params.copy()
+
+    def predict(x: np.ndarray, name: str) -> np.ndarray:
+        model._params = x
+        return model.predict_many(home_teams, away_teams, max_goals=15)[name]
+
+    for name in ("home_win", "draw", "away_clean_sheet", "home_goals_for"):
+        jac = np.array(
+            [
+                (predict(params + step, name) - predict(params - step, name)) / 2e-6
+                for step in np.eye(len(params)) * 1e-6
+            ]
+        ).T
+        model._params = params
+        expected = np.sqrt(np.diag(jac @ model.parameter_covariance() @ jac.T))
+        np.testing.assert_allclose(intervals[f"{name}_se"], expected, rtol=1e-4)
+        assert np.all(intervals[f"{name}_lower"] <= intervals[f"{name}_upper"])
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from app.fixtures.forecasts.dixon_coles import DixonColesModel, local_derivatives
+from app.fixtures.forecasts.dynamic import DynamicDixonColesModel
+
+
+@pytest.fixture
+def split(league):
+    """A static fit on the first season, and the second season's results."""
+    n = len(league["home_team"]) // 2
+    np.random.seed(0)
+    static = DixonColesModel(**{k: v[:n] for k, v in league.items()})
+    static.fit()
+    return static, {k: v[n:] for k, v in league.items()}
+
+
+def test_update_matches_dense_laplace_step():
+    """The rank-two update equals a Newton step in the full posterior precision."""
+    rng = np.random.default_rng(0)
+    n = 4
+    a = rng.normal(size=(2 * n, 2 * n))
+    cov = a @ a.T / (2 * n) + 0.1 * np.eye(2 * n)
+    mean = np.concatenate((rng.normal(1, 0.2, n), rng.normal(-1, 0.2, n)))
+    teams = np.array(list("ABCD"))
+    model = DynamicDixonColesModel(
+        teams, mean, cov, 0.3, -0.1, np.datetime64("2024-01-01")
+    )
+    model.update_result("B", "D", home_goals=3, away_goals=0)
+
+    h = np.zeros((2, 2 * n))
+    h[0, [1, n + 3]] = 1
+    h[1, [3, n + 1]] = 1
+    params = np.concatenate((mean, [0.3, -0.1]))
+    g_h, g_a, *_ = local_derivatives(
+        params, np.array([1]), np.array([3]), np.array([3]), np.array([0]), n
+    )
+    w = np.diag(np.exp(h @ mean + [0.3, 0]))
+    posterior_cov = np.linalg.inv(np.linalg.inv(cov) + h.T @ w @ h)
+    expected_mean = mean + posterior_cov @ h.T @ np.array([g_h[0], g_a[0]])
+
+    np.testing.assert_allclose(model.mean, expected_mean, atol=1e-10)
+    np.testing.assert_allclose(model.cov, posterior_cov, atol=1e-10)
+
+
+def test_filter_tracks_static_fit(league, split):
+    """Filtering a season moves the strengths towards a static refit on all results."""
+    static, season = split
+    model = DynamicDixonColesModel.from_static(static, process_var=1e-5)
+    model.update(**season)
+
+    np.random.seed(0)
+    refit = DixonColesModel(**league)
+    refit.fit()
+    target = refit._params[: 2 * refit.n_teams]
+    start = static._params[: 2 * static.n_teams]
+    assert np.linalg.norm(model.mean - target) < np.linalg.norm(start - target)
+
+    assert model.date == season["date"].max()
+    np.testing.assert_allclose(model.cov, model.cov.T, atol=1e-12)
+    assert np.all(np.linalg.eigvalsh(model.cov) > -1e-10)
+
+    preds = model.predict_many(season["home_team"], season["away_team"])
+    np.testing.assert_allclose(preds["home_win"] + preds["draw"] + preds["away_win"], 1)
+
+
+def test_process_noise_ignores_unidentified_shift(split):
+    static, _ = split
+    model = DynamicDixonColesModel.from_static(static)
+    shift = np.concatenate((np.ones(model.n_teams), -np.ones(model.n_teams)))
+    np.testing.assert_allclose(model.process_noise() @ shift, 0, atol=1e-18)
+
+
+def test_smooth(split):
+    """Smoothing ends at the filtered state, and only reduces uncertainty before it."""
+    static, season = split
+    season["home_team"] = np.where(
+        season["home_team"] == "Team F", "Promoted", season["home_team"]
+    )
+    season["away_team"] = np.where(
+        season["away_team"] == "Team F", "Promoted", season["away_team"]
+    )
+    model = DynamicDixonColesModel.from_static(static, keep_history=True)
+    model.update(**season)
+    smoothed = model.smooth()
+
+    assert len(smoothed.dates) == len(np.unique(season["date"])) + 1
+    assert smoothed.attack.shape == (len(smoothed.dates), model.n_teams)
+    np.testing.assert_allclose(smoothed.mean[-1], model.mean)
+
+    filtered_sd = np.sqrt(np.diag(model.history[-1].cov))
+    assert np.all(smoothed.sd[-2] <= filtered_sd + 1e-12)
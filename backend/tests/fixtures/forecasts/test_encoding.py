@@ -0,0 +1,64 @@
+import numpy as np
+
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.fixtures.forecasts.encoding import EncodedFixtures, SufficientStats
+
+
+def test_encoded_fixtures_round_trip(league):
+    """Team indices decode back to the original team names."""
+    data = EncodedFixtures.from_results(**league)
+
+    assert len(data) == len(league["home_team"])
+    np.testing.assert_array_equal(data.teams[data.home_idx], league["home_team"])
+    np.testing.assert_array_equal(data.teams[data.away_idx], league["away_team"])
+
+
+def test_sufficient_stats_cells(league):
+    """Each fixture maps to a cell with the same teams and score."""
+    data = EncodedFixtures.from_results(**league)
+    weights = np.random.default_rng(0).uniform(size=len(data))
+    stats = SufficientStats.from_fixtures(data, weights)
+
+    assert len(stats) <= len(data)
+    assert np.isclose(stats.weights.sum(), weights.sum())
+    np.testing.assert_array_equal(stats.home_idx[stats.cell_idx], data.home_idx)
+    np.testing.assert_array_equal(stats.away_goals[stats.cell_idx], data.away_goals)
+
+
+def test_objective_matches_ungrouped_fixtures(league):
+    """Aggregating into cells leaves the weighted objective unchanged."""
+    model = DixonColesModel(**league)
+    params = model._params.copy()
+    grouped = model._fit_step(params)
+
+    data = model.data
+    model.stats = SufficientStats(
+        home_idx=data.home_idx,
+        away_idx=data.away_idx,
+        home_goals=data.home_goals,
+        away_goals=data.away_goals,
+        weights=model.weights,
+        cell_idx=np.arange(len(data)),
+    )
+    assert np.isclose(model._fit_step(params), grouped)
+
+
+def test_extend_matches_full_encoding(league):
+    """Extending with new results (and a new team) matches grouping from scratch."""
+    n_train = len(league["home_team"]) - 4
+    history = {k: v[:n_train] for k, v in league.items()}
+    new = {k: v[n_train:] for k, v in league.items()}
+    new["home_team"] = np.array(["Promoted FC", *new["home_team"][1:]])
+
+    data = EncodedFixtures.from_results(**history).extend(**new)
+    stats = SufficientStats.from_fixtures(
+        EncodedFixtures.from_results(**history), np.full(n_train, 2.0)
+    ).extend(data, weights=np.ones(4), decay=0.5)
+    expected = SufficientStats.from_fixtures(data, np.ones(len(data)))
+
+    assert data.teams[-1] == "Promoted FC"
+    np.testing.assert_array_equal(data.teams[data.home_idx[n_train:]], new["home_team"])
+    assert len(stats) == len(expected)
+    np.testing.assert_allclose(
+        stats.weights[stats.cell_idx], expected.weights[expected.cell_idx]
+    )
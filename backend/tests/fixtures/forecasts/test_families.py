@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+from scipy.optimize import approx_fprime
+from scipy.stats import nbinom
+
+from app.fixtures.forecasts.artifacts import ModelArtifact
+from app.fixtures.forecasts.backtest import walk_forward_families
+from app.fixtures.forecasts.base import ForecastModel, joint_probability_matrix
+from app.fixtures.forecasts.bivariate_poisson import score_distribution
+from app.fixtures.forecasts.families import MODEL_FAMILIES, get_model_family
+from app.fixtures.forecasts.negative_binomial import negative_binomial_loglikelihood
+
+
+@pytest.fixture(params=list(MODEL_FAMILIES))
+def model(request, league) -> ForecastModel:
+    np.random.seed(0)
+    model = get_model_family(request.param)(**league)
+    model.fit()
+    return model
+
+
+def test_kernel_gradient_matches_finite_differences(model: ForecastModel):
+    """Each family's fused kernel gradient agrees with a numerical approximation."""
+    params = model._params.copy()
+    _, grad = model._fused_step(params)
+    numerical = approx_fprime(params, model._fused_nll, 1e-7)
+    np.testing.assert_allclose(grad, numerical, atol=1e-3)
+
+
+def test_loglikelihood_matches_score_distribution(league, model: ForecastModel):
+    """Scoreline log-likelihoods are the log of the predicted score matrix cells."""
+    home_teams, away_teams = league["home_team"], league["away_team"]
+    dist = model.score_distribution(home_teams, away_teams)
+    llk = model.loglikelihood_many(
+        home_teams, away_teams, league["home_goals"], league["away_goals"]
+    )
+    cells = dist.matrix[
+        np.arange(len(dist)), league["home_goals"], league["away_goals"]
+    ]
+
+    np.testing.assert_allclose(dist.matrix.sum(axis=(1, 2)), 1)
+    assert dist.tail_mass.max() < 1e-8
+    np.testing.assert_allclose(llk, np.log(cells), atol=1e-7)
+
+
+def test_predicted_goals_match_score_distribution(league, model: ForecastModel):
+    """Expected goals are the means of the score distribution's marginals."""
+    preds = model.predict_many(league["home_team"], league["away_team"])
+    dist = model.score_distribution(league["home_team"], league["away_team"])
+    goals = np.arange(dist.max_goals)
+
+    np.testing.assert_allclose(preds["home_win"] + preds["draw"] + preds["away_win"], 1)
+    np.testing.assert_allclose(preds["home_goals_for"], dist.home_goals @ goals)
+    np.testing.assert_allclose(preds["away_goals_for"], dist.away_goals @ goals)
+
+
+def test_predict_many_empty_batch(model: ForecastModel):
+    """An empty batch of fixtures predicts empty outputs rather than failing."""
+    empty = np.array([], dtype=str)
+    preds = model.predict_many(home_teams=empty, away_teams=empty)
+
+    assert preds
+    assert all(len(column) == 0 for column in preds.values())
+
+
+def test_predict_with_level_needs_interval_support(model: ForecastModel):
+    """A confidence level adds intervals where the family supports them."""
+    home_team, away_team = model.teams[:2]
+    if hasattr(model, "predict_intervals"):
+        preds = model.predict(home_team, away_team, level=0.9)
+        assert len(preds) > len(model.predict(home_team, away_team))
+    else:
+        with pytest.raises(ValueError, match="not available"):
+            model.predict(home_team, away_team, level=0.9)
+
+
+def test_artifact_restores_family(model: ForecastModel):
+    """A stored fit is restored as a model of the same family."""
+    restored = ModelArtifact.from_model(model).to_model()
+
+    assert type(restored) is type(model)
+    assert restored.extra == model.extra
+    assert restored.predict("Team A", "Team B") == model.predict("Team A", "Team B")
+
+
+def test_bivariate_poisson_without_covariance_is_independent():
+    """With no shared goals the bivariate Poisson matrix is the independent one."""
+    home_rate, away_rate = np.array([1.4, 0.6]), np.array([1.1, 2.0])
+    dist = score_distribution(home_rate, away_rate, lambda3=1e-12, max_goals=12)
+    independent = joint_probability_matrix(home_rate, away_rate, max_goals=12)
+    independent /= independent.sum(axis=(1, 2), keepdims=True)
+
+    np.testing.assert_allclose(dist.matrix, independent, atol=1e-9)
+
+
+def test_bivariate_poisson_covariance_adds_draws():
+    """With the expected goals held fixed, covariance moves probability onto draws."""
+    home_mean, away_mean = np.array([1.5, 0.9]), np.array([1.2, 1.8])
+    draws = [
+        score_distribution(
+            home_mean - lambda3, away_mean - lambda3, lambda3
+        ).outcomes()[1]
+        for lambda3 in (0.01, 0.3)
+    ]
+
+    assert np.all(draws[1] > draws[0])
+
+
+def test_negative_binomial_loglikelihood_matches_scipy():
+    """The negative binomial kernel's log-PMF agrees with scipy."""
+    goals = np.arange(8)
+    rate = np.full(8, 1.7)
+    dispersion = 0.3
+    r = 1 / dispersion
+    expected = 2 * nbinom.logpmf(goals, r, r / (r + rate))
+
+    llk = negative_binomial_loglikelihood(goals, goals, rate, rate, dispersion)
+    np.testing.assert_allclose(llk, expected, rtol=1e-10)
+
+
+def test_unknown_family_raises():
+    with pytest.raises(ValueError, match="Unknown model family"):
+        get_model_family("poisson")
+
+
+def test_walk_forward_families_share_splits(league):
+    """Every family forecasts the same fixtures at the same split points."""
+    n_fixtures = len(league["home_team"])
+    results = {
+        "fixture_id": np.arange(n_fixtures) + 1,
+        "round": np.arange(n_fixtures) // 3,
+        **league,
+    }
+    forecasts = walk_forward_families(
+        results, horizon=1, min_train_rounds=18, max_workers=2
+    )
+
+    assert set(forecasts) == set(MODEL_FAMILIES)
+    reference = forecasts["dixon_coles"]
+    for family_forecasts in forecasts.values():
+        np.testing.assert_array_equal(
+            family_forecasts["fixture_id"], reference["fixture_id"]
+        )
+        np.testing.assert_array_equal(family_forecasts["split"], reference["split"])
@@ -0,0 +1,92 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database.utils import fetch_columns
+from app.fixtures.forecasts.backtest import get_backtest_results
+from app.fixtures.forecasts.fill import get_train_results
+from app.fixtures.models import Fixture
+from app.results.models import Result
+from app.teams.models import Team
+
+DATES = [
+    dt.datetime(2023, 8, 11, 19, tzinfo=dt.timezone.utc),
+    dt.datetime(2023, 8, 12, 14, tzinfo=dt.timezone.utc),
+    dt.datetime(2023, 8, 19, 11, 30, tzinfo=dt.timezone.utc),
+    dt.datetime(2023, 8, 26, 14, tzinfo=dt.timezone.utc),
+]
+
+
+@pytest.fixture
+def played(session: Session) -> list[Team]:
+    """Three played fixtures between three teams, plus one unplayed fixture."""
+    teams = [Team(tricode=f"T{i}", name=f"Team {i}", short_name=f"T{i}") for i in "ABC"]
+    session.add_all(teams)
+    session.flush()
+    pairs = [(0, 1), (2, 0), (1, 2), (0, 2)]
+    fixtures = [
+        Fixture(
+            date=DATES[i],
+            season="2324",
+            gameweek=1 + i // 2,
+            home_team_id=teams[h].id,
+            away_team_id=teams[a].id,
+        )
+        for i, (h, a) in enumerate(pairs)
+    ]
+    session.add_all(fixtures)
+    session.flush()
+    session.add_all(
+        Result(
+            fixture_id=f.fixture_id,
+            home_score=i,
+            away_score=1,
+            home_xg=1.5 if i else None,
+        )
+        for i, f in enumerate(fixtures[:3])
+    )
+    session.flush()
+    return teams
+
+
+def test_get_train_results_decodes_columns(session: Session, played):
+    train = get_train_results(
+        session=session, end_season="2324", end_gw=2, expected_goals=True
+    )
+    order = np.argsort(train["date"])
+
+    np.testing.assert_array_equal(
+        train["date"][order],
+        np.array(["2023-08-11", "2023-08-12", "2023-08-19"], dtype="datetime64[D]"),
+    )
+    assert train["home_team"][order].tolist() == ["Team A", "Team C", "Team B"]
+    assert train["away_team"][order].tolist() == ["Team B", "Team A", "Team C"]
+    assert train["home_goals"].dtype == np.int64
+    np.testing.assert_array_equal(train["home_goals"][order], [0, 1, 2])
+    np.testing.assert_array_equal(train["home_xg"][order], [np.nan, 1.5, 1.5])
+
+
+def test_get_backtest_results_orders_rounds(session: Session, played):
+    results = get_backtest_results(session=session, seasons=["2324"])
+
+    np.testing.assert_array_equal(results["round"], [0, 0, 1])
+    assert np.all(np.diff(results["date"]) >= np.timedelta64(0))
+
+
+def test_fetch_columns_grows_past_chunks(session: Session, played):
+    """Rows spanning several fetch chunks land in order in the typed arrays."""
+    statement = select(
+        Fixture.fixture_id.label("fixture_id"), Fixture.gameweek.label("gameweek")
+    )
+    columns = fetch_columns(
+        session,
+        statement.order_by(Fixture.fixture_id),
+        {"fixture_id": np.int64, "gameweek": np.int64},
+        chunk_size=1,
+    )
+
+    assert columns["gameweek"].tolist() == [1, 1, 2, 2]
+    assert columns["fixture_id"].dtype == np.int64
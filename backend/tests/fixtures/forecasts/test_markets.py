@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from app.fixtures.forecasts.dixon_coles import score_distribution
+from app.fixtures.forecasts.markets import truncation_goals
+
+HOME_EXP = np.array([0.6, 1.4, 3.1])
+AWAY_EXP = np.array([0.9, 1.1, 0.4])
+
+
+@pytest.fixture
+def dist():
+    return score_distribution(HOME_EXP, AWAY_EXP, rho=-0.1)
+
+
+@pytest.mark.parametrize("tol", [1e-4, 1e-8, 1e-12])
+def test_truncation_keeps_tail_below_tolerance(tol):
+    """Adaptive truncation drops less than `tol` of every fixture's mass, and no more
+    goals than needed."""
+    dist = score_distribution(HOME_EXP, AWAY_EXP, rho=-0.1, tol=tol)
+    assert np.all(dist.tail_mass < tol)
+    assert dist.max_goals == truncation_goals(HOME_EXP, AWAY_EXP, tol=tol)
+
+    shorter = score_distribution(
+        HOME_EXP, AWAY_EXP, rho=-0.1, max_goals=dist.max_goals - 2
+    )
+    assert np.any(shorter.tail_mass >= tol)
+
+
+def test_distributions_sum_to_one(dist):
+    for marginal in (
+        dist.home_goals,
+        dist.away_goals,
+        dist.total_goals,
+        dist.goal_difference,
+    ):
+        np.testing.assert_allclose(marginal.sum(axis=1), 1)
+    np.testing.assert_allclose(sum(dist.outcomes()), 1)
+
+
+def test_markets_match_scoreline_sums(dist):
+    """Every market matches a brute-force sum over the scoreline matrix."""
+    goals = np.arange(dist.max_goals)
+    home, away = np.meshgrid(goals, goals, indexing="ij")
+    m = dist.matrix
+
+    np.testing.assert_allclose(dist.over(2.5), m[:, home + away > 2].sum(axis=1))
+    np.testing.assert_allclose(dist.under(2.5) + dist.over(2.5), 1)
+    np.testing.assert_allclose(
+        dist.both_teams_to_score(), m[:, (home > 0) & (away > 0)].sum(axis=1)
+    )
+    np.testing.assert_allclose(dist.correct_score(2, 1), m[:, 2, 1])
+    np.testing.assert_allclose(
+        dist.total_goals[:, 3], m[:, home + away == 3].sum(axis=1)
+    )
+
+    home_win, draw, away_win = dist.outcomes()
+    np.testing.assert_allclose(dist.asian_handicap(-0.5)[0], home_win)
+    np.testing.assert_allclose(dist.asian_handicap(0.0)[1], draw)
+    np.testing.assert_allclose(dist.asian_handicap(0.5)[2], away_win)
+    np.testing.assert_allclose(
+        dist.asian_handicap(-1.0)[1], m[:, home - away == 1].sum(axis=1)
+    )
+
+
+def test_quarter_line_splits_stake(dist):
+    win, push, loss = dist.asian_handicap(-0.25)
+    np.testing.assert_allclose(win, dist.asian_handicap(-0.5)[0])
+    np.testing.assert_allclose(push, dist.asian_handicap(0.0)[1] / 2)
+    np.testing.assert_allclose(win + push + loss, 1)
+    assert all(np.all(v >= 0) for v in dist.markets().values())
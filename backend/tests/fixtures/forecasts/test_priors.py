@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from scipy.optimize import approx_fprime
+
+from app.fixtures.forecasts.artifacts import ModelArtifact
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.fixtures.forecasts.priors import PriorTable, TeamPrior, build_prior_table
+
+PRIOR = TeamPrior(attack_mean=0.7, attack_sd=0.1, defence_mean=-0.8, defence_sd=0.2)
+
+
+@pytest.fixture
+def model(league) -> DixonColesModel:
+    np.random.seed(0)
+    model = DixonColesModel(**league)
+    model.set_priors(PRIOR, teams=np.array(["Team B", "Team E"]))
+    return model
+
+
+def test_prior_derivatives_match_finite_differences(model: DixonColesModel):
+    """The penalised gradient and Hessian agree with numerical approximations."""
+    params = model._params
+    numerical = approx_fprime(params, model._fit_step, 1e-7)
+    np.testing.assert_allclose(model._fit_jac(params), numerical, atol=1e-3)
+    _, fused = model._fused_step(params)
+    np.testing.assert_allclose(fused, model._fit_jac(params))
+
+    numerical = approx_fprime(params, lambda x: model._fit_jac(x)[1], 1e-7)
+    np.testing.assert_allclose(model._fit_hess(params)[1], numerical, atol=1e-3)
+
+
+def test_map_fit_shrinks_towards_prior(league, model: DixonColesModel):
+    """Penalised teams move towards the prior, and the likelihood excludes the penalty."""
+    np.random.seed(0)
+    mle = DixonColesModel(**league)
+    mle.fit()
+    model.fit()
+
+    mle_atk, _ = mle.get_team_strength("Team B")
+    map_atk, _ = model.get_team_strength("Team B")
+    assert abs(map_atk - PRIOR.attack_mean) < abs(mle_atk - PRIOR.attack_mean)
+    assert model.loglikelihood < mle.loglikelihood
+    assert model.loglikelihood == pytest.approx(-model._fit_step(model._params), abs=1)
+
+
+def test_unseen_teams_use_prior(model: DixonColesModel):
+    model.fit()
+    assert model.get_team_strength("Promoted") == (0.7, -0.8)
+
+    restored = ModelArtifact.from_model(model).to_model()
+    assert restored.get_team_strength("Promoted") == (0.7, -0.8)
+
+
+def test_advance_applies_prior_to_new_teams(league, model: DixonColesModel):
+    model.fit()
+    model.advance(
+        home_team=np.array(["Promoted", "Team A"]),
+        away_team=np.array(["Team A", "Promoted"]),
+        home_goals=np.array([1, 2]),
+        away_goals=np.array([1, 0]),
+        date=np.array(["2024-01-01", "2024-01-04"], dtype="datetime64[D]"),
+    )
+    i = model._team_index["Promoted"]
+    assert model.prior_precision[i] == pytest.approx(100)
+    assert model.prior_mean[i + model.n_teams] == -0.8
+    assert model.prior_precision[model._team_index["Team A"]] == 0
+
+
+def test_build_prior_table(tmp_path, league):
+    """Each season's prior only pools promoted teams from earlier seasons."""
+    n = len(league["home_team"]) // 2  # a double round-robin per season
+    results = {k: np.concatenate((v, v[:n])) for k, v in league.items()}
+    results["date"][2 * n :] += 365
+    season = np.repeat(["2122", "2223", "2324"], n)
+    results["season"] = season
+    for col in ("home_team", "away_team"):
+        results[col][(season == "2223") & (results[col] == "Team F")] = "Team G"
+        results[col][(season == "2324") & (results[col] == "Team A")] = "Team H"
+
+    table = build_prior_table(results)
+
+    assert list(table.priors) == ["2324", "2425"]
+    assert table.priors["2324"].n_observations == 1
+    # Team F returns in place of Team A, so both count as promoted
+    assert table.priors["2425"].n_observations == 3
+    table.save(tmp_path / "priors.json")
+    assert PriorTable.load(tmp_path / "priors.json") == table
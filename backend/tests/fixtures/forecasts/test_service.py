@@ -0,0 +1,133 @@
+import datetime as dt
+import json
+from collections.abc import Generator
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.auth.deps import get_current_user
+from app.auth.models import User
+from app.config import config
+from app.fixtures.forecasts.cache import ForecastKey, forecast_cache
+from app.fixtures.forecasts.models import FixtureForecast, ForecastQuery
+from app.fixtures.forecasts.service import (
+    FORECAST_COLUMNS,
+    get_cached_forecasts,
+    upsert_forecasts,
+)
+from app.fixtures.models import Fixture
+from app.main import app
+from app.teams.models import Team
+
+
+def forecast_columns(n_fixtures: int, value: float) -> dict[str, np.ndarray]:
+    return {column: np.full(n_fixtures, value) for column in FORECAST_COLUMNS}
+
+
+def test_upsert_forecasts_replaces_by_model_version(session: Session):
+    """Rerunning a split replaces its rows, and other model versions are kept."""
+    fixture_ids = np.arange(1, 6)
+    for value in (0.2, 0.4):
+        upsert_forecasts(
+            session=session,
+            fixture_ids=fixture_ids,
+            forecasts=forecast_columns(5, value),
+            model_version="dixon_coles",
+            batch_size=2,
+        )
+    upsert_forecasts(
+        session=session,
+        fixture_ids=fixture_ids[:2],
+        forecasts=forecast_columns(2, 0.9),
+        model_version="negative_binomial",
+    )
+
+    rows = session.query(FixtureForecast).all()
+    assert len(rows) == 7
+    assert {r.home_win for r in rows if r.model_version == "dixon_coles"} == {0.4}
+
+
+@pytest.fixture
+def gameweek(session: Session) -> Generator[list[Fixture], None, None]:
+    """Two fixtures of a gameweek with dixon_coles forecasts, and an empty cache."""
+    teams = [
+        Team(tricode=f"T{i}", name=f"Team {i}", short_name=f"T{i}") for i in "ABCD"
+    ]
+    session.add_all(teams)
+    session.flush()
+    fixtures = [
+        Fixture(
+            date=dt.datetime(2023, 8, 12, hour, tzinfo=dt.timezone.utc),
+            season="2324",
+            gameweek=1,
+            home_team_id=teams[h].id,
+            away_team_id=teams[a].id,
+        )
+        for hour, h, a in ((15, 0, 1), (12, 2, 3))
+    ]
+    session.add_all(fixtures)
+    session.flush()
+    upsert_forecasts(
+        session=session,
+        fixture_ids=[f.fixture_id for f in fixtures],
+        forecasts=forecast_columns(2, 0.5),
+        model_version="dixon_coles",
+    )
+    forecast_cache.invalidate()
+    yield fixtures
+    forecast_cache.invalidate()
+
+
+def test_cached_forecasts_invalidated_on_commit(
+    session: Session, gameweek: list[Fixture]
+):
+    """A gameweek is served from the cache until a write of its version commits."""
+    query_in = ForecastQuery(season="2324", gameweek=1)
+    body = json.loads(get_cached_forecasts(session=session, query_in=query_in))
+    assert [item["date"][11:13] for item in body["items"]] == ["12", "15"]
+    assert ForecastKey("2324", 1, "dixon_coles") in forecast_cache
+
+    upsert_forecasts(
+        session=session,
+        fixture_ids=[gameweek[0].fixture_id],
+        forecasts=forecast_columns(1, 0.8),
+        model_version="dixon_coles",
+    )
+    cached = json.loads(get_cached_forecasts(session=session, query_in=query_in))
+    assert cached == body
+
+    session.commit()
+    body = json.loads(get_cached_forecasts(session=session, query_in=query_in))
+    assert [item["forecast"]["home_win"] for item in body["items"]] == [0.5, 0.8]
+
+
+def test_get_forecasts_for_team(client: TestClient, gameweek: list[Fixture]):
+    """The endpoint serves a team's fixtures, and nothing for a team without one."""
+    app.dependency_overrides[get_current_user] = lambda: User(
+        id="user", email="user@example.com", role="authenticated"
+    )
+    url = f"{config.API_V1_STR}/fixtures/forecasts"
+    params = {"season": "2324", "gameweek": 1}
+    home_team_id = gameweek[0].home_team_id
+    team = client.get(url, params={**params, "team_id": home_team_id})
+    other = client.get(url, params={**params, "team_id": 999})
+
+    assert team.status_code == 200
+    assert [i["home_team"]["id"] for i in team.json()["items"]] == [home_team_id]
+    assert other.json()["items"] == []
+
+
+def test_fixture_forecasts_by_model_version(session: Session, gameweek: list[Fixture]):
+    """A fixture holds one forecast per model version."""
+    upsert_forecasts(
+        session=session,
+        fixture_ids=[gameweek[0].fixture_id],
+        forecasts=forecast_columns(1, 0.7),
+        model_version="negative_binomial",
+    )
+    session.expire_all()
+
+    versions = {f.model_version for f in gameweek[0].forecasts}
+    assert versions == {"dixon_coles", "negative_binomial"}
@@ -0,0 +1,144 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.fixtures.forecasts.simulation import (
+    get_season_results,
+    league_table,
+    simulate_season,
+)
+from app.fixtures.models import Fixture
+from app.results.models import Result
+from app.teams.models import Team
+
+
+@pytest.fixture
+def half_season(league):
+    """A model fitted on the first season, and the second season half played."""
+    n_season = len(league["home_team"]) // 2
+    first = {k: v[:n_season] for k, v in league.items()}
+    model = DixonColesModel(**first)
+    model.fit()
+    played = {k: v[n_season : n_season + n_season // 2] for k, v in league.items()}
+    remaining = {
+        k: league[k][n_season + n_season // 2 :] for k in ("home_team", "away_team")
+    }
+    return model, played, remaining
+
+
+def test_league_table():
+    """Wins score three, draws one, and goal difference sums to zero."""
+    points, goal_diff, goals_for = league_table(
+        home_idx=np.array([0, 1, 2]),
+        away_idx=np.array([1, 2, 0]),
+        home_goals=np.array([2, 1, 0]),
+        away_goals=np.array([0, 1, 3]),
+        n_teams=3,
+    )
+    np.testing.assert_array_equal(points, [6, 1, 1])
+    np.testing.assert_array_equal(goal_diff, [5, -2, -3])
+    np.testing.assert_array_equal(goals_for, [5, 1, 1])
+
+
+def test_simulate_season(half_season):
+    """Position probabilities are distributions and points only accumulate."""
+    model, played, remaining = half_season
+    kwargs = {
+        "model": model,
+        "teams": model.teams,
+        "played": played,
+        "remaining": remaining,
+        "n_simulations": 2000,
+        "seed": 7,
+        "max_workers": 2,
+    }
+    simulation = simulate_season(**kwargs)
+
+    np.testing.assert_allclose(simulation.position_probs.sum(axis=0), 1)
+    np.testing.assert_allclose(simulation.position_probs.sum(axis=1), 1)
+    assert simulation.title.sum() == pytest.approx(1)
+    assert simulation.relegation.sum() == pytest.approx(3)
+
+    current, _, _ = league_table(
+        home_idx=np.searchsorted(model.teams, played["home_team"]),
+        away_idx=np.searchsorted(model.teams, played["away_team"]),
+        home_goals=played["home_goals"],
+        away_goals=played["away_goals"],
+        n_teams=model.n_teams,
+    )
+    assert np.all(simulation.expected_points >= current)
+    assert np.all(
+        simulation.expected_points <= current + 3 * len(remaining["home_team"])
+    )
+
+    again = simulate_season(**kwargs)
+    np.testing.assert_array_equal(again.position_probs, simulation.position_probs)
+
+
+def test_simulate_finished_season(half_season):
+    """With no fixtures remaining, the simulation is the current table."""
+    model, played, _ = half_season
+    empty = np.array([], dtype=str)
+    simulation = simulate_season(
+        model=model,
+        teams=model.teams,
+        played=played,
+        remaining={"home_team": empty, "away_team": empty},
+        n_simulations=100,
+        seed=7,
+    )
+
+    current, _, _ = league_table(
+        home_idx=np.searchsorted(model.teams, played["home_team"]),
+        away_idx=np.searchsorted(model.teams, played["away_team"]),
+        home_goals=played["home_goals"],
+        away_goals=played["away_goals"],
+        n_teams=model.n_teams,
+    )
+    np.testing.assert_allclose(simulation.expected_points, current)
+
+
+def test_get_season_results(session: Session):
+    """Fixtures without a result, or after the gameweek, are left to simulate."""
+    teams = [
+        Team(tricode=f"T{i}", name=f"Team {i}", short_name=f"T{i}") for i in "ABCD"
+    ]
+    session.add_all(teams)
+    session.flush()
+    fixtures = [
+        Fixture(
+            date=dt.datetime(2023, 8, day, tzinfo=dt.timezone.utc),
+            season="2324",
+            gameweek=gameweek,
+            home_team_id=teams[h].id,
+            away_team_id=teams[a].id,
+        )
+        for day, gameweek, h, a in (
+            (12, 1, 0, 1),  # played
+            (12, 1, 2, 3),  # postponed
+            (19, 2, 1, 0),  # played after the gameweek
+            (26, None, 3, 2),  # not yet scheduled
+        )
+    ]
+    session.add_all(fixtures)
+    session.flush()
+    session.add_all(
+        [
+            Result(fixture_id=fixtures[0].fixture_id, home_score=2, away_score=1),
+            Result(fixture_id=fixtures[2].fixture_id, home_score=0, away_score=0),
+        ]
+    )
+    session.flush()
+
+    played, remaining = get_season_results(session=session, season="2324", gameweek=1)
+
+    assert played["home_team"].tolist() == ["Team A"]
+    assert played["home_goals"].tolist() == [2]
+    assert sorted(zip(remaining["home_team"], remaining["away_team"], strict=True)) == [
+        ("Team B", "Team A"),
+        ("Team C", "Team D"),
+        ("Team D", "Team C"),
+    ]
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from app.fixtures.forecasts.backtest import sort_results
+from app.fixtures.forecasts.dixon_coles import DixonColesModel
+from app.fixtures.forecasts.tuning import score_chunk, search_xi
+
+
+def test_set_xi_matches_new_model(league):
+    """Reweighting the shared sufficient statistics matches a model built with xi."""
+    model = DixonColesModel(**league)
+    model.set_xi(0.01)
+    expected = DixonColesModel(**league, xi=0.01)
+
+    params = model._params
+    assert model._fit_step(params) == pytest.approx(expected._fit_step(params))
+
+
+@pytest.fixture
+def results(league) -> dict[str, np.ndarray]:
+    n_fixtures = len(league["home_team"])
+    return sort_results(
+        {
+            "fixture_id": np.arange(n_fixtures),
+            "round": np.arange(n_fixtures) // 3,
+            **league,
+        }
+    )
+
+
+def test_search_xi_scores_every_candidate(results):
+    """Every candidate is scored out-of-sample on the same fixtures."""
+    grid = (0.01, 0.0, 0.005)
+    candidates = search_xi(results, grid=grid, eval_rounds=4, max_workers=2)
+
+    assert [c.xi for c in candidates] == sorted(grid)
+    for candidate in candidates:
+        assert candidate.n_fits == 4
+        assert candidate.n_fixtures == 12
+        assert candidate.mean_loglikelihood == pytest.approx(
+            candidate.loglikelihood / 12
+        )
+        assert candidate.loglikelihood < 0
+        assert candidate.fit_time > 0
+
+
+def test_score_chunk_rebuilds_after_failed_fit(results, monkeypatch):
+    """A failed cold fit leaves its candidate unscored at that split only, and the
+    next candidate is rebuilt from every round up to the split."""
+    fit = DixonColesModel.fit
+    n_fitted = []
+
+    def fail_first(self, *args, **kwargs):
+        n_fitted.append(len(self.data))
+        if len(n_fitted) == 1:
+            raise ValueError("Optimization did not converge")
+        fit(self, *args, **kwargs)
+
+    monkeypatch.setattr(DixonColesModel, "fit", fail_first)
+    split_points = np.arange(results["round"].max() - 2, results["round"].max())
+    loglikelihood, _, n_fits, n_fixtures = score_chunk(
+        results, split_points, grid=(0.0, 0.005)
+    )
+
+    np.testing.assert_array_equal(n_fits, [1, 2])
+    np.testing.assert_array_equal(n_fixtures, [3, 6])
+    assert n_fitted[1] == (results["round"] <= split_points[0]).sum()
+    assert np.all(loglikelihood < 0)
@@ -0,0 +1,21 @@
+import datetime as dt
+
+import pytest
+
+from app.fixtures.fill import parse_kickoff
+
+UTC = dt.timezone.utc
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2023-08-11T19:00:00Z", dt.datetime(2023, 8, 11, 19, tzinfo=UTC)),
+        ("2023-08-11T20:00:00+01:00", dt.datetime(2023, 8, 11, 19, tzinfo=UTC)),
+        ("2023-08-11 19:00:00", dt.datetime(2023, 8, 11, 19, tzinfo=UTC)),
+        ("", None),
+    ],
+)
+def test_parse_kickoff(value: str, expected: dt.datetime | None):
+    """Kick-offs are parsed as UTC, whether marked `Z`, offset or naive."""
+    assert parse_kickoff(value) == expected
@@ -0,0 +1,133 @@
+import datetime as dt
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.auth.deps import get_current_user
+from app.auth.models import User
+from app.config import config
+from app.fixtures.models import Fixture, FixtureQuery
+from app.fixtures.service import get_fixtures_query
+from app.main import app
+from app.results.models import Result
+from app.teams.models import Team
+
+
+def kickoff(day: int, hour: int) -> dt.datetime:
+    return dt.datetime(2023, 8, day, hour, tzinfo=dt.timezone.utc)
+
+
+def add_teams(session: Session) -> list[Team]:
+    teams = [
+        Team(tricode=f"T{i}", name=f"Team {i}", short_name=f"T{i}") for i in "ABCD"
+    ]
+    session.add_all(teams)
+    session.flush()
+    return teams
+
+
+def test_get_fixtures_query_filters_by_kickoff_day(session: Session):
+    """Fixtures on a date are those kicking off within the day, sorted by time."""
+    teams = add_teams(session)
+    session.add_all(
+        Fixture(
+            date=date,
+            season="2324",
+            gameweek=1,
+            home_team_id=teams[h].id,
+            away_team_id=teams[a].id,
+        )
+        for date, h, a in (
+            (kickoff(12, 17), 0, 1),
+            (kickoff(12, 12), 2, 3),
+            (kickoff(13, 0), 1, 2),
+        )
+    )
+    session.flush()
+
+    page = get_fixtures_query(
+        session=session,
+        query_in=FixtureQuery(season="2324", date=dt.date(2023, 8, 12)),
+    )
+
+    assert page["total"] == 2
+    assert [f.date.hour for f in page["items"]] == [12, 17]
+
+
+def test_get_fixtures_query_keyset_pages(session: Session):
+    """Keyset pages are ordered by kick-off, ties by id, with unscheduled last."""
+    teams = add_teams(session)
+    dates = [kickoff(12, 15), None, kickoff(12, 12), kickoff(12, 15), kickoff(19, 15)]
+    fixtures = [
+        Fixture(
+            date=date,
+            season="2324",
+            gameweek=1,
+            home_team_id=teams[i % 4].id,
+            away_team_id=teams[(i + 1) % 4].id,
+        )
+        for i, date in enumerate(dates)
+    ]
+    session.add_all(fixtures)
+    session.flush()
+
+    query_in = FixtureQuery(season="2324", page_size=2, pagination="keyset")
+    ids = []
+    while True:
+        page = get_fixtures_query(session=session, query_in=query_in)
+        ids += [f.fixture_id for f in page["items"]]
+        if page["next_cursor"] is None:
+            break
+        query_in.cursor = page["next_cursor"]
+
+    assert ids == [fixtures[i].fixture_id for i in (2, 0, 3, 4, 1)]
+    assert page["total"] == 5
+
+
+def test_get_fixtures_lists_teams_and_results(client: TestClient, session: Session):
+    """The lean listing serves cached teams and an optional result per fixture."""
+    teams = add_teams(session)
+    fixtures = [
+        Fixture(
+            date=kickoff(12, hour),
+            season="2324",
+            gameweek=1,
+            home_team_id=teams[h].id,
+            away_team_id=teams[a].id,
+        )
+        for hour, h, a in ((12, 0, 1), (15, 2, 3))
+    ]
+    session.add_all(fixtures)
+    session.flush()
+    session.add(Result(fixture_id=fixtures[0].fixture_id, home_score=2, away_score=1))
+    session.flush()
+
+    app.dependency_overrides[get_current_user] = lambda: User(
+        id="user", email="user@example.com", role="authenticated"
+    )
+    response = client.get(f"{config.API_V1_STR}/fixtures", params={"season": "2324"})
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["home_team"]["name"] for item in items] == ["Team A", "Team C"]
+    assert items[0]["result"]["home_score"] == 2
+    assert items[1]["result"] is None
+
+
+def test_fixtures_api_rejects_invalid_keyset(client: TestClient):
+    """A malformed cursor or an unindexed keyset sort is a bad request."""
+    app.dependency_overrides[get_current_user] = lambda: User(
+        id="user", email="user@example.com", role="authenticated"
+    )
+    url = f"{config.API_V1_STR}/fixtures"
+    cursor = client.get(url, params={"pagination": "keyset", "cursor": "garbage"})
+    unindexed = client.get(
+        url, params={"pagination": "keyset", "sort_by": "home_team_id"}
+    )
+    offset = client.get(url, params={"sort_by": "home_team_id"})
+
+    assert cursor.status_code == 400
+    assert "Invalid cursor" in cursor.json()["message"]
+    assert unindexed.status_code == 400
+    assert "unindexed column" in unindexed.json()["message"]
+    assert offset.status_code == 200
@@ -0,0 +1,59 @@
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.teams.cache import team_cache
+from app.teams.models import SeasonTeam, Team
+
+
+@pytest.fixture
+def teams(session: Session) -> Generator[list[Team], None, None]:
+    """Three teams, two of them in the 2324 season."""
+    teams = [
+        Team(tricode="ARS", name="Arsenal", short_name="Arsenal"),
+        Team(tricode="BUR", name="Burnley", short_name="Burnley"),
+        Team(tricode="CHE", name="Chelsea", short_name="Chelsea"),
+    ]
+    session.add_all(teams)
+    session.flush()
+    session.add_all(
+        SeasonTeam(team_id=team.id, season_team_id=i + 1, season="2324")
+        for i, team in enumerate(teams[::2])
+    )
+    session.flush()
+    yield teams
+    team_cache.invalidate()
+
+
+def test_team_cache_lookups(session: Session, teams: list[Team]):
+    """Teams are found by id, name, tricode and season id without a query each."""
+    arsenal = team_cache.get(session, teams[0].id)
+
+    assert team_cache.get_by_name(session, "Arsenal") is arsenal
+    assert team_cache.get_by_tricode(session, "ARS") is arsenal
+    assert team_cache.get_by_season_id(session, "2324", 1) is arsenal
+    assert [t.name for t in team_cache.season_teams(session, "2324")] == [
+        "Arsenal",
+        "Chelsea",
+    ]
+    with pytest.raises(ValueError, match="'3' is not a valid team for the 2324"):
+        team_cache.get_by_season_id(session, "2324", 3)
+
+
+def test_team_cache_reloads_on_write(session: Session, teams: list[Team]):
+    """Writes through the engine drop the cache, and a miss checks the version."""
+    team_cache.index(session)
+    session.add(Team(tricode="DER", name="Derby County", short_name="Derby"))
+    session.flush()
+    assert team_cache.get_by_tricode(session, "DER").name == "Derby County"
+
+    # As written by another process, which the write events do not see
+    session.execute(
+        text(
+            "INSERT INTO teams (tricode, name, short_name) "
+            "VALUES ('EVE', 'Everton', 'Everton')"
+        )
+    )
+    assert team_cache.get_by_name(session, "Everton").tricode == "EVE"